@@ -0,0 +1,91 @@
+from django.utils.functional import LazyObject, empty
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import CustomUser
+from .tokens import USERNAME_CLAIM
+
+
+class TokenClaimsUser(LazyObject):
+    """
+    Utilisateur construit à partir des claims d'un jeton JWT, chargé en base à la demande.
+
+    L'identifiant et le nom d'utilisateur sont lus dans le jeton. Tout autre accès
+    (champ du modèle, affectation à une clé étrangère, isinstance) charge une fois l'instance
+    CustomUser correspondante, à laquelle l'objet délègue ensuite.
+    """
+
+    def __init__(self, token):
+        super().__init__()
+        self.__dict__['token'] = token
+
+    def _setup(self):
+        try:
+            user = CustomUser.objects.get(pk=self.pk)
+        except CustomUser.DoesNotExist:
+            raise AuthenticationFailed("Utilisateur introuvable.", code='user_not_found')
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("Utilisateur inactif.", code='user_inactive')
+        self._wrapped = user
+
+    @property
+    def pk(self):
+        return CustomUser._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    id = pk
+
+    @property
+    def username(self):
+        if USERNAME_CLAIM in self.token:
+            return self.token[USERNAME_CLAIM]
+        return self.__getattr__('username')
+
+    @property
+    def is_loaded(self):
+        """bool: Indique si l'instance CustomUser a été chargée."""
+        return self.__dict__['_wrapped'] is not empty
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __bool__(self):
+        return True
+
+    def __repr__(self):
+        return f'<TokenClaimsUser: {self.pk}>'
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans lecture de l'utilisateur en base.
+
+    Le jeton est vérifié (signature, expiration) comme avec JWTAuthentication, mais
+    request.user est un TokenClaimsUser : la ligne CustomUser n'est lue que si la vue en a
+    besoin. L'existence et l'état actif de l'utilisateur ne sont donc vérifiés qu'à ce moment :
+    un utilisateur désactivé garde un accès en lecture jusqu'à l'expiration de son jeton d'accès
+    (SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'], 5 minutes). Le rafraîchissement lit l'utilisateur et
+    refuse les comptes inactifs.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Le jeton ne contient pas d'identifiant d'utilisateur.")
+        return TokenClaimsUser(validated_token)
+
+
+def authenticate_request(request):
+    """
+    Authentifie une requête Django (hors DRF) à partir de l'en-tête Authorization, sans requête SQL.
+
+    Args:
+        request (HttpRequest): Requête en cours ; `request.user` et `request.auth` sont renseignés.
+
+    Raises:
+        NotAuthenticated: Si aucun jeton n'est fourni.
+        AuthenticationFailed: Si le jeton est invalide ou expiré.
+    """
+    result = ClaimsJWTAuthentication().authenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+    request.user, request.auth = result
@@ -0,0 +1,73 @@
+"""
+Hacheurs de mots de passe à coût réglable.
+
+Les paramètres de chaque algorithme sont lus dans SOFTDESK_PASSWORD_HASHING à chaque
+utilisation. Lorsqu'ils changent, must_update() détecte les hachages obtenus avec les
+anciens paramètres et Django les recalcule à la connexion suivante de l'utilisateur.
+Le profil actif (ordre de PASSWORD_HASHERS) est choisi par SOFTDESK_PASSWORD_PROFILE ;
+check_password_profile() signale au démarrage un profil dont la bibliothèque est absente.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher, get_hasher
+from django.core import checks
+
+
+def hashing_param(algorithm, name, default):
+    """
+    Crée une propriété lisant un paramètre de SOFTDESK_PASSWORD_HASHING.
+
+    Args:
+        algorithm (str): Algorithme ('scrypt', 'argon2').
+        name (str): Nom du paramètre.
+        default (int): Valeur utilisée si le paramètre n'est pas réglé.
+
+    Returns:
+        property: Propriété renvoyant la valeur réglée.
+    """
+    def getter(self):
+        return getattr(settings, 'SOFTDESK_PASSWORD_HASHING', {}).get(algorithm, {}).get(name, default)
+    return property(getter)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt dont le coût (N, r, p) est réglé par SOFTDESK_PASSWORD_HASHING['scrypt']."""
+    work_factor = hashing_param('scrypt', 'work_factor', ScryptPasswordHasher.work_factor)
+    block_size = hashing_param('scrypt', 'block_size', ScryptPasswordHasher.block_size)
+    parallelism = hashing_param('scrypt', 'parallelism', ScryptPasswordHasher.parallelism)
+
+    @property
+    def maxmem(self):
+        """int: Mémoire autorisée pour scrypt ; 0 (32 Mio, défaut d'OpenSSL) si elle suffit."""
+        required = 128 * self.work_factor * self.block_size
+        return 0 if required <= 16 * 1024 * 1024 else 2 * required
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id dont le coût est réglé par SOFTDESK_PASSWORD_HASHING['argon2'] (nécessite argon2-cffi)."""
+    time_cost = hashing_param('argon2', 'time_cost', Argon2PasswordHasher.time_cost)
+    memory_cost = hashing_param('argon2', 'memory_cost', Argon2PasswordHasher.memory_cost)
+    parallelism = hashing_param('argon2', 'parallelism', Argon2PasswordHasher.parallelism)
+
+
+@checks.register(checks.Tags.security)
+def check_password_profile(app_configs, **kwargs):
+    """
+    Vérifie que la bibliothèque du hacheur actif est installée (argon2-cffi pour le profil 'argon2').
+
+    Sans elle, chaque inscription et chaque connexion échoueraient.
+
+    Returns:
+        list: Erreur authentication.E001 si la bibliothèque est absente.
+    """
+    hasher = get_hasher()
+    if not hasher.library:
+        return []
+    try:
+        hasher._load_library()
+    except ValueError:
+        return [checks.Error(
+            f"Le hacheur de mots de passe '{hasher.algorithm}' nécessite une bibliothèque absente.",
+            hint="Installer argon2-cffi, ou choisir un autre SOFTDESK_PASSWORD_PROFILE ('pbkdf2', 'scrypt').",
+            id='authentication.E001',
+        )]
+    return []
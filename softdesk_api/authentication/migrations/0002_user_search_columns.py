@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+def fill_search_columns(apps, schema_editor):
+    """Calcule les colonnes en minuscules des utilisateurs existants (str.lower, comme save())."""
+    CustomUser = apps.get_model("authentication", "CustomUser")
+    users = []
+    for user in CustomUser.objects.only("id", "username", "email").iterator(chunk_size=2000):
+        user.username_lower = user.username.lower()
+        user.email_lower = (user.email or "").lower()
+        users.append(user)
+        if len(users) == 2000:
+            CustomUser.objects.bulk_update(users, ["username_lower", "email_lower"])
+            users = []
+    CustomUser.objects.bulk_update(users, ["username_lower", "email_lower"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="email_lower",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=254
+            ),
+        ),
+        migrations.AddField(
+            model_name="customuser",
+            name="username_lower",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=150
+            ),
+        ),
+        migrations.RunPython(fill_search_columns, migrations.RunPython.noop),
+    ]
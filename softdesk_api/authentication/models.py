@@ -14,7 +14,28 @@ class CustomUser(AbstractUser):
         can_be_contacted (BooleanField) : Indique si l'utilisateur peut être contacté, par défaut False.
         can_data_be_shared (BooleanField) : Indique si les données de l'utilisateur peuvent être partagées, par défaut
         False.
+        username_lower (CharField) : Nom d'utilisateur en minuscules, indexé pour la recherche par préfixe.
+        email_lower (CharField) : Adresse e-mail en minuscules, indexée pour la recherche par préfixe.
     """
     date_birth = models.DateField(null=True, blank=True)
     can_be_contacted = models.BooleanField(default=False)
     can_data_be_shared = models.BooleanField(default=False)
+    username_lower = models.CharField(max_length=150, db_index=True, editable=False, default='')
+    email_lower = models.CharField(max_length=254, db_index=True, editable=False, default='')
+
+    SEARCH_FIELDS = {'username': 'username_lower', 'email': 'email_lower'}
+
+    def save(self, *args, **kwargs):
+        """
+        Enregistre l'utilisateur en recalculant les colonnes de recherche en minuscules.
+
+        Les colonnes sont ajoutées à update_fields lorsque le champ dont elles dérivent y figure.
+        """
+        self.username_lower = self.username.lower()
+        self.email_lower = (self.email or '').lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                search_field for field, search_field in self.SEARCH_FIELDS.items() if field in update_fields
+            }
+        super().save(*args, **kwargs)
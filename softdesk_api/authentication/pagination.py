@@ -0,0 +1,20 @@
+"""
+Pagination de l'annuaire des utilisateurs.
+
+Les utilisateurs sont ordonnés par nom d'utilisateur en minuscules puis par identifiant, sur
+l'index de username_lower : les pages sont déterministes et la pagination par curseur lit
+la page suivante sans OFFSET ni COUNT(*).
+"""
+from rest_framework.pagination import CursorPagination
+from project.pagination import CursorOrPageNumberPagination
+
+
+class UsernameCursorPagination(CursorPagination):
+    """Pagination par curseur sur (username_lower, id)."""
+    ordering = ('username_lower', 'id')
+    page_size = 20
+
+
+class UserDirectoryPagination(CursorOrPageNumberPagination):
+    """Pagination par numéro de page par défaut, par curseur sur le nom d'utilisateur à la demande."""
+    cursor_class = UsernameCursorPagination
@@ -1,9 +1,12 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from project.metrics import TimedListSerializer, TimedSerializerMixin
 from .models import CustomUser
+from .tokens import ClaimsRefreshToken
 from datetime import date
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle CustomUser.
     Ce sérialiseur gère la sérialisation et la désérialisation des données utilisateur,
@@ -20,6 +23,7 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'password': {'write_only': True, 'required': False},
         }
+        list_serializer_class = TimedListSerializer
 
     def create(self, validated_data):
         """
@@ -48,3 +52,27 @@ class UserSerializer(serializers.ModelSerializer):
             if age < 15:
                 raise serializers.ValidationError("L'utilisateur doit avoir au moins 15 ans.")
         return value
+
+
+class UserPickerSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Représentation compacte d'un utilisateur, pour choisir un assigné ou un contributeur.
+
+    Attributes:
+        model (Model): Le modèle associé, CustomUser.
+        fields (list): Identifiant et nom d'utilisateur uniquement.
+    """
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'username']
+        list_serializer_class = TimedListSerializer
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Émet une paire de jetons portant le nom d'utilisateur (voir authentication/tokens.py)."""
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Émet un jeton d'accès portant le nom d'utilisateur, si le compte est toujours actif."""
+    token_class = ClaimsRefreshToken
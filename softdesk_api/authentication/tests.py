@@ -1,3 +1,179 @@
-from django.test import TestCase
+from unittest.mock import patch
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from authentication.hashers import check_password_profile
+from authentication.models import CustomUser
+from authentication.pagination import UsernameCursorPagination
+from project.models import Project, Contributor
+from project.testing import CacheResetMixin
 
-# Create your tests here.
+SCRYPT_PROFILE = [
+    'authentication.hashers.TunedScryptPasswordHasher', 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+]
+
+
+class ClaimsJWTAuthenticationTestCase(CacheResetMixin, APITestCase):
+    """Vérifie les jetons porteurs de claims et l'authentification sans lecture de l'utilisateur."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='user', password='motdepasse')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issues_url = f'/api/projects/{self.project.id}/issues/'
+
+    def obtain_tokens(self):
+        response = self.client.post('/api/token/', {'username': 'user', 'password': 'motdepasse'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def authenticate(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_access_token_claims(self):
+        access = AccessToken(self.obtain_tokens()['access'])
+        self.assertEqual(int(access['user_id']), self.user.id)
+        self.assertEqual(access['username'], 'user')
+        self.assertNotIn('projects', access)
+
+    def test_refresh_keeps_username(self):
+        tokens = self.obtain_tokens()
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(AccessToken(response.data['access'])['username'], 'user')
+
+    def test_inactive_user_cannot_refresh(self):
+        tokens = self.obtain_tokens()
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_read_does_not_load_user(self):
+        self.authenticate(self.obtain_tokens()['access'])
+        self.client.get(self.issues_url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/api/projects/{self.project.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in context.captured_queries
+                          if query['sql'].startswith('SELECT') and 'FROM "authentication_customuser"' in query['sql']])
+
+    def test_write_loads_user(self):
+        self.authenticate(self.obtain_tokens()['access'])
+        response = self.client.post(self.issues_url, {'title': 'Issue', 'tag': 'BUG', 'project': self.project.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['author']['username'], 'user')
+        response = self.client.delete(f"{self.issues_url}{response.data['id']}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_inactive_user_cannot_write(self):
+        self.authenticate(self.obtain_tokens()['access'])
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.client.post(self.issues_url, {'title': 'Issue', 'tag': 'BUG', 'project': self.project.id})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token(self):
+        self.authenticate('invalide')
+        self.assertEqual(self.client.get(self.issues_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PasswordHashingTestCase(APITestCase):
+    """Vérifie le profil de hachage et le recalcul des hachages obsolètes à la connexion."""
+
+    def login(self):
+        response = self.client.post('/api/token/', {'username': 'user', 'password': 'motdepasse'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_default_profile_keeps_django_hasher(self):
+        response = self.client.post('/api/users/', {'username': 'user', 'password': 'motdepasse'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(CustomUser.objects.get(username='user').password.startswith('pbkdf2_sha256$'))
+        self.login()
+        self.assertTrue(CustomUser.objects.get(username='user').password.startswith('pbkdf2_sha256$'))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_PROFILE)
+    def test_registration_uses_active_profile(self):
+        response = self.client.post('/api/users/', {'username': 'user', 'password': 'motdepasse'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(CustomUser.objects.get(username='user').password.startswith('scrypt$16384$'))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_PROFILE)
+    def test_outdated_algorithm_is_rehashed_on_login(self):
+        CustomUser.objects.create(username='user', password=make_password('motdepasse', hasher='pbkdf2_sha256'))
+        self.login()
+        self.assertTrue(CustomUser.objects.get(username='user').password.startswith('scrypt$'))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_PROFILE)
+    def test_outdated_parameters_are_rehashed_on_login(self):
+        user = CustomUser.objects.create_user(username='user', password='motdepasse')
+        params = {'scrypt': {'work_factor': 2 ** 13, 'block_size': 8, 'parallelism': 2}}
+        with override_settings(SOFTDESK_PASSWORD_HASHING=params):
+            self.login()
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('scrypt$8192$'))
+        self.assertEqual(user.password.split('$')[4], '2')
+
+    def test_missing_argon2_library_is_reported(self):
+        with override_settings(PASSWORD_HASHERS=[settings.PASSWORD_HASHER_PROFILES['argon2']]):
+            with patch('importlib.import_module', side_effect=ImportError):
+                errors = check_password_profile(None)
+        self.assertEqual([error.id for error in errors], ['authentication.E001'])
+        self.assertEqual(check_password_profile(None), [])
+
+
+class UserDirectoryTestCase(APITestCase):
+    """Vérifie la recherche par préfixe, le tri et le picker de l'annuaire des utilisateurs."""
+
+    def setUp(self):
+        names = ('Alice', 'alain', 'bob', 'Bernard', 'albert', 'zoe')
+        self.users = [CustomUser.objects.create(username=name, email=f'{name.lower()}@softdesk.fr') for name in names]
+        self.users[5].email = 'Alpha.Zoe@Example.com'
+        self.users[5].save(update_fields=['email'])
+        self.client.force_authenticate(self.users[0])
+
+    def usernames(self, response):
+        return [user['username'] for user in response.data['results']]
+
+    def test_search_columns_follow_saves(self):
+        user = CustomUser.objects.get(username='zoe')
+        self.assertEqual((user.username_lower, user.email_lower), ('zoe', 'alpha.zoe@example.com'))
+
+    def test_list_is_sorted_case_insensitively(self):
+        response = self.client.get('/api/users/')
+        self.assertEqual(self.usernames(response), ['alain', 'albert', 'Alice', 'Bernard', 'bob', 'zoe'])
+
+    def test_prefix_search_on_username_and_email(self):
+        self.assertEqual(self.usernames(self.client.get('/api/users/', {'search': 'AL'})),
+                         ['alain', 'albert', 'Alice', 'zoe'])
+        self.assertEqual(self.usernames(self.client.get('/api/users/', {'search': 'ber'})), ['Bernard'])
+        self.assertEqual(self.usernames(self.client.get('/api/users/', {'search': 'alpha.'})), ['zoe'])
+        self.assertEqual(self.usernames(self.client.get('/api/users/', {'search': 'x'})), [])
+
+    def test_picker_is_compact(self):
+        response = self.client.get('/api/users/picker/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(response.data['results'][0], {'id': self.users[1].id, 'username': 'alain'})
+
+    @patch.object(UsernameCursorPagination, 'page_size', 2)
+    def test_picker_keyset_pages(self):
+        seen, url = [], '/api/users/picker/?search=b'
+        while url:
+            response = self.client.get(url)
+            seen.extend(self.usernames(response))
+            url = response.data['next']
+        self.assertEqual(seen, ['Bernard', 'bob'])
+        seen, url = [], '/api/users/picker/'
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(self.usernames(response))
+            url = response.data['next']
+        self.assertEqual(seen, ['alain', 'albert', 'Alice', 'Bernard', 'bob', 'zoe'])
+
+    def test_picker_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/users/picker/').status_code, status.HTTP_401_UNAUTHORIZED)
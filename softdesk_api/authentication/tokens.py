@@ -0,0 +1,28 @@
+"""
+Jetons JWT de SoftDesk, porteurs de l'identité de l'utilisateur.
+
+En plus de l'identifiant, les jetons contiennent le nom d'utilisateur : ClaimsJWTAuthentication
+(authentication/authentication.py) construit à partir de ces claims un utilisateur léger, sans
+lire la table des utilisateurs à chaque requête.
+
+Attributes:
+    USERNAME_CLAIM (str): Claim portant le nom d'utilisateur.
+"""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+USERNAME_CLAIM = 'username'
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Jeton de rafraîchissement dont les jetons d'accès portent les claims de l'utilisateur.
+
+    Le nom d'utilisateur est inscrit dans le jeton de rafraîchissement et recopié dans chaque
+    jeton d'accès.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[USERNAME_CLAIM] = user.get_username()
+        return token
@@ -1,26 +1,57 @@
-from django.shortcuts import render
+from django.db.models import Q
+from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
+from project.metrics import TimedPermissionsMixin
 from .models import CustomUser
-from .serializers import UserSerializer
+from .pagination import UserDirectoryPagination, UsernameCursorPagination
+from .serializers import UserPickerSerializer, UserSerializer
 from rest_framework.permissions import IsAuthenticated
 
 
-class UserViewSet(ModelViewSet):
+def prefix_range(prefix):
+    """
+    Calcule les bornes [début, fin[ des chaînes commençant par un préfixe.
+
+    Une comparaison par intervalle utilise l'index de la colonne sur tous les moteurs,
+    contrairement à LIKE 'préfixe%' selon la collation.
+
+    Args:
+        prefix (str): Préfixe non vide.
+
+    Returns:
+        tuple: (borne inférieure incluse, borne supérieure exclue ou None).
+    """
+    last = ord(prefix[-1])
+    if last == 0x10FFFF:
+        return prefix, None
+    return prefix, prefix[:-1] + chr(last + 1)
+
+
+class UserViewSet(TimedPermissionsMixin, ModelViewSet):
     """
     ViewSet pour gérer les opérations CRUD sur le modèle CustomUser.
 
     Ce ViewSet fournit des endpoints pour créer, lire, mettre à jour et supprimer des utilisateurs.
     Les permissions sont configurées pour exiger une authentification, sauf pour les actions
     'create' (inscription) et 'list' (liste des utilisateurs).
+    La liste et l'action `picker` sont triées par nom d'utilisateur et acceptent une recherche
+    par préfixe du nom d'utilisateur ou de l'e-mail (`?search=`), sans distinction de casse.
 
     Attributes:
         queryset (QuerySet): Ensemble des objets CustomUser.
         serializer_class (Serializer): Sérialiseur utilisé pour les données utilisateur.
         permission_classes (list): Permissions par défaut (authentification requise).
+        search_param (str): Paramètre de requête portant le préfixe recherché.
+        query_budgets (dict): Requêtes SQL par action, vérifiées par RouteQueryBudgetTestCase.
     """
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserDirectoryPagination
+    search_param = 'search'
+    query_budgets = {
+        'list': 2, 'picker': 1, 'retrieve': 1, 'create': 2, 'update': 4, 'partial_update': 3, 'destroy': 29,
+    }
 
     def get_permissions(self):
         """
@@ -35,3 +66,33 @@ class UserViewSet(ModelViewSet):
         if self.action in ['create', 'list']:
             return []
         return super().get_permissions()
+
+    def get_queryset(self):
+        """
+        Trie l'annuaire et applique la recherche par préfixe pour la liste et le picker.
+
+        Returns:
+            QuerySet: Utilisateurs triés par (username_lower, id), filtrés par le préfixe.
+        """
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'picker'):
+            return queryset
+        queryset = queryset.order_by('username_lower', 'id')
+        if self.action == 'picker':
+            queryset = queryset.only('id', 'username', 'username_lower')
+        prefix = self.request.query_params.get(self.search_param, '').strip().lower()
+        if not prefix:
+            return queryset
+        start, end = prefix_range(prefix)
+        condition = Q()
+        for search_field in CustomUser.SEARCH_FIELDS.values():
+            bounds = {f'{search_field}__gte': start}
+            if end is not None:
+                bounds[f'{search_field}__lt'] = end
+            condition |= Q(**bounds)
+        return queryset.filter(condition)
+
+    @action(detail=False, serializer_class=UserPickerSerializer, pagination_class=UsernameCursorPagination)
+    def picker(self, request, *args, **kwargs):
+        """Liste compacte (id, username), paginée par curseur, pour choisir un utilisateur."""
+        return self.list(request, *args, **kwargs)
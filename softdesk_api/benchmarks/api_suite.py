@@ -0,0 +1,283 @@
+"""
+Suite de benchmarks de l'API : latence (p50, p95, p99) et requêtes SQL par requête HTTP, pour
+chaque endpoint de project/urls.py et authentication/urls.py.
+
+Deux modes :
+    - en processus (par défaut) : base SQLite temporaire remplie par seed_softdesk (volumes
+      réglables), requêtes envoyées par le client de test DRF ; les requêtes SQL sont
+      comptées par CaptureQueriesContext, corps des exports en flux compris ;
+    - serveur (--url) : requêtes HTTP/1.1 keep-alive vers un serveur local déjà lancé sur une
+      base remplie par `manage.py seed_softdesk` ; les requêtes SQL sont lues, avant et après
+      chaque endpoint, sur /api/_metrics (--metrics-token, SOFTDESK_METRICS_TOKEN du serveur) ;
+      celles des exports, exécutées pendant l'envoi du flux, n'y sont pas comptées.
+Dans les deux modes, la suite se connecte par /api/token/ avec le premier utilisateur généré
+(auteur du premier projet) et trouve par l'API le projet, l'issue et le commentaire mesurés.
+Les endpoints d'écriture sont mesurés par cycles sur les objets qu'ils créent : création,
+modification, puis suppression. Avec --output, les résultats sont aussi écrits en JSON.
+
+Usage :
+    python -m benchmarks.api_suite --requests 200
+    python -m benchmarks.api_suite --users 10000 --projects 1000 --issues 200 --comments 5
+    python -m benchmarks.api_suite --url http://127.0.0.1:8000 --metrics-token JETON --output api.json
+"""
+import argparse
+import http.client
+import json
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from benchmarks.common import percentiles, setup_django
+
+
+class InProcessClient:
+    """Client de test DRF ; compte les requêtes SQL de chaque requête HTTP."""
+
+    def __init__(self):
+        from rest_framework.test import APIClient
+        self.client = APIClient()
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def request(self, method, path, body=None):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        data = '' if body is None else json.dumps(body)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.generic(method, path, data, content_type='application/json')
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, content, len(context)
+
+    def query_totals(self):
+        return None
+
+
+class ServerClient:
+    """Connexion HTTP/1.1 keep-alive vers un serveur ; requêtes SQL lues sur /api/_metrics."""
+
+    def __init__(self, url, metrics_token=None):
+        parts = urlsplit(url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        self.prefix = parts.path.rstrip('/')
+        self.metrics_token = metrics_token
+        self.headers = {'Content-Type': 'application/json'}
+
+    def authenticate(self, token):
+        self.headers['Authorization'] = f'Bearer {token}'
+
+    def request(self, method, path, body=None, headers=None):
+        data = None if body is None else json.dumps(body)
+        self.connection.request(method, self.prefix + path, body=data, headers=headers or self.headers)
+        response = self.connection.getresponse()
+        return response.status, response.read(), None
+
+    def query_totals(self):
+        """Renvoie (requêtes SQL, requêtes HTTP) cumulées par le serveur, hors endpoints des mesures."""
+        if not self.metrics_token:
+            return None
+        status, content, _ = self.request('GET', '/api/_metrics', headers={
+            'Authorization': f'Bearer {self.metrics_token}',
+        })
+        if status != 200:
+            raise SystemExit(f'/api/_metrics a répondu {status} : vérifiez --metrics-token')
+        totals = [0.0, 0.0]
+        for line in content.decode().splitlines():
+            name, _, value = line.rpartition(' ')
+            if 'route="metrics' in name:
+                continue
+            if name.startswith('softdesk_request_db_queries_sum{'):
+                totals[0] += float(value)
+            elif name.startswith('softdesk_request_db_queries_count{'):
+                totals[1] += float(value)
+        return totals
+
+
+def call(client, method, path, body=None, expected=200):
+    """Envoie une requête et renvoie le corps JSON décodé ; échoue sur un statut inattendu."""
+    status, content, _ = client.request(method, path, body)
+    if status != expected:
+        raise SystemExit(f'{method} {path} : {status} au lieu de {expected}\n{content[:500]!r}')
+    return json.loads(content) if content and content[:1] in b'{[' else content
+
+
+def discover(client, prefix, password):
+    """Se connecte avec le premier utilisateur généré et trouve les objets mesurés."""
+    tokens = call(client, 'POST', '/api/token/', {'username': f'{prefix}-user0', 'password': password})
+    client.authenticate(tokens['access'])
+    users = call(client, 'GET', f'/api/users/?search={prefix}-user')['results']
+    me = next(user['id'] for user in users if user['username'] == f'{prefix}-user0')
+    other = next(user['id'] for user in users if user['id'] != me)
+    project = call(client, 'GET', '/api/projects/')['results'][0]['id']
+    contributor = call(client, 'GET', f'/api/projects/{project}/contributors/')['results'][0]['id']
+    issues = call(client, 'GET', f'/api/projects/{project}/issues/')['results']
+    issue = next((issue for issue in issues if issue['comment_count']), issues[0])['id']
+    comments = call(client, 'GET', f'/api/projects/{project}/issues/{issue}/comments/')['results']
+    if not comments:
+        comments = [call(client, 'POST', f'/api/projects/{project}/issues/{issue}/comments/',
+                         {'description': 'Commentaire', 'issue': issue}, expected=201)]
+    return {'me': me, 'other': other, 'project': project, 'contributor': contributor, 'issue': issue,
+            'comment': comments[0]['uuid']}
+
+
+def read_endpoints(ids, prefix):
+    """Endpoints de lecture : (libellé, chemin)."""
+    project = f"/api/projects/{ids['project']}"
+    issue = f"{project}/issues/{ids['issue']}"
+    comment = f"{issue}/comments/{ids['comment']}"
+    endpoints = [
+        ('user-list', '/api/users/'),
+        ('user-list ?search', f'/api/users/?search={prefix}-user1'),
+        ('user-picker', '/api/users/picker/'),
+        ('user-detail', f"/api/users/{ids['me']}/"),
+        ('project-list', '/api/projects/'),
+        ('project-detail', f'{project}/'),
+        ('project-stats', f'{project}/stats/'),
+        ('project-comments ?search', f'{project}/comments/?search=serveur'),
+        ('project-export', f'{project}/export/?format=ndjson'),
+        ('contributor-list', f'{project}/contributors/'),
+        ('contributor-detail', f"{project}/contributors/{ids['contributor']}/"),
+        ('issue-list', f'{project}/issues/'),
+        ('issue-list ?filtres', f'{project}/issues/?status=TODO,INPROGRESS&ordering=-priority'),
+        ('issue-list ?search', f'{project}/issues/?search=serveur'),
+        ('issue-list ?cursor', f'{project}/issues/?pagination=cursor'),
+        ('issue-detail', f'{issue}/'),
+        ('comment-list', f'{issue}/comments/'),
+        ('comment-detail', f'{comment}/'),
+        ('choices', '/api/choices/'),
+        ('project-choices', '/api/choices/projects/'),
+        ('issue-choices', '/api/choices/issues/'),
+    ]
+    async_paths = ['/api/projects/', f'{project}/', f'{project}/issues/', f'{issue}/', f'{issue}/comments/',
+                   f'{comment}/', '/api/choices/']
+    labels = ['project-list', 'project-detail', 'issue-list', 'issue-detail', 'comment-list', 'comment-detail',
+              'choices']
+    endpoints += [(f'async-{label}', path.replace('/api/', '/api/async/', 1))
+                  for label, path in zip(labels, async_paths)]
+    return endpoints
+
+
+def write_cycles(ids, run):
+    """
+    Mesure les endpoints d'écriture par cycles création, modification, suppression.
+
+    Args:
+        ids (dict): Objets trouvés par discover().
+        run (callable): run(libellé, méthode, chemins, corps, statut attendu) -> réponses.
+    """
+    project = f"/api/projects/{ids['project']}"
+    issue = f"{project}/issues/{ids['issue']}"
+    stamp = time.time_ns()
+
+    projects = run('project-create', 'POST', lambda i: '/api/projects/',
+                   lambda i: {'name': f'Projet {i}', 'description': 'Benchmark', 'type': 'BACKEND'}, 201)
+    paths = [f"/api/projects/{created['id']}/" for created in projects]
+    run('project-partial-update', 'PATCH', lambda i: paths[i], lambda i: {'description': 'Modifié'}, 200)
+    contributors = run('contributor-create', 'POST', lambda i: f'{paths[i]}contributors/',
+                       lambda i: {'user': ids['other'], 'project': projects[i]['id']}, 201)
+    run('contributor-destroy', 'DELETE', lambda i: f"{paths[i]}contributors/{contributors[i]['id']}/", None, 204)
+    run('project-destroy', 'DELETE', lambda i: paths[i], None, 204)
+
+    issues = run('issue-create', 'POST', lambda i: f'{project}/issues/',
+                 lambda i: {'title': f'Issue {i}', 'description': 'Benchmark', 'tag': 'BUG',
+                            'project': ids['project']}, 201)
+    run('issue-partial-update', 'PATCH', lambda i: f"{project}/issues/{issues[i]['id']}/",
+        lambda i: {'status': 'INPROGRESS'}, 200)
+    run('issue-bulk-create', 'POST', lambda i: f'{project}/issues/bulk/',
+        lambda i: [{'title': f'Lot {i}-{j}', 'tag': 'TASK', 'project': ids['project']} for j in range(10)], 201)
+    comments = run('comment-create', 'POST', lambda i: f'{issue}/comments/',
+                   lambda i: {'description': f'Commentaire {i}', 'issue': ids['issue']}, 201)
+    run('comment-partial-update', 'PATCH', lambda i: f"{issue}/comments/{comments[i]['uuid']}/",
+        lambda i: {'description': 'Modifié'}, 200)
+    run('comment-bulk-create', 'POST', lambda i: f'{issue}/comments/bulk/',
+        lambda i: [{'description': f'Lot {i}-{j}', 'issue': ids['issue']} for j in range(10)], 201)
+    run('comment-destroy', 'DELETE', lambda i: f"{issue}/comments/{comments[i]['uuid']}/", None, 204)
+    run('issue-destroy', 'DELETE', lambda i: f"{project}/issues/{issues[i]['id']}/", None, 204)
+
+    users = run('user-create', 'POST', lambda i: '/api/users/',
+                lambda i: {'username': f'bench-{stamp}-{i}', 'password': 'bench-password'}, 201)
+    run('user-partial-update', 'PATCH', lambda i: f"/api/users/{users[i]['id']}/",
+        lambda i: {'can_be_contacted': True}, 200)
+    run('user-destroy', 'DELETE', lambda i: f"/api/users/{users[i]['id']}/", None, 204)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='serveur à mesurer (base remplie par seed_softdesk) ; en processus sinon')
+    parser.add_argument('--metrics-token', help='jeton de /api/_metrics du serveur (requêtes SQL)')
+    parser.add_argument('--requests', type=int, default=200, help='requêtes par endpoint de lecture')
+    parser.add_argument('--write-requests', type=int, default=20, help="requêtes par endpoint d'écriture")
+    parser.add_argument('--prefix', default='seed')
+    parser.add_argument('--password', default='softdesk-seed')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--projects', type=int, default=20)
+    parser.add_argument('--contributors', type=int, default=10)
+    parser.add_argument('--issues', type=int, default=200)
+    parser.add_argument('--comments', type=int, default=5)
+    parser.add_argument('--no-response-cache', action='store_true', help='désactive le cache des réponses')
+    parser.add_argument('--output', help='fichier JSON des résultats')
+    args = parser.parse_args()
+
+    if args.url:
+        client = ServerClient(args.url, args.metrics_token)
+        volumes = None
+    else:
+        directory = tempfile.TemporaryDirectory()
+        overrides = {'SOFTDESK_RESPONSE_CACHE': None} if args.no_response_cache else {}
+        setup_django(Path(directory.name) / 'api_suite.sqlite3', ALLOWED_HOSTS=['testserver'], DEBUG=False,
+                     **overrides)
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+        volumes = {name: getattr(args, name) for name in ('users', 'projects', 'contributors', 'issues', 'comments')}
+        start = time.perf_counter()
+        call_command('seed_softdesk', prefix=args.prefix, password=args.password, **volumes)
+        print(f'Base générée en {time.perf_counter() - start:.1f} s')
+        client = InProcessClient()
+
+    ids = discover(client, args.prefix, args.password)
+    results = []
+    print(f"{'endpoint':<28} {'méthode':<7} {'requêtes':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'SQL/req':>8}")
+
+    def run(label, method, path, body, expected, requests):
+        before = client.query_totals()
+        durations, queries, responses = [], [], []
+        for i in range(requests):
+            data = body(i) if body else None
+            begin = time.perf_counter()
+            status, content, count = client.request(method, path(i), data)
+            durations.append((time.perf_counter() - begin) * 1000)
+            if status != expected:
+                raise SystemExit(f'{label} : {method} {path(i)} a répondu {status}\n{content[:500]!r}')
+            queries.append(count)
+            if method in ('POST', 'PATCH'):
+                responses.append(json.loads(content))
+        after = client.query_totals()
+        if before is not None:
+            per_request = (after[0] - before[0]) / max(after[1] - before[1], 1)
+        elif queries[0] is not None:
+            per_request = sum(queries) / len(queries)
+        else:
+            per_request = None
+        points = percentiles(durations)
+        results.append({'endpoint': label, 'method': method, 'requests': requests,
+                        'p50': points[50], 'p95': points[95], 'p99': points[99], 'queries': per_request})
+        sql = '—' if per_request is None else f'{per_request:.1f}'
+        print(f'{label:<28} {method:<7} {requests:>8} {points[50]:>6.2f} ms {points[95]:>6.2f} ms '
+              f'{points[99]:>6.2f} ms {sql:>8}')
+        return responses
+
+    for label, path in read_endpoints(ids, args.prefix):
+        run(label, 'GET', lambda i, path=path: path, None, 200, args.requests)
+    write_cycles(ids, lambda label, method, path, body, expected: run(
+        label, method, path, body, expected, args.write_requests))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(
+            {'mode': 'serveur' if args.url else 'processus', 'url': args.url, 'volumes': volumes,
+             'requests': args.requests, 'write_requests': args.write_requests, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
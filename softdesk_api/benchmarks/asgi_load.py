@@ -0,0 +1,148 @@
+"""
+Test de charge : débit des endpoints de lecture sous WSGI et sous ASGI, servis par uvicorn.
+
+Le script crée une base SQLite temporaire (un projet, ses issues et des commentaires), puis
+lance trois serveurs uvicorn successifs (un worker chacun) sur cette base :
+    - wsgi  : softdesk_api.wsgi, vues DRF synchrones (pool de threads d'uvicorn) ;
+    - asgi  : softdesk_api.asgi, mêmes vues DRF, exécutées par l'adaptateur sync_to_async ;
+    - async : softdesk_api.asgi, vues async de /api/async/ (project/async_views.py).
+Pour chaque nombre de connexions simultanées, des clients HTTP/1.1 keep-alive (asyncio, sans
+dépendance) appellent en boucle les endpoints pendant la durée donnée ; le script affiche le
+débit et les percentiles de latence. Les listes synchrones profitent du cache des réponses.
+
+Usage (uvicorn requis : pip install uvicorn) :
+    python -m benchmarks.asgi_load --connections 1 16 64 --duration 10
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import BASE_DIR, percentiles, setup_django
+from benchmarks.jwt_auth import seed
+
+SERVERS = (
+    ('wsgi', 'softdesk_api.wsgi:application', 'wsgi', '/api/'),
+    ('asgi', 'softdesk_api.asgi:application', 'asgi3', '/api/'),
+    ('async', 'softdesk_api.asgi:application', 'asgi3', '/api/async/'),
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, interface, port, db_path):
+    """Lance uvicorn sur la base du benchmark et attend qu'il accepte les connexions."""
+    env = dict(os.environ, SOFTDESK_DB_NAME=str(db_path), DJANGO_SETTINGS_MODULE='softdesk_api.settings')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', app, '--interface', interface, '--port', str(port),
+         '--log-level', 'warning', '--no-access-log'],
+        cwd=BASE_DIR, env=env,
+    )
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'uvicorn ne répond pas ({app})')
+
+
+async def read_response(reader):
+    """Lit une réponse HTTP/1.1 (Content-Length) et renvoie son code de statut."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return int(lines[0].split()[1])
+
+
+async def client(port, requests, deadline, durations):
+    """Une connexion keep-alive qui envoie les requêtes en boucle jusqu'à l'échéance."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            begin = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            status = await read_response(reader)
+            durations.append((time.perf_counter() - begin) * 1000)
+            assert status == 200, status
+            i += 1
+    finally:
+        writer.close()
+
+
+async def load(port, requests, connections, duration):
+    """Lance `connections` clients simultanés ; renvoie le débit et les durées."""
+    durations = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, start + duration, durations) for _ in range(connections)))
+    return len(durations) / (time.perf_counter() - start), durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=200)
+    parser.add_argument('--connections', type=int, nargs='+', default=[1, 16, 64])
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+    if importlib.util.find_spec('uvicorn') is None:
+        sys.exit('uvicorn est requis : pip install uvicorn')
+
+    directory = tempfile.TemporaryDirectory()
+    db_path = Path(directory.name) / 'asgi_load.sqlite3'
+    setup_django(db_path)
+
+    from django.core.management import call_command
+    from authentication.tokens import ClaimsRefreshToken
+
+    call_command('migrate', verbosity=0)
+    project, issue = seed(args.issues)
+    token = ClaimsRefreshToken.for_user(project.author).access_token
+    paths = [
+        f'projects/{project.id}/',
+        f'projects/{project.id}/issues/',
+        f'projects/{project.id}/issues/{issue.id}/',
+        f'projects/{project.id}/issues/{issue.id}/comments/',
+    ]
+
+    print(f'{len(paths)} endpoints de lecture, {args.duration:.0f} s par mesure')
+    print(f"{'serveur':<8} {'connexions':>10} {'débit':>12} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for label, app, interface, prefix in SERVERS:
+        port = free_port()
+        requests = [
+            f'GET {prefix}{path} HTTP/1.1\r\nHost: localhost\r\nAuthorization: Bearer {token}\r\n\r\n'.encode()
+            for path in paths
+        ]
+        process = start_server(app, interface, port, db_path)
+        try:
+            asyncio.run(load(port, requests, 4, 1.0))  # Échauffement : connexions, index d'appartenance
+            for connections in args.connections:
+                throughput, durations = asyncio.run(load(port, requests, connections, args.duration))
+                points = percentiles(durations)
+                print(f'{label:<8} {connections:>10} {throughput:>8.1f} req/s {points[50]:>6.2f} ms '
+                      f'{points[95]:>6.2f} ms {points[99]:>6.2f} ms')
+        finally:
+            process.terminate()
+            process.wait()
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
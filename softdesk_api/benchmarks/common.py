@@ -0,0 +1,74 @@
+"""
+Outils communs aux scripts de benchmark.
+
+Les scripts se lancent depuis le dossier softdesk_api, par exemple :
+    python -m benchmarks.query_plans --issues 1000000
+Chacun travaille sur sa propre base SQLite (fichier temporaire par défaut), jamais sur db.sqlite3.
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path, **settings_overrides):
+    """
+    Configure Django sur une base SQLite dédiée au benchmark.
+
+    Le profil de base de données reste celui de SOFTDESK_DB_PROFILE (settings.py).
+
+    Args:
+        db_path (str | Path): Chemin du fichier SQLite à utiliser.
+        **settings_overrides: Réglages supplémentaires à surcharger avant django.setup().
+    """
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'softdesk_api.settings')
+
+    import django
+    from django.conf import settings
+
+    for database in settings.DATABASES.values():  # Les alias d'un profil désignent le même fichier
+        database['NAME'] = str(db_path)
+    for name, value in settings_overrides.items():
+        setattr(settings, name, value)
+    django.setup()
+
+
+def measure(function, repeat=5):
+    """
+    Exécute une fonction plusieurs fois et renvoie la durée médiane.
+
+    Args:
+        function (callable): Fonction sans argument à chronométrer.
+        repeat (int): Nombre d'exécutions.
+
+    Returns:
+        float: Durée médiane en millisecondes.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def percentiles(durations, points=(50, 95, 99)):
+    """
+    Calcule des percentiles sur une liste de durées.
+
+    Args:
+        durations (list): Durées mesurées.
+        points (tuple): Percentiles souhaités.
+
+    Returns:
+        dict: Percentile -> durée.
+    """
+    ordered = sorted(durations)
+    if not ordered:
+        return {point: 0.0 for point in points}
+    return {point: ordered[min(len(ordered) - 1, int(len(ordered) * point / 100))] for point in points}
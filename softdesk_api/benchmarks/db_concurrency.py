@@ -0,0 +1,143 @@
+"""
+Test de concurrence SQLite : lectures et écritures mêlées, par plusieurs processus, selon le
+profil de base de données (SOFTDESK_DB_PROFILE, softdesk_api/settings.py).
+
+Le script génère une base avec seed_softdesk, puis, pour chaque profil, en copie le fichier et
+lance des processus (comme des workers gunicorn synchrones) qui enchaînent des « requêtes »
+pendant la durée donnée. Chaque requête commence et finit comme une requête HTTP
+(close_old_connections : la connexion est fermée, ou conservée selon CONN_MAX_AGE) :
+    - lecture : appartenance au projet, COUNT(*) et page d'issues (lignes values()), sur l'alias
+      'read' s'il est défini ;
+    - écriture : dans une transaction, lecture de l'issue puis création d'un commentaire (les
+      signaux mettent à jour ses compteurs et la version du projet).
+Le script affiche, par profil, le débit, les erreurs « database is locked » et les percentiles
+de latence des lectures et des écritures.
+
+Usage :
+    python -m benchmarks.db_concurrency --workers 4 --duration 10 --write-ratio 0.05
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import percentiles, setup_django
+
+PROFILES = ('default', 'production')
+
+
+def worker(profile, db_path, duration, write_ratio, seed, results):
+    """Processus de charge : enchaîne lectures et écritures jusqu'à l'échéance."""
+    os.environ['SOFTDESK_DB_PROFILE'] = profile
+    setup_django(db_path)
+
+    from django.db import DEFAULT_DB_ALIAS, OperationalError, close_old_connections, connections, transaction
+    from project.models import Contributor, Issue, Comment
+    from project.serializers import IssueReadSerializer
+
+    read_alias = 'read' if 'read' in connections.settings else DEFAULT_DB_ALIAS
+    rng = random.Random(seed)
+    members = list(Contributor.objects.values_list('project_id', 'user_id'))
+    issues = {}
+    for issue_id, project_id in Issue.objects.values_list('id', 'project_id'):
+        issues.setdefault(project_id, []).append(issue_id)
+    close_old_connections()
+
+    def read(project_id, user_id):
+        Contributor.objects.using(read_alias).filter(project_id=project_id, user_id=user_id).exists()
+        queryset = Issue.objects.using(read_alias).filter(project_id=project_id).order_by('id')
+        queryset.count()
+        list(IssueReadSerializer.rows(queryset)[:10])
+
+    def write(project_id, user_id):
+        with transaction.atomic():
+            issue = Issue.objects.get(pk=rng.choice(issues[project_id]))
+            Comment.objects.create(description='Commentaire de charge', issue=issue, author_id=user_id)
+
+    durations = {'read': [], 'write': []}
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        kind = 'write' if rng.random() < write_ratio else 'read'
+        project_id, user_id = rng.choice(members)
+        close_old_connections()
+        begin = time.perf_counter()
+        try:
+            (write if kind == 'write' else read)(project_id, user_id)
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+            errors += 1
+        else:
+            durations[kind].append((time.perf_counter() - begin) * 1000)
+        finally:
+            close_old_connections()
+    connections.close_all()
+    results.put((durations, errors))
+
+
+def run(profile, template, directory, args):
+    """Lance les processus d'un profil sur une copie de la base ; renvoie leurs mesures réunies."""
+    db_path = Path(directory) / f'{profile}.sqlite3'
+    shutil.copyfile(template, db_path)
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(profile, db_path, args.duration, args.write_ratio, i, results))
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    measures = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    durations = {kind: [value for worker_durations, _ in measures for value in worker_durations[kind]]
+                 for kind in ('read', 'write')}
+    return durations, sum(errors for _, errors in measures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--write-ratio', type=float, default=0.05)
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--projects', type=int, default=20)
+    parser.add_argument('--issues', type=int, default=200)
+    parser.add_argument('--comments', type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    template = Path(directory.name) / 'template.sqlite3'
+    os.environ['SOFTDESK_DB_PROFILE'] = 'default'  # Le modèle reste en journal DELETE
+    setup_django(template)
+
+    from django.core.management import call_command
+    from django.db import connections
+    from project.seeding import seed_softdesk
+
+    call_command('migrate', verbosity=0)
+    counts = seed_softdesk(users=args.users, projects=args.projects, contributors=min(10, args.users),
+                           issues=args.issues, comments=args.comments)
+    connections.close_all()
+
+    print(f"{counts['issues']} issues, {counts['comments']} commentaires ; {args.workers} processus, "
+          f"{args.write_ratio:.0%} d'écritures, {args.duration:.0f} s par profil")
+    print(f"{'profil':<11} {'débit':>12} {'écritures':>12} {'verrous':>8} "
+          f"{'lecture p50':>12} {'p95':>9} {'écriture p50':>13} {'p95':>9}")
+    for profile in args.profiles:
+        durations, errors = run(profile, template, directory.name, args)
+        done = len(durations['read']) + len(durations['write'])
+        reads, writes = percentiles(durations['read']), percentiles(durations['write'])
+        print(f"{profile:<11} {done / args.duration:>8.1f} op/s {len(durations['write']) / args.duration:>6.1f} op/s "
+              f"{errors:>8} {reads[50]:>9.2f} ms {reads[95]:>6.2f} ms {writes[50]:>10.2f} ms {writes[95]:>6.2f} ms")
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
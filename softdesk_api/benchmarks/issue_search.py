@@ -0,0 +1,110 @@
+"""
+Recherche plein texte des issues (FTS5) comparée au repli icontains.
+
+Le script crée une base au schéma 0001, la remplit en SQL brut (un million d'issues par défaut,
+titres et descriptions tirés d'un vocabulaire de mots synthétiques), applique les migrations
+suivantes (dont 0004, qui construit l'index FTS5), puis mesure la durée médiane d'une page de
+résultats (10 issues, triées par pertinence) et du COUNT(*) associé, dans le projet le plus
+fourni, avec FTS5 puis avec le repli icontains.
+
+Usage :
+    python -m benchmarks.issue_search --issues 1000000 --projects 200
+"""
+import argparse
+import itertools
+import random
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.common import measure, setup_django
+from benchmarks.query_plans import PRIORITIES, STATUSES, TAGS, seed
+
+SYLLABLES = ('ba', 'co', 'di', 'fu', 'ga', 'lo', 'mi', 'ne', 'pa', 'ri', 'so', 'ta', 'vu', 'ze')
+
+
+def vocabulary(size):
+    """Renvoie `size` mots synthétiques de trois syllabes."""
+    return [''.join(parts) for parts in itertools.islice(itertools.product(SYLLABLES, repeat=3), size)]
+
+
+def seed_issues(cursor, issues, projects, users, words, batch=50000):
+    """Insère les issues (schéma 0001) ; la fréquence des mots suit une loi de Zipf."""
+    rng = random.Random(7)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    start = datetime(2024, 1, 1)
+    for first in range(0, issues, batch):
+        rows = []
+        for i in range(first, min(first + batch, issues)):
+            title = ' '.join(rng.choices(words, weights, k=4))
+            description = ' '.join(rng.choices(words, weights, k=20))
+            rows.append((
+                title, description, rng.choice(STATUSES), rng.choice(PRIORITIES), rng.choice(TAGS),
+                (start + timedelta(seconds=i)).isoformat(' '), rng.randint(1, users), rng.randint(1, projects),
+            ))
+        cursor.executemany(
+            'INSERT INTO project_issue (title, description, status, priority, tag, created_time, author_id, '
+            'project_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--issues', type=int, default=1000000)
+    parser.add_argument('--words', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    setup_django(Path(directory.name) / 'issue_search.sqlite3')
+
+    from django.core.management import call_command
+    from django.db import connection, transaction
+    from project.models import Issue
+    from project.search import full_text_search
+
+    words = vocabulary(args.words)
+    call_command('migrate', 'project', '0001', verbosity=0)
+    print(f'Remplissage : {args.issues} issues, {args.projects} projets, {len(words)} mots...')
+    with transaction.atomic(), connection.cursor() as cursor:
+        seed(cursor, args.users, args.projects, 1, issues=0, comments=0)
+        seed_issues(cursor, args.issues, args.projects, args.users, words)
+    call_command('migrate', verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+        cursor.execute('SELECT project_id, COUNT(*) FROM project_issue GROUP BY project_id ORDER BY 2 DESC LIMIT 1')
+        project_id, project_issues = cursor.fetchone()
+    print(f'Projet {project_id} : {project_issues} issues')
+
+    searches = {
+        'mot fréquent': words[0],
+        'mot moyen': words[100],
+        'mot rare': words[-1],
+        'deux mots': f'{words[3]} {words[50]}',
+        'préfixe': words[200][:4],
+        'préfixe court': words[200][:2],
+    }
+    print(f"{'recherche':<14} {'FTS5 résultats':>14} {'page':>9} {'count':>9}  "
+          f"{'icontains résultats':>19} {'page':>9} {'count':>9}")
+    for label, text in searches.items():
+        timings, counts = [], []
+        for fts in (True, False):
+            with patch('project.search.fts_available', return_value=fts):
+                queryset = full_text_search(
+                    Issue.objects.filter(project_id=project_id), text, 'search_index', ('title', 'description'),
+                    'project_id', project_id,
+                )
+                counts.append(queryset.count())
+                timings.append(measure(lambda: list(queryset[:10]), args.repeat))
+                timings.append(measure(queryset.count, args.repeat))
+        print(f'{label:<14} {counts[0]:>14} {timings[0]:>7.2f}ms {timings[1]:>7.2f}ms  '
+              f'{counts[1]:>19} {timings[2]:>7.2f}ms {timings[3]:>7.2f}ms')
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Durée du rendu et de la lecture JSON selon l'implémentation : JSONRenderer/JSONParser de DRF
+(module json de la bibliothèque standard) et FastJSONRenderer/FastJSONParser (orjson).
+
+Le script crée une base SQLite temporaire, sérialise une page d'issues (IssueSerializer) et une
+page de commentaires (CommentSerializer, UUID compris) et les mêmes commentaires « bruts »
+(datetimes et UUID non convertis, tels que values() les renvoie), puis chronomètre le rendu de
+ces données et la lecture des octets rendus. Les deux rendus produisent les mêmes octets.
+
+Usage :
+    python -m benchmarks.json_rendering --size 100 --repeat 200
+"""
+import argparse
+import io
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import measure, setup_django
+from benchmarks.response_cache import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100, help='objets par page')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    setup_django(Path(directory.name) / 'json_rendering.sqlite3')
+
+    from django.core.management import call_command
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from project.models import Comment, Issue
+    from project.parsers import FastJSONParser
+    from project.renderers import FastJSONRenderer, orjson
+    from project.serializers import CommentSerializer, IssueSerializer
+
+    if orjson is None:
+        print('orjson absent : FastJSONRenderer se replie sur le rendu de DRF (pip install orjson)')
+    call_command('migrate', verbosity=0)
+    _, project, issue = seed(args.size, args.size)
+    issues = Issue.objects.filter(project=project).select_related('author', 'assignee').order_by('id')[:args.size]
+    comments = Comment.objects.filter(issue=issue).select_related('author').order_by('id')[:args.size]
+    payloads = {
+        'issues': {'count': args.size, 'next': None, 'previous': None,
+                   'results': IssueSerializer(issues, many=True).data},
+        'commentaires': {'count': args.size, 'next': None, 'previous': None,
+                         'results': CommentSerializer(comments, many=True).data},
+        'commentaires bruts': {'results': list(comments.values('id', 'uuid', 'description', 'created_time'))},
+    }
+
+    print(f"{'page':<20} {'octets':>8} {'rendu DRF':>11} {'rendu rapide':>13} "
+          f"{'lecture DRF':>12} {'lecture rapide':>15}")
+    for label, data in payloads.items():
+        content = FastJSONRenderer().render(data)
+        timings = [
+            measure(lambda: [JSONRenderer().render(data) for _ in range(args.repeat)]),
+            measure(lambda: [FastJSONRenderer().render(data) for _ in range(args.repeat)]),
+            measure(lambda: [JSONParser().parse(io.BytesIO(content)) for _ in range(args.repeat)]),
+            measure(lambda: [FastJSONParser().parse(io.BytesIO(content)) for _ in range(args.repeat)]),
+        ]
+        cells = [f'{timing * 1000 / args.repeat:.1f} µs' for timing in timings]
+        print(f'{label:<20} {len(content):>8} {cells[0]:>11} {cells[1]:>13} {cells[2]:>12} {cells[3]:>15}')
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
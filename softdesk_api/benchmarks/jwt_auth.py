@@ -0,0 +1,90 @@
+"""
+Débit des endpoints de lecture selon l'authentification JWT utilisée.
+
+Le script crée une base SQLite temporaire, obtient une paire de jetons par /api/token/, puis
+appelle en boucle (client de test Django, dans le processus, en-tête Authorization) des
+endpoints de lecture avec JWTAuthentication, qui lit l'utilisateur en base à chaque requête,
+puis avec ClaimsJWTAuthentication, qui le construit à partir des claims du jeton.
+
+Usage :
+    python -m benchmarks.jwt_auth --requests 2000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import percentiles, setup_django
+
+AUTHENTICATORS = (
+    ('JWTAuthentication', 'rest_framework_simplejwt.authentication.JWTAuthentication'),
+    ('ClaimsJWTAuthentication', 'authentication.authentication.ClaimsJWTAuthentication'),
+)
+
+
+def seed(issues):
+    """Crée un utilisateur, son projet et ses issues ; renvoie le projet et une issue."""
+    from authentication.models import CustomUser
+    from project.models import Comment, Contributor, Issue, Project
+
+    user = CustomUser.objects.create_user(username='bench', password='bench-password')
+    project = Project.objects.create(name='Projet', description='', type='BACKEND', author=user)
+    Contributor.objects.create(user=user, project=project)
+    created = Issue.objects.bulk_create(
+        Issue(title=f'Issue {i}', tag='BUG', project=project, author=user) for i in range(issues)
+    )
+    Comment.objects.create(description='Commentaire', issue=created[0], author=user)
+    return project, created[0]
+
+
+def run(client, urls, requests):
+    """Appelle les URL en boucle et renvoie le débit et les durées."""
+    durations = []
+    start = time.perf_counter()
+    for i in range(requests):
+        begin = time.perf_counter()
+        response = client.get(urls[i % len(urls)])
+        durations.append((time.perf_counter() - begin) * 1000)
+        assert response.status_code == 200, response.status_code
+    return requests / (time.perf_counter() - start), durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    setup_django(Path(directory.name) / 'jwt_auth.sqlite3', ALLOWED_HOSTS=['testserver'], DEBUG=False)
+
+    from django.core.management import call_command
+    from django.utils.module_loading import import_string
+    from rest_framework.test import APIClient
+    from rest_framework.views import APIView
+
+    call_command('migrate', verbosity=0)
+    project, issue = seed(args.issues)
+    client = APIClient()
+    tokens = client.post('/api/token/', {'username': 'bench', 'password': 'bench-password'}, format='json').json()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    urls = [
+        f'/api/projects/{project.id}/',
+        f'/api/projects/{project.id}/issues/',
+        f'/api/projects/{project.id}/issues/{issue.id}/',
+        f'/api/projects/{project.id}/issues/{issue.id}/comments/',
+    ]
+
+    print(f'{len(urls)} endpoints de lecture, {args.requests} requêtes')
+    for label, path in AUTHENTICATORS:
+        APIView.authentication_classes = [import_string(path)]
+        run(client, urls, len(urls) * 5)  # Échauffement : index d'appartenance et cache des réponses
+        throughput, durations = run(client, urls, args.requests)
+        points = percentiles(durations)
+        print(f'{label:<24} {throughput:>8.1f} req/s  p50 {points[50]:.2f} ms  p95 {points[95]:.2f} ms  '
+              f'p99 {points[99]:.2f} ms')
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Connexions par seconde et par cœur sur /api/token/ pour chaque profil de hachage.
+
+Pour chaque profil (et chaque jeu de paramètres passé par --scrypt / --argon2), le script crée
+un utilisateur puis enchaîne les connexions sur /api/token/ dans un seul processus : le
+débit obtenu est celui d'un cœur. Le profil argon2 est ignoré si argon2-cffi est absent.
+
+Usage :
+    python -m benchmarks.password_hashing --logins 20
+    python -m benchmarks.password_hashing --scrypt 16384,8,5 --scrypt 65536,8,1 --argon2 2,19456,1
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import setup_django
+
+PASSWORD = 'bench-password'
+
+
+def parse_params(names):
+    """Construit le convertisseur d'une option 'a,b,c' en dictionnaire de paramètres."""
+    def parse(value):
+        return dict(zip(names, (int(part) for part in value.split(','))))
+    return parse
+
+
+def profiles(args):
+    """Liste les (libellé, hacheur, paramètres) à mesurer."""
+    from django.conf import settings
+
+    defaults = settings.SOFTDESK_PASSWORD_HASHING
+    hashers = settings.PASSWORD_HASHER_PROFILES
+    yield 'pbkdf2', hashers['pbkdf2'], defaults
+    for params in args.scrypt or [defaults['scrypt']]:
+        yield 'scrypt ' + ','.join(map(str, params.values())), hashers['scrypt'], {**defaults, 'scrypt': params}
+    for params in args.argon2 or [defaults['argon2']]:
+        yield 'argon2 ' + ','.join(map(str, params.values())), hashers['argon2'], {**defaults, 'argon2': params}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--scrypt', action='append', type=parse_params(('work_factor', 'block_size', 'parallelism')),
+                        help='N,r,p (répétable)')
+    parser.add_argument('--argon2', action='append', type=parse_params(('time_cost', 'memory_cost', 'parallelism')),
+                        help='temps,mémoire en Kio,parallélisme (répétable)')
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    setup_django(Path(directory.name) / 'password_hashing.sqlite3', ALLOWED_HOSTS=['testserver'], DEBUG=False)
+
+    from django.core.management import call_command
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+    from authentication.models import CustomUser
+
+    call_command('migrate', verbosity=0)
+    client = APIClient()
+    print(f'{args.logins} connexions par profil, un seul processus')
+    for label, hasher, params in profiles(args):
+        with override_settings(PASSWORD_HASHERS=[hasher], SOFTDESK_PASSWORD_HASHING=params):
+            try:
+                user = CustomUser.objects.create_user(username=label.replace(' ', '_'), password=PASSWORD)
+            except ValueError as error:
+                print(f'{label:<24} ignoré ({error})')
+                continue
+            start = time.perf_counter()
+            for _ in range(args.logins):
+                response = client.post('/api/token/', {'username': user.username, 'password': PASSWORD})
+                assert response.status_code == 200, response.status_code
+            elapsed = time.perf_counter() - start
+        print(f'{label:<24} {args.logins / elapsed:>7.2f} connexions/s/cœur  {elapsed / args.logins * 1000:>8.1f} ms')
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
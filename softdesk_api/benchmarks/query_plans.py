@@ -0,0 +1,166 @@
+"""
+Plans de requête SQLite avant et après les index composites (migration project 0002).
+
+Le script crée une base au schéma 0001, la remplit en SQL brut (un million d'issues par défaut),
+affiche EXPLAIN QUERY PLAN et la durée médiane des requêtes chaudes, applique la migration
+0002_access_path_indexes puis refait les mêmes mesures.
+
+Usage :
+    python -m benchmarks.query_plans --issues 1000000 --projects 200
+"""
+import argparse
+import random
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.common import measure, setup_django
+
+STATUSES = ('TODO', 'INPROGRESS', 'FINISHED')
+PRIORITIES = ('LOW', 'MEDIUM', 'HIGH')
+TAGS = ('BUG', 'FEATURE', 'TASK')
+
+QUERIES = {
+    'membership': (
+        'SELECT 1 FROM project_contributor WHERE project_id = %(project)s AND user_id = %(user)s LIMIT 1'
+    ),
+    'contributor list': (
+        'SELECT * FROM project_contributor WHERE project_id = %(project)s ORDER BY id LIMIT 10'
+    ),
+    'issue list (page)': (
+        'SELECT * FROM project_issue WHERE project_id = %(project)s ORDER BY id LIMIT 10'
+    ),
+    'issue list (cursor)': (
+        "SELECT * FROM project_issue WHERE project_id = %(project)s AND created_time > %(since)s "
+        "ORDER BY created_time, id LIMIT 11"
+    ),
+    'issue by status': (
+        "SELECT * FROM project_issue WHERE project_id = %(project)s AND status = 'INPROGRESS' ORDER BY id LIMIT 10"
+    ),
+    'issue by priority': (
+        "SELECT * FROM project_issue WHERE project_id = %(project)s AND priority = 'HIGH' ORDER BY id LIMIT 10"
+    ),
+    'issue by assignee': (
+        'SELECT * FROM project_issue WHERE project_id = %(project)s AND assignee_id = %(user)s ORDER BY id LIMIT 10'
+    ),
+    'comment list (cursor)': (
+        'SELECT * FROM project_comment WHERE issue_id = %(issue)s ORDER BY created_time, id LIMIT 11'
+    ),
+    'comments of projects': (
+        'SELECT project_comment.* FROM project_comment '
+        'INNER JOIN project_issue ON project_comment.issue_id = project_issue.id '
+        'WHERE project_issue.project_id IN (%(project)s) ORDER BY project_comment.id LIMIT 10'
+    ),
+}
+
+
+def seed(cursor, users, projects, contributors, issues, comments, batch=50000):
+    """Remplit les tables du schéma 0001 en SQL brut."""
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)  # Django stocke les dates UTC sans fuseau sous SQLite
+    now = start.isoformat(' ')
+
+    cursor.executemany(
+        'INSERT INTO authentication_customuser (password, is_superuser, username, first_name, last_name, email, '
+        'is_staff, is_active, date_joined, can_be_contacted, can_data_be_shared) '
+        "VALUES ('!', 0, %s, '', '', %s, 0, 1, %s, 1, 1)",
+        [(f'user{i}', f'user{i}@example.com', now) for i in range(users)],
+    )
+    cursor.executemany(
+        'INSERT INTO project_project (name, description, type, created_time, author_id) '
+        "VALUES (%s, '', 'BACKEND', %s, %s)",
+        [(f'Projet {i}', now, rng.randint(1, users)) for i in range(projects)],
+    )
+    members = {
+        project: rng.sample(range(1, users + 1), min(contributors, users)) for project in range(1, projects + 1)
+    }
+    cursor.executemany(
+        'INSERT INTO project_contributor (created_time, user_id, project_id) VALUES (%s, %s, %s)',
+        [(now, user, project) for project, project_users in members.items() for user in project_users],
+    )
+
+    def issue_rows(first, count):
+        for i in range(first, first + count):
+            project = rng.randint(1, projects)
+            author = rng.choice(members[project])
+            yield (
+                f'Issue {i}', '', rng.choice(STATUSES), rng.choice(PRIORITIES), rng.choice(TAGS),
+                (start + timedelta(seconds=i)).isoformat(' '), rng.choice(members[project]), author, project,
+            )
+
+    for first in range(0, issues, batch):
+        cursor.executemany(
+            'INSERT INTO project_issue (title, description, status, priority, tag, created_time, assignee_id, '
+            'author_id, project_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)',
+            list(issue_rows(first, min(batch, issues - first))),
+        )
+    for first in range(0, comments, batch):
+        cursor.executemany(
+            'INSERT INTO project_comment (uuid, description, created_time, author_id, issue_id) '
+            "VALUES (%s, 'Commentaire', %s, %s, %s)",
+            [
+                (uuid.uuid4().hex, (start + timedelta(seconds=i)).isoformat(' '), rng.randint(1, users),
+                 rng.randint(1, issues))
+                for i in range(first, min(first + batch, comments))
+            ],
+        )
+
+
+def report(cursor, title, params, repeat):
+    """Affiche le plan et la durée médiane de chaque requête."""
+    print(f'\n=== {title} ===')
+    for name, sql in QUERIES.items():
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = ' | '.join(row[-1] for row in cursor.fetchall())
+
+        def run():
+            cursor.execute(sql, params)
+            cursor.fetchall()
+
+        print(f'{name:<24} {measure(run, repeat):>9.3f} ms  {plan}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--contributors', type=int, default=25, help='contributeurs par projet')
+    parser.add_argument('--issues', type=int, default=1000000)
+    parser.add_argument('--comments', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--db', help='fichier SQLite à créer (temporaire par défaut)')
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    db_path = Path(args.db) if args.db else Path(directory.name) / 'query_plans.sqlite3'
+    setup_django(db_path)
+
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    call_command('migrate', 'project', '0001', verbosity=0)
+    print(f'Remplissage : {args.issues} issues, {args.comments} commentaires, {args.projects} projets...')
+    with transaction.atomic(), connection.cursor() as cursor:
+        seed(cursor, args.users, args.projects, args.contributors, args.issues, args.comments)
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+        cursor.execute('SELECT project_id, COUNT(*) FROM project_issue GROUP BY project_id ORDER BY 2 DESC LIMIT 1')
+        project = cursor.fetchone()[0]
+        cursor.execute('SELECT user_id FROM project_contributor WHERE project_id = %s LIMIT 1', [project])
+        user = cursor.fetchone()[0]
+        cursor.execute('SELECT issue_id FROM project_comment GROUP BY issue_id ORDER BY COUNT(*) DESC LIMIT 1')
+        issue = cursor.fetchone()[0]
+        params = {'project': project, 'user': user, 'issue': issue, 'since': '2024-01-06 00:00:00'}
+        report(cursor, 'Avant (0001_initial)', params, args.repeat)
+
+    call_command('migrate', 'project', '0002', verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+        report(cursor, 'Après (0002_access_path_indexes)', params, args.repeat)
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
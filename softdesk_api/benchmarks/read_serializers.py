@@ -0,0 +1,64 @@
+"""
+Coût par ligne de la sérialisation des listes : ModelSerializer et ReadSerializer.
+
+Le script crée une base SQLite temporaire, puis chronomètre pour une page d'issues et une page
+de commentaires :
+    - ModelSerializer : lecture des instances (select_related) puis IssueSerializer /
+      CommentSerializer, utilisateurs imbriqués compris ;
+    - ReadSerializer  : lecture des lignes values() (IssueReadSerializer.rows) puis conversion ;
+la lecture seule et la sérialisation seule sont aussi mesurées, et le rendu JSON n'est pas
+compté. Les durées sont données par ligne.
+
+Usage :
+    python -m benchmarks.read_serializers --size 100 --repeat 50
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import measure, setup_django
+from benchmarks.response_cache import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100, help='lignes par page')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    setup_django(Path(directory.name) / 'read_serializers.sqlite3')
+
+    from django.core.management import call_command
+    from project.models import Comment, Issue
+    from project.serializers import CommentReadSerializer, CommentSerializer, IssueReadSerializer, IssueSerializer
+
+    call_command('migrate', verbosity=0)
+    _, project, issue = seed(args.size, args.size)
+    pages = (
+        ('issues', Issue.objects.filter(project=project).order_by('id')[:args.size],
+         ('author', 'assignee'), IssueSerializer, IssueReadSerializer),
+        ('commentaires', Comment.objects.filter(issue=issue).order_by('id')[:args.size],
+         ('author',), CommentSerializer, CommentReadSerializer),
+    )
+
+    def per_row(function):
+        return f'{measure(lambda: [function() for _ in range(args.repeat)]) * 1000 / args.repeat / args.size:.2f} µs'
+
+    print(f"{'page':<14} {'sérialiseur':<16} {'lecture':>10} {'sérialisation':>14} {'total':>10}")
+    for label, queryset, related, serializer_class, read_serializer_class in pages:
+        instances = list(queryset.select_related(*related))
+        rows = list(read_serializer_class.rows(queryset))
+        print(f"{label:<14} {'ModelSerializer':<16} "
+              f"{per_row(lambda: list(queryset.select_related(*related))):>10} "
+              f"{per_row(lambda: serializer_class(instances, many=True).data):>14} "
+              f"{per_row(lambda: serializer_class(queryset.select_related(*related), many=True).data):>10}")
+        print(f"{label:<14} {'ReadSerializer':<16} "
+              f"{per_row(lambda: list(read_serializer_class.rows(queryset))):>10} "
+              f"{per_row(lambda: read_serializer_class(rows, many=True).data):>14} "
+              f"{per_row(lambda: read_serializer_class(read_serializer_class.rows(queryset), many=True).data):>10}")
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Débit des listes d'issues et de commentaires avec et sans cache des réponses.
+
+Le script crée une base SQLite temporaire, la remplit avec l'ORM, puis appelle en boucle
+(client de test Django, dans le processus) les premières pages des listes d'issues et de
+commentaires d'un projet, d'abord sans cache (SOFTDESK_RESPONSE_CACHE=None) puis avec.
+Le cache LocMem est utilisé par défaut ; --cache-dir sélectionne le cache fichier.
+
+Usage :
+    python -m benchmarks.response_cache --issues 2000 --requests 500
+    python -m benchmarks.response_cache --cache-dir /tmp/softdesk-cache
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import percentiles, setup_django
+
+
+def seed(issues, comments):
+    """Crée un projet, ses contributeurs, ses issues et les commentaires de la première issue."""
+    from authentication.models import CustomUser
+    from project.models import Comment, Contributor, Issue, Project
+
+    users = CustomUser.objects.bulk_create(CustomUser(username=f'user{i}') for i in range(10))
+    project = Project.objects.create(name='Projet', description='', type='BACKEND', author=users[0])
+    Contributor.objects.bulk_create(Contributor(user=user, project=project) for user in users)
+    created = Issue.objects.bulk_create(
+        Issue(title=f'Issue {i}', description='x' * 200, tag='BUG', project=project,
+              author=users[i % 10], assignee=users[(i + 1) % 10])
+        for i in range(issues)
+    )
+    Comment.objects.bulk_create(
+        Comment(description='Commentaire', issue=created[0], author=users[i % 10]) for i in range(comments)
+    )
+    return users[0], project, created[0]
+
+
+def run(client, urls, requests):
+    """Appelle les URL en boucle et renvoie le débit et les durées."""
+    durations = []
+    start = time.perf_counter()
+    for i in range(requests):
+        url = urls[i % len(urls)]
+        begin = time.perf_counter()
+        response = client.get(url)
+        durations.append((time.perf_counter() - begin) * 1000)
+        assert response.status_code == 200, response.status_code
+    return requests / (time.perf_counter() - start), durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--issues', type=int, default=2000)
+    parser.add_argument('--comments', type=int, default=500)
+    parser.add_argument('--pages', type=int, default=5, help='pages distinctes par liste')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--cache-dir', help='utilise le cache fichier dans ce dossier')
+    args = parser.parse_args()
+
+    if args.cache_dir:
+        os.environ['SOFTDESK_CACHE_DIR'] = args.cache_dir
+    directory = tempfile.TemporaryDirectory()
+    setup_django(Path(directory.name) / 'response_cache.sqlite3', ALLOWED_HOSTS=['testserver'], DEBUG=False)
+
+    from django.core.cache import caches
+    from django.core.management import call_command
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    call_command('migrate', verbosity=0)
+    user, project, issue = seed(args.issues, args.comments)
+    client = APIClient()
+    client.force_authenticate(user)
+    issues_url = f'/api/projects/{project.id}/issues/'
+    comments_url = f'{issues_url}{issue.id}/comments/'
+    urls = [f'{url}?page={page}' for url in (issues_url, comments_url) for page in range(1, args.pages + 1)]
+
+    backend = 'fichier' if args.cache_dir else 'LocMem'
+    print(f'{args.issues} issues, {args.comments} commentaires, {len(urls)} URL, cache {backend}')
+    for label, alias in (('sans cache', None), ('avec cache', 'responses')):
+        caches['responses'].clear()
+        with override_settings(SOFTDESK_RESPONSE_CACHE=alias):
+            run(client, urls, len(urls))  # Échauffement : index d'appartenance et cache remplis
+            throughput, durations = run(client, urls, args.requests)
+        points = percentiles(durations)
+        print(f'{label:<12} {throughput:>8.1f} req/s  p50 {points[50]:.2f} ms  p95 {points[95]:.2f} ms  '
+              f'p99 {points[99]:.2f} ms')
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ProjectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'project'
+
+    def ready(self):
+        from django.conf import settings
+        from . import signals  # noqa: F401
+
+        if 'project.middleware.MetricsMiddleware' in settings.MIDDLEWARE:
+            from . import metrics
+            metrics.install()
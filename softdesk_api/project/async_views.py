@@ -0,0 +1,173 @@
+"""
+Endpoints de lecture asynchrones, pour un déploiement ASGI (softdesk_api/asgi.py).
+Les choix sont servis par project/choices.py.
+
+Sous ASGI, une vue DRF synchrone s'exécute dans un thread via l'adaptateur sync_to_async,
+qui sérialise les vues « thread sensitive » sur un seul thread. Les vues de ce module sont
+des vues Django async : l'authentification lit l'utilisateur dans les claims du jeton (sans
+requête), les permissions et les listes utilisent l'ORM asynchrone (aget, aexists, acount,
+itération async), et la sérialisation porte sur des objets déjà chargés (select_related) ou, pour
+les listes d'issues et de commentaires, sur des lignes values() (ReadSerializer).
+
+Elles répondent sous /api/async/ avec les mêmes représentations, la même pagination par
+numéro de page et les mêmes erreurs ({"detail": ...}) que les ViewSets ; les écritures, les
+filtres, la recherche et les GET conditionnels restent servis par les vues synchrones.
+"""
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from authentication.authentication import ClaimsJWTAuthentication, authenticate_request
+from .metrics import timer
+from .models import Project, Issue, Comment
+from .renderers import FastJSONRenderer
+from .permissions import IsProjectContributor, aget_membership, aget_user_projects
+from .serializers import (
+    ProjectSerializer, IssueSerializer, CommentSerializer, IssueReadSerializer, CommentReadSerializer,
+)
+
+
+def error_response(request, exc):
+    """
+    Rend une erreur d'API comme le ferait DRF : {"detail": ...} et le code de l'exception.
+
+    Args:
+        request (HttpRequest): Requête en cours.
+        exc (APIException): Erreur à rendre.
+
+    Returns:
+        HttpResponse: Réponse JSON, avec WWW-Authenticate pour une erreur 401.
+    """
+    response = HttpResponse(FastJSONRenderer().render({'detail': exc.detail}), status=exc.status_code,
+                            content_type='application/json')
+    if exc.status_code == 401:
+        response['WWW-Authenticate'] = ClaimsJWTAuthentication().authenticate_header(request)
+    return response
+
+
+class AsyncReadView(View):
+    """
+    Vue de lecture asynchrone : authentification JWT, permissions, rendu JSON.
+
+    Les sous-classes implémentent `async def get(self, request, **kwargs)` et renvoient des
+    données à rendre.
+
+    Attributes:
+        requires_contributor (bool): Si True, l'utilisateur doit contribuer au projet de l'URL.
+    """
+    http_method_names = ['get', 'head', 'options']
+    requires_contributor = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            authenticate_request(request)
+            if self.requires_contributor:
+                with timer('permission'):
+                    membership = await aget_membership(request, kwargs['project_id'])
+                if not membership.is_contributor:
+                    raise exceptions.PermissionDenied(IsProjectContributor.message)
+            data = await super().dispatch(request, *args, **kwargs)
+        except (Http404, exceptions.APIException) as exc:
+            if isinstance(exc, Http404):
+                exc = exceptions.NotFound()
+            return error_response(request, exc)
+        return data if isinstance(data, HttpResponse) else self.render(data)
+
+    def render(self, data):
+        return HttpResponse(FastJSONRenderer().render(data), content_type='application/json')
+
+    async def paginate(self, request, queryset, serializer_class):
+        """
+        Renvoie une page de résultats, au format de PageNumberPagination.
+
+        Args:
+            request (HttpRequest): Requête en cours (paramètre `page`).
+            queryset (QuerySet): Objets ou lignes values() ordonnés à paginer.
+            serializer_class (type): Sérialiseur des objets ou des lignes.
+
+        Returns:
+            dict: count, next, previous et results.
+
+        Raises:
+            NotFound: Si la page demandée n'existe pas.
+        """
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            page = 0
+        count = await getattr(queryset, 'count_queryset', queryset).acount()
+        if page < 1 or (page - 1) * page_size >= max(count, 1):
+            raise exceptions.NotFound(PageNumberPagination.invalid_page_message)
+        offset = (page - 1) * page_size
+        objects = [obj async for obj in queryset[offset:offset + page_size]]
+        url = request.build_absolute_uri()
+        return {
+            'count': count,
+            'next': replace_query_param(url, 'page', page + 1) if offset + page_size < count else None,
+            'previous': (
+                None if page == 1 else
+                remove_query_param(url, 'page') if page == 2 else replace_query_param(url, 'page', page - 1)
+            ),
+            'results': serializer_class(objects, many=True).data,
+        }
+
+
+class ProjectListView(AsyncReadView):
+    """Projets dont l'utilisateur est contributeur."""
+    requires_contributor = False
+
+    async def get(self, request):
+        projects = await aget_user_projects(request)
+        queryset = Project.objects.filter(id__in=projects.contributed).select_related('author').order_by('id')
+        return await self.paginate(request, queryset, ProjectSerializer)
+
+
+class ProjectDetailView(AsyncReadView):
+
+    async def get(self, request, project_id):
+        try:
+            project = await Project.objects.select_related('author').aget(pk=project_id)
+        except Project.DoesNotExist:
+            raise Http404
+        return ProjectSerializer(project).data
+
+
+class IssueListView(AsyncReadView):
+
+    async def get(self, request, project_id):
+        queryset = IssueReadSerializer.rows(Issue.objects.filter(project_id=project_id).order_by('id'))
+        return await self.paginate(request, queryset, IssueReadSerializer)
+
+
+class IssueDetailView(AsyncReadView):
+
+    async def get(self, request, project_id, issue_id):
+        try:
+            issue = await Issue.objects.select_related('author', 'assignee').aget(pk=issue_id, project_id=project_id)
+        except Issue.DoesNotExist:
+            raise Http404
+        return IssueSerializer(issue).data
+
+
+class CommentListView(AsyncReadView):
+
+    async def get(self, request, project_id, issue_id):
+        if not await Issue.objects.filter(pk=issue_id, project_id=project_id).aexists():
+            raise Http404
+        queryset = CommentReadSerializer.rows(Comment.objects.filter(issue_id=issue_id).order_by('id'))
+        return await self.paginate(request, queryset, CommentReadSerializer)
+
+
+class CommentDetailView(AsyncReadView):
+
+    async def get(self, request, project_id, issue_id, uuid):
+        try:
+            comment = await Comment.objects.select_related('author').aget(
+                uuid=uuid, issue_id=issue_id, issue__project_id=project_id,
+            )
+        except Comment.DoesNotExist:
+            raise Http404
+        return CommentSerializer(comment).data
@@ -0,0 +1,100 @@
+"""
+Endpoints des choix (types de projet, statuts, priorités et tags des issues).
+
+Les choix sont des constantes des modèles : leurs réponses sont rendues une fois, au chargement
+du module, en octets JSON munis d'un ETag fort (empreinte du contenu). Les vues ne passent ni par
+la négociation DRF ni par la lecture de l'utilisateur en base : le jeton JWT est seulement
+vérifié (ClaimsJWTAuthentication), puis les octets sont renvoyés tels quels, ou une réponse
+304 si le client possède déjà la même version.
+
+/api/choices/ réunit les choix de tous les modèles en une charge utile versionnée ;
+/api/choices/projects/ et /api/choices/issues/ conservent leur format historique.
+"""
+import hashlib
+from collections import namedtuple
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views import View
+from rest_framework import exceptions
+from authentication.authentication import authenticate_request
+from .async_views import error_response
+from .models import Project, Issue
+from .renderers import FastJSONRenderer
+
+Prerendered = namedtuple('Prerendered', ['content', 'etag'])
+
+
+def prerender(data):
+    """
+    Rend des données en JSON et calcule leur ETag fort.
+
+    Args:
+        data (dict): Données à rendre.
+
+    Returns:
+        Prerendered: Octets JSON et ETag entre guillemets.
+    """
+    content = FastJSONRenderer().render(data)
+    return Prerendered(content, quote_etag(hashlib.sha256(content).hexdigest()[:32]))
+
+
+def values(choices):
+    return [value for value, _ in choices]
+
+
+MODEL_CHOICES = {
+    'project': {'type': values(Project.TYPE_CHOICES)},
+    'issue': {
+        'status': values(Issue.STATUS_CHOICES),
+        'priority': values(Issue.PRIORITY_CHOICES),
+        'tag': values(Issue.TAG_CHOICES),
+    },
+}
+# La version change avec le contenu : les clients peuvent la mémoriser avec les choix
+CHOICES_VERSION = prerender(MODEL_CHOICES).etag.strip('"')[:12]
+
+ALL_CHOICES = prerender({'version': CHOICES_VERSION, **MODEL_CHOICES})
+PROJECT_CHOICES = prerender(MODEL_CHOICES['project'])
+ISSUE_CHOICES = prerender(MODEL_CHOICES['issue'])
+
+
+class ChoicesView(View):
+    """
+    Renvoie une réponse pré-rendue, après vérification du jeton JWT.
+
+    Attributes:
+        payload (Prerendered): Réponse pré-rendue.
+    """
+    http_method_names = ['get', 'head', 'options']
+    payload = ALL_CHOICES
+
+    def get(self, request):
+        return self.respond(request)
+
+    def respond(self, request):
+        """
+        Construit la réponse : 401 sans jeton valide, 304 si l'ETag du client est à jour, 200 sinon.
+
+        Le Cache-Control est privé (la requête porte un jeton) et long :
+        SOFTDESK_CHOICES_MAX_AGE secondes, un jour par défaut.
+        """
+        try:
+            authenticate_request(request)
+        except exceptions.APIException as exc:
+            return error_response(request, exc)
+
+        response = get_conditional_response(request, etag=self.payload.etag)
+        if response is None:
+            response = HttpResponse(self.payload.content, content_type='application/json')
+        response['ETag'] = self.payload.etag
+        patch_cache_control(response, private=True, max_age=getattr(settings, 'SOFTDESK_CHOICES_MAX_AGE', 86400))
+        return response
+
+
+class AsyncChoicesView(ChoicesView):
+    """Même réponse, servie sans passer par un thread sous ASGI (/api/async/)."""
+
+    async def get(self, request):
+        return self.respond(request)
@@ -0,0 +1,117 @@
+"""
+Export en flux des issues et commentaires d'un projet.
+
+Les lignes sont lues par morceaux (QuerySet.iterator(chunk_size=...)) sous forme de dictionnaires
+(values()), puis encodées au fil de l'eau : la mémoire utilisée ne dépend pas du nombre de lignes.
+
+Attributes:
+    ISSUE_FIELDS (tuple): Colonnes exportées pour les issues.
+    COMMENT_FIELDS (tuple): Colonnes exportées pour les commentaires.
+    CSV_COLUMNS (tuple): Colonnes du CSV, communes aux deux types de lignes.
+    CSV_FORMULA_PREFIXES (tuple): Débuts de cellule interprétés comme une formule par les tableurs.
+"""
+import csv
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import serializers
+from .models import Issue, Comment
+
+ISSUE_FIELDS = (
+    'id', 'title', 'description', 'status', 'priority', 'tag', 'author_id', 'assignee_id', 'created_time',
+)
+COMMENT_FIELDS = ('id', 'uuid', 'issue_id', 'description', 'author_id', 'created_time')
+CSV_COLUMNS = ('type',) + ISSUE_FIELDS[:1] + ('uuid', 'issue_id') + ISSUE_FIELDS[1:]
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Même format de date que l'API JSON (ISO 8601, microsecondes conservées, 'Z' pour UTC)
+_created_time_field = serializers.DateTimeField()
+
+
+def iter_project_rows(project_id, chunk_size=2000):
+    """
+    Parcourt les issues puis les commentaires d'un projet, sans tout charger en mémoire.
+
+    Args:
+        project_id (int): Identifiant du projet.
+        chunk_size (int): Nombre de lignes lues par aller-retour avec la base.
+
+    Yields:
+        dict: Ligne exportée, avec une clé `type` valant 'issue' ou 'comment'.
+    """
+    issues = Issue.objects.filter(project_id=project_id).order_by('id').values(*ISSUE_FIELDS)
+    for row in issues.iterator(chunk_size=chunk_size):
+        row['type'] = 'issue'
+        yield format_row(row)
+    comments = Comment.objects.filter(issue__project_id=project_id).order_by('id').values(*COMMENT_FIELDS)
+    for row in comments.iterator(chunk_size=chunk_size):
+        row['type'] = 'comment'
+        yield format_row(row)
+
+
+def format_row(row):
+    """
+    Formate la date de création d'une ligne comme l'API JSON, pour les deux formats d'export.
+
+    Args:
+        row (dict): Ligne lue par values().
+
+    Returns:
+        dict: La même ligne, `created_time` en chaîne ISO 8601.
+    """
+    row['created_time'] = _created_time_field.to_representation(row['created_time'])
+    return row
+
+
+def stream_ndjson(rows):
+    """
+    Encode les lignes en NDJSON, un objet par ligne.
+
+    Args:
+        rows (iterable): Lignes à encoder.
+
+    Yields:
+        str: Ligne NDJSON.
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+class _Echo:
+    """Pseudo-fichier renvoyant ce qu'on y écrit, pour encoder le CSV ligne à ligne."""
+
+    def write(self, value):
+        return value
+
+
+def escape_csv_cell(value):
+    """
+    Neutralise une cellule qu'un tableur évaluerait comme une formule, en la préfixant de '.
+
+    Args:
+        value (object): Valeur de la cellule.
+
+    Returns:
+        object: La valeur, préfixée si c'est une chaîne commençant par l'un des CSV_FORMULA_PREFIXES.
+    """
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows):
+    """
+    Encode les lignes en CSV, précédées d'une ligne d'en-tête.
+
+    Les cellules commençant par =, +, -, @, une tabulation ou un retour chariot sont préfixées
+    d'une apostrophe, pour qu'un tableur ne les exécute pas comme des formules.
+
+    Args:
+        rows (iterable): Lignes à encoder.
+
+    Yields:
+        str: Ligne CSV.
+    """
+    writer = csv.DictWriter(_Echo(), fieldnames=CSV_COLUMNS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow({column: escape_csv_cell(value) for column, value in row.items()})
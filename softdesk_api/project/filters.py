@@ -0,0 +1,108 @@
+"""
+Filtres de requête des listes.
+
+Chaque ViewSet déclare les champs filtrables (filter_fields), les tris autorisés
+(ordering_fields) et, pour la recherche plein texte, la table d'index (search_index).
+Une valeur inconnue renvoie une erreur 400 plutôt qu'une liste vide.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from .search import full_text_search
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    """
+    Filtre par égalité sur les champs déclarés par le ViewSet : `?status=TODO,INPROGRESS`.
+
+    Plusieurs valeurs séparées par des virgules sont combinées par OU. Les valeurs sont
+    validées contre les choix du champ ; pour une clé étrangère, `none` désigne NULL.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for name in getattr(view, 'filter_fields', ()):
+            raw = request.query_params.get(name)
+            if raw is None:
+                continue
+            field = queryset.model._meta.get_field(name)
+            values = [value for value in raw.split(',') if value]
+            condition = Q()
+            if field.null and 'none' in values:
+                values.remove('none')
+                condition |= Q(**{f'{field.attname}__isnull': True})
+            if values:
+                condition |= Q(**{f'{field.attname}__in': self.clean(field, name, values)})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def clean(self, field, name, values):
+        """
+        Convertit et valide les valeurs d'un filtre.
+
+        Args:
+            field (Field): Champ du modèle filtré.
+            name (str): Nom du paramètre de requête.
+            values (list): Valeurs reçues.
+
+        Returns:
+            list: Valeurs converties.
+
+        Raises:
+            ValidationError: Si une valeur n'est pas valide pour le champ.
+        """
+        target = field.target_field if field.is_relation else field
+        cleaned = []
+        for value in values:
+            try:
+                value = target.to_python(value)
+            except DjangoValidationError:
+                raise ValidationError({name: [f"Valeur invalide : {value}."]})
+            if field.choices and value not in dict(field.choices):
+                raise ValidationError({name: [f"Valeur invalide : {value}."]})
+            cleaned.append(value)
+        return cleaned
+
+
+class SearchFilterBackend(BaseFilterBackend):
+    """
+    Recherche plein texte `?search=`, restreinte au projet de l'URL et triée par pertinence.
+
+    Le ViewSet déclare la relation vers sa table d'index (search_index) et les colonnes
+    interrogées (search_fields) ; voir project/search.py.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        return full_text_search(
+            queryset, text, view.search_index, view.search_fields, 'project_id', view.kwargs['project_id'],
+        )
+
+
+class OrderingBackend(BaseFilterBackend):
+    """
+    Tri `?ordering=priority,-created_time` parmi les tris déclarés par le ViewSet.
+
+    ordering_fields associe chaque nom de tri à un champ ou à une expression (par exemple le
+    rang d'une priorité). L'identifiant départage les égalités. En pagination par curseur,
+    l'ordre du curseur (created_time, id) s'applique.
+    """
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        raw = request.query_params.get(self.ordering_param)
+        if not raw:
+            return queryset
+        ordering_fields = getattr(view, 'ordering_fields', {})
+        ordering = []
+        for term in raw.split(','):
+            name = term.lstrip('-')
+            if name not in ordering_fields:
+                raise ValidationError({self.ordering_param: [f"Tri invalide : {term}."]})
+            expression = ordering_fields[name]
+            expression = F(expression) if isinstance(expression, str) else expression
+            ordering.append(expression.desc() if term.startswith('-') else expression.asc())
+        return queryset.order_by(*ordering, 'id')
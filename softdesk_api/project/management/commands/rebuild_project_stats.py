@@ -0,0 +1,24 @@
+"""
+Commande rebuild_project_stats.
+
+Recalcule les compteurs de ProjectStats à partir des issues, par exemple après un import en
+SQL brut ou une correction de données qui n'a pas émis de signaux.
+
+Usage :
+    python manage.py rebuild_project_stats [--project ID ...]
+"""
+from django.core.management.base import BaseCommand
+from project.stats import rebuild_project_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcule les statistiques des projets (ProjectStats) en une requête groupée."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects',
+                            help="Projet à recalculer (répétable) ; tous les projets par défaut.")
+
+    def handle(self, *args, projects=None, **options):
+        count = rebuild_project_stats(projects)
+        scope = f"{len(projects)} projet(s)" if projects else "tous les projets"
+        self.stdout.write(self.style.SUCCESS(f"{count} compteurs recalculés ({scope})."))
@@ -0,0 +1,55 @@
+"""
+Commande seed_softdesk.
+
+Remplit la base avec des données synthétiques, par lots (project/seeding.py), pour les
+benchmarks (benchmarks/api_suite.py) et les tests de charge.
+
+Avec --projects 0, seuls les utilisateurs sont créés.
+
+Usage :
+    python manage.py seed_softdesk --users 10000 --projects 1000 --contributors 20 --issues 200 --comments 5
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from authentication.models import CustomUser
+from project.seeding import seed_softdesk
+
+
+class Command(BaseCommand):
+    help = "Génère des utilisateurs, projets, contributeurs, issues et commentaires synthétiques."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help="Nombre d'utilisateurs.")
+        parser.add_argument('--projects', type=int, default=10, help="Nombre de projets.")
+        parser.add_argument('--contributors', type=int, default=10, help="Contributeurs par projet, auteur compris.")
+        parser.add_argument('--issues', type=int, default=100, help="Issues par projet.")
+        parser.add_argument('--comments', type=int, default=5, help="Commentaires par issue, en moyenne.")
+        parser.add_argument('--prefix', default='seed', help="Préfixe des noms d'utilisateur.")
+        parser.add_argument('--password', default='softdesk-seed', help="Mot de passe commun des utilisateurs.")
+        parser.add_argument('--batch-size', type=int, default=2000, help="Taille des lots de bulk_create.")
+        parser.add_argument('--seed', type=int, default=0, help="Graine du générateur pseudo-aléatoire.")
+
+    def handle(self, *args, users, projects, prefix, verbosity, **options):
+        minimums = (
+            (users, 1, "Il faut au moins un utilisateur (--users)."),
+            (projects, 0, "Le nombre de projets (--projects) ne peut pas être négatif."),
+            (options['contributors'], 1, "Chaque projet compte au moins un contributeur, son auteur (--contributors)."),
+            (options['issues'], 0, "Le nombre d'issues par projet (--issues) ne peut pas être négatif."),
+            (options['comments'], 0, "Le nombre de commentaires par issue (--comments) ne peut pas être négatif."),
+            (options['batch_size'], 1, "La taille des lots (--batch-size) doit être d'au moins 1."),
+        )
+        for value, minimum, message in minimums:
+            if value < minimum:
+                raise CommandError(message)
+        if CustomUser.objects.filter(username__startswith=f'{prefix}-user').exists():
+            raise CommandError(f"Des utilisateurs '{prefix}-user…' existent déjà : choisissez un autre --prefix.")
+
+        start = time.perf_counter()
+        log = (lambda message: self.stdout.write(f"  {message}")) if verbosity > 1 else None
+        counts = seed_softdesk(
+            users=users, projects=projects, contributors=options['contributors'], issues=options['issues'],
+            comments=options['comments'], prefix=prefix, password=options['password'],
+            batch_size=options['batch_size'], seed=options['seed'], log=log,
+        )
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Créés en {time.perf_counter() - start:.1f} s : {summary}."))
@@ -0,0 +1,49 @@
+"""
+Commande slowest_queries.
+
+Affiche les formes de requêtes SQL les plus coûteuses mesurées par un serveur en cours
+d'exécution (project/metrics.py). Les mesures étant propres à chaque processus, la commande
+les lit sur l'endpoint /api/_metrics/queries du worker interrogé.
+
+Usage :
+    python manage.py slowest_queries [--url URL] [--token JETON] [--limit 10] [--sort total|mean|max|count]
+"""
+import json
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Affiche les formes de requêtes SQL les plus coûteuses d'un serveur (/api/_metrics/queries)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/api/_metrics/queries',
+                            help="Endpoint des formes de requêtes du serveur.")
+        parser.add_argument('--token', default=None,
+                            help="Jeton des mesures ; SOFTDESK_METRICS_TOKEN par défaut.")
+        parser.add_argument('--limit', type=int, default=10, help="Nombre de formes affichées.")
+        parser.add_argument('--sort', choices=['total', 'mean', 'max', 'count'], default='total',
+                            help="Critère de tri : temps cumulé (défaut), moyen, maximal, ou nombre d'exécutions.")
+
+    def handle(self, *args, url, token, limit, sort, **options):
+        token = token or getattr(settings, 'SOFTDESK_METRICS_TOKEN', None)
+        request = Request(f"{url}?{urlencode({'limit': limit, 'sort': sort})}")
+        if token:
+            request.add_header('Authorization', f'Bearer {token}')
+        try:
+            with urlopen(request, timeout=10) as response:
+                queries = json.load(response)['queries']
+        except OSError as exc:
+            raise CommandError(f"Lecture de {url} impossible : {exc}")
+
+        if not queries:
+            self.stdout.write("Aucune requête SQL mesurée.")
+            return
+        self.stdout.write(f"{'total (ms)':>11} {'moyenne':>9} {'max':>9} {'nombre':>8}  requête")
+        for query in queries:
+            self.stdout.write(
+                f"{query['total'] * 1000:>11.2f} {query['mean'] * 1000:>9.3f} {query['max'] * 1000:>9.3f} "
+                f"{query['count']:>8}  {query['sql']}"
+            )
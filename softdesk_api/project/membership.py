@@ -0,0 +1,159 @@
+"""
+Index des appartenances aux projets, partagé par tous les threads du processus.
+
+Pour chaque utilisateur, l'index mémorise l'ensemble des projets dont il est contributeur
+et l'ensemble des projets dont il est l'auteur. Il s'appuie sur le framework de cache de
+Django (alias `SOFTDESK_MEMBERSHIP_CACHE`, un cache fichier partagé par les workers d'une même
+machine) et est invalidé par les signaux de Contributor et Project (voir project/signals.py).
+Les écritures sans signaux (QuerySet.update(), bulk_create, SQL brut) doivent appeler
+invalidate() ; à défaut, leurs entrées expirent après le TIMEOUT du cache. Les entrées sont toujours lues sur la base principale, même
+pendant une lecture routée vers la réplique (project/routing.py) : une entrée lue sur une
+réplique en retard pourrait être antérieure à une invalidation déjà faite, et resterait en cache.
+"""
+import threading
+from collections import namedtuple
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Value
+from .models import Project, Contributor
+from .routing import replica_reads
+
+UserProjects = namedtuple('UserProjects', ['contributed', 'authored'])
+
+
+class MembershipIndex:
+    """
+    Cache des projets de chaque utilisateur, avec compteurs de succès et d'échecs.
+
+    Attributes:
+        cache_alias (str): Alias du cache Django utilisé.
+        key_prefix (str): Préfixe des clés de cache.
+        hits (int): Nombre de lectures servies par le cache.
+        misses (int): Nombre de lectures ayant nécessité une requête SQL.
+    """
+    key_prefix = 'softdesk:membership:user'
+
+    def __init__(self, cache_alias=None):
+        self.cache_alias = cache_alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """Cache Django utilisé par l'index."""
+        return caches[self.cache_alias or getattr(settings, 'SOFTDESK_MEMBERSHIP_CACHE', 'default')]
+
+    def make_key(self, user_id):
+        return f'{self.key_prefix}:{user_id}'
+
+    def get(self, user_id):
+        """
+        Renvoie les projets de l'utilisateur, en une requête SQL au plus, sur la base principale.
+
+        Args:
+            user_id (int): Identifiant de l'utilisateur.
+
+        Returns:
+            UserProjects: Identifiants des projets contribués et des projets créés.
+        """
+        key = self.make_key(user_id)
+        projects = self.cache.get(key)
+        if projects is not None:
+            self._count(hit=True)
+            return projects
+
+        self._count(hit=False)
+        with replica_reads(False):
+            projects = self.build(self.query(user_id))
+        self.cache.set(key, projects)
+        return projects
+
+    async def aget(self, user_id):
+        """
+        Version asynchrone de get(), pour les vues async (cache et ORM asynchrones).
+
+        Args:
+            user_id (int): Identifiant de l'utilisateur.
+
+        Returns:
+            UserProjects: Identifiants des projets contribués et des projets créés.
+        """
+        key = self.make_key(user_id)
+        projects = await self.cache.aget(key)
+        if projects is not None:
+            self._count(hit=True)
+            return projects
+
+        self._count(hit=False)
+        with replica_reads(False):
+            projects = self.build([row async for row in self.query(user_id)])
+        await self.cache.aset(key, projects)
+        return projects
+
+    def query(self, user_id):
+        """
+        Construit la requête des projets de l'utilisateur (contributions et projets créés).
+
+        Args:
+            user_id (int): Identifiant de l'utilisateur.
+
+        Returns:
+            QuerySet: Couples (project_id, is_author), réunis par UNION ALL.
+        """
+        return Contributor.objects.filter(user_id=user_id).annotate(
+            is_author=Value(False)
+        ).values_list('project_id', 'is_author').union(
+            Project.objects.filter(author_id=user_id).annotate(is_author=Value(True)).values_list('id', 'is_author'),
+            all=True,
+        )
+
+    def build(self, rows):
+        """
+        Range les lignes de query() en projets contribués et projets créés.
+
+        Args:
+            rows (Iterable[tuple]): Couples (project_id, is_author).
+
+        Returns:
+            UserProjects: Identifiants des projets contribués et des projets créés.
+        """
+        contributed, authored = set(), set()
+        for project_id, is_author in rows:
+            (authored if is_author else contributed).add(project_id)
+        return UserProjects(frozenset(contributed), frozenset(authored))
+
+    def invalidate(self, *user_ids):
+        """
+        Supprime les entrées des utilisateurs donnés.
+
+        Args:
+            *user_ids (int): Identifiants des utilisateurs dont l'appartenance a changé.
+        """
+        keys = [self.make_key(user_id) for user_id in user_ids if user_id is not None]
+        if keys:
+            self.cache.delete_many(keys)
+
+    def stats(self):
+        """
+        Renvoie les compteurs de l'index pour le processus courant.
+
+        Returns:
+            dict: Succès, échecs et taux de succès.
+        """
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / total if total else 0.0}
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+membership_index = MembershipIndex()
@@ -0,0 +1,343 @@
+"""
+Mesures des requêtes HTTP : nombre et durée des requêtes SQL, temps de sérialisation, temps de
+vérification des permissions et latence totale, agrégés par route (`issue-list`,
+`comment-detail`...) dans des histogrammes en mémoire.
+
+MetricsMiddleware (project/middleware.py) ouvre un RequestMetrics par requête HTTP, porté par
+une ContextVar : il suit la requête dans les threads de sync_to_async comme dans les vues
+async. Les requêtes SQL sont mesurées par un execute_wrapper installé sur chaque connexion à
+son ouverture (les connexions sont propres à chaque thread) ; les permissions et la
+sérialisation, par des timer() dans les ViewSets et les sérialiseurs de l'API
+(TimedPermissionsMixin, TimedSerializerMixin) et dans les vues async de project/. Les vues et
+sérialiseurs d'autres applications ne sont pas mesurés. Hors d'une requête HTTP (commandes,
+tests sans middleware), ces mesures ne coûtent qu'une lecture de ContextVar.
+
+Les mesures sont propres à chaque processus : chaque worker expose les siennes.
+/api/_metrics les rend au format texte de Prometheus, /api/_metrics/queries renvoie en JSON
+les formes de requêtes SQL les plus lentes (commande slowest_queries). Les deux endpoints
+exigent le jeton SOFTDESK_METRICS_TOKEN ; sans jeton configuré, ils ne répondent qu'en DEBUG.
+"""
+import hmac
+import re
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.serializers import ListSerializer
+
+SECTIONS = ('db', 'serializer', 'permission')
+
+# Bornes des histogrammes : secondes (valeurs par défaut des clients Prometheus) et requêtes SQL
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = {
+    'softdesk_request_duration_seconds': ("Latence totale des requêtes HTTP.", DURATION_BUCKETS),
+    'softdesk_request_db_queries': ("Requêtes SQL par requête HTTP.", QUERY_COUNT_BUCKETS),
+    'softdesk_request_db_duration_seconds': ("Temps passé en base par requête HTTP.", DURATION_BUCKETS),
+    'softdesk_request_serializer_duration_seconds': ("Temps de sérialisation par requête HTTP.", DURATION_BUCKETS),
+    'softdesk_request_permission_duration_seconds': (
+        "Temps de vérification des permissions par requête HTTP.", DURATION_BUCKETS,
+    ),
+}
+
+# Listes de paramètres (IN, VALUES de bulk_create) réduites à leur premier élément
+PARAMETER_LIST = re.compile(r'%s(?:, %s)+')
+VALUES_LIST = re.compile(r'(\([^()]*\))(?:, \1)+')
+
+current_metrics = ContextVar('softdesk_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Mesures d'une requête HTTP en cours.
+
+    Attributes:
+        queries (int): Nombre de requêtes SQL.
+        durations (dict): Temps cumulé par section (db, serializer, permission), en secondes.
+        active (set): Sections en cours de mesure, pour ne pas compter deux fois un appel imbriqué.
+    """
+    __slots__ = ('queries', 'durations', 'active')
+
+    def __init__(self):
+        self.queries = 0
+        self.durations = dict.fromkeys(SECTIONS, 0.0)
+        self.active = set()
+
+
+@contextmanager
+def timer(section):
+    """
+    Ajoute la durée du bloc à une section de la requête HTTP en cours.
+
+    Sans requête en cours, ou si la section est déjà mesurée par un bloc englobant, le bloc
+    s'exécute sans mesure.
+
+    Args:
+        section (str): Section mesurée : 'serializer' ou 'permission'.
+    """
+    record = current_metrics.get()
+    if record is None or section in record.active:
+        yield
+        return
+    record.active.add(section)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record.durations[section] += perf_counter() - start
+        record.active.discard(section)
+
+
+class TimedPermissionsMixin:
+    """Mixin de vue DRF : mesure la vérification des permissions (section 'permission')."""
+
+    def check_permissions(self, request):
+        with timer('permission'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timer('permission'):
+            super().check_object_permissions(request, obj)
+
+
+class TimedSerializerMixin:
+    """Mixin de sérialiseur DRF : mesure la construction de `data` (section 'serializer')."""
+
+    @property
+    def data(self):
+        with timer('serializer'):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, ListSerializer):
+    """ListSerializer mesuré, à déclarer dans Meta.list_serializer_class des sérialiseurs mesurés."""
+
+
+def query_shape(sql):
+    """
+    Réduit une requête SQL à sa forme : listes de paramètres et de lignes ramenées à un élément.
+
+    Args:
+        sql (str): Requête SQL avec ses marqueurs de paramètres (%s).
+
+    Returns:
+        str: Forme de la requête.
+    """
+    return VALUES_LIST.sub(r'\1, ...', PARAMETER_LIST.sub('%s, ...', sql))
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper : mesure la requête SQL si une requête HTTP est en cours."""
+    record = current_metrics.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = perf_counter() - start
+        record.queries += 1
+        record.durations['db'] += duration
+        registry.observe_query(sql, duration)
+
+
+class Histogram:
+    """
+    Histogramme cumulatif au sens de Prometheus.
+
+    Attributes:
+        buckets (tuple): Bornes supérieures des intervalles.
+        counts (list): Nombre d'observations par intervalle, le dernier pour +Inf.
+        sum (float): Somme des observations.
+    """
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Renvoie les couples (borne, nombre cumulé d'observations), +Inf compris."""
+        total = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+    """
+    Agrégats des mesures du processus : histogrammes par route et formes de requêtes SQL.
+
+    Attributes:
+        max_query_shapes (int): Nombre maximal de formes de requêtes conservées ; les formes
+            nouvelles au-delà sont ignorées.
+    """
+
+    def __init__(self, max_query_shapes=1000):
+        self.max_query_shapes = max_query_shapes
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.requests = {}
+            self.query_shapes = {}
+
+    def observe_request(self, route, method, status, duration, record):
+        """
+        Enregistre les mesures d'une requête HTTP terminée.
+
+        Args:
+            route (str): Nom de la route (view_name), ou 'unmatched'.
+            method (str): Méthode HTTP.
+            status (int): Code de statut de la réponse.
+            duration (float): Latence totale, en secondes.
+            record (RequestMetrics): Mesures de la requête.
+        """
+        values = {
+            'softdesk_request_duration_seconds': duration,
+            'softdesk_request_db_queries': record.queries,
+            'softdesk_request_db_duration_seconds': record.durations['db'],
+            'softdesk_request_serializer_duration_seconds': record.durations['serializer'],
+            'softdesk_request_permission_duration_seconds': record.durations['permission'],
+        }
+        labels = (route, method)
+        with self.lock:
+            for name, value in values.items():
+                histogram = self.histograms.get((name, labels))
+                if histogram is None:
+                    histogram = self.histograms[(name, labels)] = Histogram(HISTOGRAMS[name][1])
+                histogram.observe(value)
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def observe_query(self, sql, duration):
+        """Ajoute l'exécution d'une requête SQL aux statistiques de sa forme."""
+        shape = query_shape(sql)
+        with self.lock:
+            stats = self.query_shapes.get(shape)
+            if stats is None:
+                if len(self.query_shapes) >= self.max_query_shapes:
+                    return
+                stats = self.query_shapes[shape] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+
+    def slowest_queries(self, limit=10, sort='total'):
+        """
+        Renvoie les formes de requêtes SQL les plus coûteuses.
+
+        Args:
+            limit (int): Nombre de formes renvoyées.
+            sort (str): Critère : 'total', 'mean', 'max' (secondes) ou 'count'.
+
+        Returns:
+            list: Dictionnaires sql, count, total, mean et max, du plus coûteux au moins coûteux.
+        """
+        with self.lock:
+            shapes = [
+                {'sql': sql, 'count': count, 'total': total, 'mean': total / count, 'max': maximum}
+                for sql, (count, total, maximum) in self.query_shapes.items()
+            ]
+        return sorted(shapes, key=lambda shape: shape[sort], reverse=True)[:limit]
+
+    def render_prometheus(self):
+        """
+        Rend les mesures au format texte de Prometheus (version 0.0.4).
+
+        Returns:
+            str: Exposition des histogrammes et du compteur de requêtes.
+        """
+        with self.lock:
+            histograms = {key: (list(h.cumulative()), h.sum) for key, h in self.histograms.items()}
+            requests = dict(self.requests)
+        lines = [
+            '# HELP softdesk_requests_total Requêtes HTTP traitées.',
+            '# TYPE softdesk_requests_total counter',
+        ]
+        for (route, method, status), count in sorted(requests.items()):
+            lines.append(f'softdesk_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+        for name, (help_text, _) in HISTOGRAMS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (metric, (route, method)), (buckets, total) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                labels = f'route="{route}",method="{method}"'
+                lines += [f'{name}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in buckets]
+                lines += [f'{name}_sum{{{labels}}} {total}', f'{name}_count{{{labels}}} {buckets[-1][1]}']
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry(getattr(settings, 'SOFTDESK_METRICS_MAX_QUERY_SHAPES', 1000))
+
+
+def install_execute_wrapper(sender, connection, **kwargs):
+    """Récepteur de connection_created : mesure les requêtes SQL de la connexion."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install():
+    """
+    Active la mesure des requêtes SQL : execute_wrapper des connexions ouvertes et à venir.
+
+    Appelée au démarrage (ProjectConfig.ready) si MetricsMiddleware est installé.
+    """
+    from django.db import connections
+
+    connection_created.connect(install_execute_wrapper, dispatch_uid='softdesk_metrics')
+    for connection in connections.all(initialized_only=True):
+        install_execute_wrapper(None, connection)
+
+
+class MetricsView(View):
+    """
+    Expose les mesures du processus, au format Prometheus (/api/_metrics).
+
+    Accès : en-tête `Authorization: Bearer <SOFTDESK_METRICS_TOKEN>`, ou libre en DEBUG si
+    aucun jeton n'est configuré.
+    """
+    http_method_names = ['get', 'head']
+
+    def get(self, request):
+        if not self.is_authorized(request):
+            detail = exceptions.PermissionDenied.default_detail
+            return JsonResponse({'detail': detail}, status=exceptions.PermissionDenied.status_code)
+        return self.respond(request)
+
+    def is_authorized(self, request):
+        token = getattr(settings, 'SOFTDESK_METRICS_TOKEN', None)
+        if not token:
+            return settings.DEBUG
+        return hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+
+    def respond(self, request):
+        return HttpResponse(registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class QueryShapesView(MetricsView):
+    """Formes de requêtes SQL les plus coûteuses, en JSON : `?limit=10&sort=total|mean|max|count`."""
+
+    def respond(self, request):
+        sort = request.GET.get('sort', 'total')
+        if sort not in ('total', 'mean', 'max', 'count'):
+            sort = 'total'
+        try:
+            limit = max(int(request.GET.get('limit', 10)), 1)
+        except ValueError:
+            limit = 10
+        return JsonResponse({'sort': sort, 'queries': registry.slowest_queries(limit, sort)})
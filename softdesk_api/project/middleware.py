@@ -0,0 +1,53 @@
+"""
+Middlewares de l'API SoftDesk.
+"""
+from time import perf_counter
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from .metrics import RequestMetrics, current_metrics, registry
+
+
+class MetricsMiddleware:
+    """
+    Mesure chaque requête HTTP et l'enregistre sous le nom de sa route (voir project/metrics.py).
+
+    À placer en tête de MIDDLEWARE pour que la latence couvre les autres middlewares. Compatible
+    WSGI et ASGI : sous ASGI, les vues async sont mesurées sans passage par un thread. Le corps
+    d'une réponse en flux (exports) est produit après la mesure et n'est pas compté.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        record, token, start = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        self.finish(request, response, record, start)
+        return response
+
+    async def __acall__(self, request):
+        record, token, start = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        self.finish(request, response, record, start)
+        return response
+
+    def start(self):
+        record = RequestMetrics()
+        return record, current_metrics.set(record), perf_counter()
+
+    def finish(self, request, response, record, start):
+        match = request.resolver_match
+        route = match.view_name if match else 'unmatched'
+        registry.observe_request(route, request.method, response.status_code, perf_counter() - start, record)
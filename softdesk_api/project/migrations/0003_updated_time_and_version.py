@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:05
+
+from django.db import migrations, models
+
+
+def copy_created_time(apps, schema_editor):
+    """Initialise updated_time des lignes existantes à leur date de création."""
+    for model_name in ("Project", "Issue", "Comment"):
+        model = apps.get_model("project", model_name)
+        model.objects.update(updated_time=models.F("created_time"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0002_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="updated_time",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="updated_time",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="updated_time",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="version",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(copy_created_time, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:45
+
+import django.db.models.deletion
+import project.search
+from django.db import migrations, models
+
+# Triggers de l'index. Sous SQLite, une migration qui reconstruit project_issue (AddField,
+# AlterField...) les supprime avec l'ancienne table : elle doit les recréer (voir 0005).
+TRIGGER_SQL = [
+    """
+    CREATE TRIGGER project_issue_fts_insert AFTER INSERT ON project_issue BEGIN
+        INSERT INTO project_issue_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END
+    """,
+    """
+    CREATE TRIGGER project_issue_fts_delete AFTER DELETE ON project_issue BEGIN
+        INSERT INTO project_issue_fts(project_issue_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+    END
+    """,
+    """
+    CREATE TRIGGER project_issue_fts_update AFTER UPDATE OF title, description, project_id ON project_issue BEGIN
+        INSERT INTO project_issue_fts(project_issue_fts, rowid, title, description, project_id)
+        VALUES ('delete', old.id, old.title, old.description, old.project_id);
+        INSERT INTO project_issue_fts(rowid, title, description, project_id)
+        VALUES (new.id, new.title, new.description, new.project_id);
+    END
+    """,
+]
+
+# Table FTS5 à contenu externe : les textes restent dans project_issue, l'index est tenu à jour
+# par les triggers. project_id est indexé pour restreindre la recherche au projet dans l'index ;
+# les index de préfixes (2 à 4 caractères) servent la recherche pendant la saisie.
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE project_issue_fts USING fts5(
+        title, description, project_id,
+        content='project_issue', content_rowid='id', tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3 4'
+    )
+    """,
+    # Pertinence : le titre pèse dix fois la description, project_id ne compte pas
+    "INSERT INTO project_issue_fts(project_issue_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 0.0)')",
+    *TRIGGER_SQL,
+    "INSERT INTO project_issue_fts(project_issue_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS project_issue_fts_insert",
+    "DROP TRIGGER IF EXISTS project_issue_fts_delete",
+    "DROP TRIGGER IF EXISTS project_issue_fts_update",
+    "DROP TABLE IF EXISTS project_issue_fts",
+]
+
+
+def fts5_supported(schema_editor):
+    """Indique si la base est SQLite compilée avec FTS5."""
+    if schema_editor.connection.vendor != "sqlite":
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_fts_index(apps, schema_editor):
+    """Crée l'index plein texte et ses triggers ; sans FTS5, la recherche utilise icontains."""
+    if fts5_supported(schema_editor):
+        for sql in FTS_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0003_updated_time_and_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueSearchIndex",
+            fields=[
+                (
+                    "issue",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="project.issue",
+                    ),
+                ),
+                (
+                    "document",
+                    project.search.FullTextField(db_column="project_issue_fts"),
+                ),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "project_issue_fts",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
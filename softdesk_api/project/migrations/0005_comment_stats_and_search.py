@@ -0,0 +1,151 @@
+# Generated by Django 5.2.6 on 2026-10-17 02:56
+
+from importlib import import_module
+
+import django.db.models.deletion
+import project.search
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+issue_search = import_module("project.migrations.0004_issue_search")
+
+# Les commentaires n'ont pas de colonne project_id : la vue la lit dans leur issue et sert de
+# contenu externe à l'index. Les triggers des commentaires lisent le projet dans project_issue ;
+# celui des issues réindexe leurs commentaires quand elles changent de projet.
+FTS_SQL = [
+    """
+    CREATE VIEW project_comment_fts_content AS
+    SELECT c.id, c.description, i.project_id
+    FROM project_comment c JOIN project_issue i ON i.id = c.issue_id
+    """,
+    """
+    CREATE VIRTUAL TABLE project_comment_fts USING fts5(
+        description, project_id,
+        content='project_comment_fts_content', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """,
+    "INSERT INTO project_comment_fts(project_comment_fts, rank) VALUES ('rank', 'bm25(1.0, 0.0)')",
+    """
+    CREATE TRIGGER project_comment_fts_insert AFTER INSERT ON project_comment BEGIN
+        INSERT INTO project_comment_fts(rowid, description, project_id)
+        VALUES (new.id, new.description, (SELECT project_id FROM project_issue WHERE id = new.issue_id));
+    END
+    """,
+    """
+    CREATE TRIGGER project_comment_fts_delete AFTER DELETE ON project_comment BEGIN
+        INSERT INTO project_comment_fts(project_comment_fts, rowid, description, project_id)
+        VALUES ('delete', old.id, old.description, (SELECT project_id FROM project_issue WHERE id = old.issue_id));
+    END
+    """,
+    """
+    CREATE TRIGGER project_comment_fts_update AFTER UPDATE OF description, issue_id ON project_comment BEGIN
+        INSERT INTO project_comment_fts(project_comment_fts, rowid, description, project_id)
+        VALUES ('delete', old.id, old.description, (SELECT project_id FROM project_issue WHERE id = old.issue_id));
+        INSERT INTO project_comment_fts(rowid, description, project_id)
+        VALUES (new.id, new.description, (SELECT project_id FROM project_issue WHERE id = new.issue_id));
+    END
+    """,
+    """
+    CREATE TRIGGER project_comment_fts_issue_project AFTER UPDATE OF project_id ON project_issue
+    WHEN old.project_id IS NOT new.project_id BEGIN
+        INSERT INTO project_comment_fts(project_comment_fts, rowid, description, project_id)
+        SELECT 'delete', id, description, old.project_id FROM project_comment WHERE issue_id = new.id;
+        INSERT INTO project_comment_fts(rowid, description, project_id)
+        SELECT id, description, new.project_id FROM project_comment WHERE issue_id = new.id;
+    END
+    """,
+    "INSERT INTO project_comment_fts(project_comment_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS project_comment_fts_insert",
+    "DROP TRIGGER IF EXISTS project_comment_fts_delete",
+    "DROP TRIGGER IF EXISTS project_comment_fts_update",
+    "DROP TRIGGER IF EXISTS project_comment_fts_issue_project",
+    "DROP TABLE IF EXISTS project_comment_fts",
+    "DROP VIEW IF EXISTS project_comment_fts_content",
+]
+
+
+def create_fts_index(apps, schema_editor):
+    """Crée l'index plein texte des commentaires ; sans FTS5, la recherche utilise icontains."""
+    if issue_search.fts5_supported(schema_editor):
+        for sql in FTS_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+def recreate_issue_triggers(apps, schema_editor):
+    """Recrée les triggers de project_issue_fts, supprimés quand SQLite reconstruit project_issue."""
+    if issue_search.fts5_supported(schema_editor):
+        drop_triggers = [sql for sql in issue_search.DROP_SQL if sql.startswith("DROP TRIGGER")]
+        for sql in drop_triggers + issue_search.TRIGGER_SQL:
+            schema_editor.execute(sql)
+
+
+def fill_comment_stats(apps, schema_editor):
+    """Calcule les compteurs de commentaires des issues existantes en une requête."""
+    Issue = apps.get_model("project", "Issue")
+    Comment = apps.get_model("project", "Comment")
+    comments = Comment.objects.filter(issue=OuterRef("pk")).order_by().values("issue")
+    Issue.objects.using(schema_editor.connection.alias).update(
+        comment_count=Coalesce(Subquery(comments.annotate(count=Count("pk")).values("count")), 0),
+        last_comment_time=Subquery(comments.annotate(last=Max("created_time")).values("last")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0004_issue_search"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, recreate_issue_triggers),
+        migrations.CreateModel(
+            name="CommentSearchIndex",
+            fields=[
+                (
+                    "comment",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="project.comment",
+                    ),
+                ),
+                (
+                    "document",
+                    project.search.FullTextField(db_column="project_comment_fts"),
+                ),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "project_comment_fts",
+                "managed": False,
+            },
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="last_comment_time",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(recreate_issue_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_comment_stats, migrations.RunPython.noop),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Calcul initial des compteurs : même requête groupée que project.stats.rebuild_project_stats
+FILL_SQL = """
+    INSERT INTO project_projectstats (project_id, dimension, key, count)
+    SELECT project_id, 'status', status, COUNT(*) FROM project_issue GROUP BY project_id, status
+    UNION ALL
+    SELECT project_id, 'priority', priority, COUNT(*) FROM project_issue GROUP BY project_id, priority
+    UNION ALL
+    SELECT project_id, 'tag', tag, COUNT(*) FROM project_issue GROUP BY project_id, tag
+    UNION ALL
+    SELECT project_id, 'assignee', COALESCE(CAST(assignee_id AS varchar(20)), ''), COUNT(*)
+    FROM project_issue WHERE status <> 'FINISHED' GROUP BY project_id, assignee_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0005_comment_stats_and_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("status", "Status"),
+                            ("priority", "Priority"),
+                            ("tag", "Tag"),
+                            ("assignee", "Open issues per assignee"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("key", models.CharField(blank=True, max_length=20)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="project.project",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "dimension", "key"),
+                        name="unique_project_stat",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(FILL_SQL, migrations.RunSQL.noop),
+    ]
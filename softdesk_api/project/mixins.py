@@ -0,0 +1,366 @@
+import hashlib
+from calendar import timegm
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from .routing import current_routing, replica_reads, routing_scope
+from .versioning import bump_project_version, get_project_state
+
+
+class QueryPlanMixin:
+    """
+    Applique automatiquement au queryset les relations parcourues par le sérialiseur.
+
+    Chaque ViewSet déclare les relations que son sérialiseur traverse (auteur, assigné,
+    utilisateur...) ; elles sont chargées en une seule requête (select_related) ou en une
+    requête par relation (prefetch_related) au lieu d'une requête par ligne.
+
+    Attributes:
+        select_related_fields (tuple): Relations ForeignKey chargées par jointure.
+        prefetch_related_fields (tuple): Relations multiples chargées par préchargement.
+        query_plan_actions (tuple): Actions pour lesquelles le plan de requête est appliqué.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    query_plan_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        """
+        Filtre le queryset puis applique le plan de requête pour les actions concernées.
+
+        Args:
+            queryset (QuerySet): Queryset renvoyé par get_queryset().
+
+        Returns:
+            QuerySet: Queryset filtré, avec ses relations chargées.
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.query_plan_actions:
+            queryset = self.apply_query_plan(queryset)
+        return queryset
+
+    def apply_query_plan(self, queryset):
+        """
+        Ajoute les select_related et prefetch_related déclarés par le ViewSet.
+
+        Args:
+            queryset (QuerySet): Queryset à optimiser.
+
+        Returns:
+            QuerySet: Queryset avec les relations déclarées.
+        """
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return queryset
+
+
+class ReadSerializerMixin:
+    """
+    Sert la liste avec un sérialiseur en lecture seule (ReadSerializer), sur des lignes values().
+
+    Le queryset est filtré, ordonné et paginé comme d'habitude ; seules les colonnes de la
+    représentation sont lues, et aucun objet du modèle ni champ DRF n'est instancié par ligne.
+    Les autres actions utilisent serializer_class.
+
+    Attributes:
+        read_serializer_class (type): Sérialiseur de la liste.
+    """
+    read_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.read_serializer_class.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.read_serializer_class(page, many=True).data)
+        return Response(self.read_serializer_class(queryset, many=True).data)
+
+
+class ScopedWriteMixin:
+    """
+    Rattache les écritures d'un ViewSet à l'objet de l'URL (projet, issue).
+
+    Pour toute requête d'écriture, `context['scope']` associe au champ `scope_field` du
+    sérialiseur (ScopedPrimaryKeyRelatedField) le chargement de l'objet de l'URL : le champ
+    n'accepte que sa clé primaire, en création comme en modification, unitaire ou par lots.
+    Un objet ne peut donc ni être créé ailleurs que sous l'URL, ni en être déplacé. L'objet
+    est chargé une seule fois par requête, et seulement si le champ figure dans les données.
+
+    Attributes:
+        scope_field (str): Champ du sérialiseur désignant l'objet de l'URL (projet, issue).
+    """
+    scope_field = None
+
+    def get_scope(self):
+        """
+        Charge l'objet de l'URL auquel les objets écrits doivent se rattacher.
+
+        Returns:
+            Model: Objet de l'URL.
+        """
+        raise NotImplementedError('`get_scope()` doit être implémentée.')
+
+    def get_scope_once(self):
+        """Renvoie l'objet de l'URL, chargé au premier appel de la requête."""
+        if not hasattr(self, '_scope'):
+            self._scope = self.get_scope()
+        return self._scope
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request is not None and self.request.method not in SAFE_METHODS:
+            context['scope'] = {self.scope_field: self.get_scope_once}
+        return context
+
+
+class BulkMixin:
+    """
+    Ajoute à un ViewSet un endpoint `bulk/` de création (POST) et de modification (PATCH) par lots.
+
+    La requête est authentifiée et les permissions sont vérifiées une seule fois pour tout le
+    lot ; la validation passe par le ListSerializer du sérialiseur (BulkListSerializer), et
+    l'écriture a lieu dans une seule transaction. Si un élément est invalide, rien n'est
+    écrit et la réponse 400 contient une entrée d'erreurs par élément, dans l'ordre du lot.
+    À combiner avec QueryPlanMixin et ScopedWriteMixin, qui rattache chaque élément à l'objet
+    de l'URL comme pour les écritures unitaires.
+    """
+
+    def get_bulk_lookup_field(self):
+        """Renvoie le champ identifiant chaque élément du lot en modification."""
+        return 'id' if self.lookup_field == 'pk' else self.lookup_field
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        context = self.get_serializer_context()
+        context['bulk_lookup_field'] = self.get_bulk_lookup_field()
+        max_length = getattr(settings, 'SOFTDESK_BULK_MAX_ITEMS', 1000)
+        return self.get_serializer_class()(*args, many=True, max_length=max_length, context=context, **kwargs)
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """Crée (POST) ou modifie (PATCH) une liste d'objets."""
+        if request.method == 'POST':
+            serializer = self.get_bulk_serializer(data=request.data)
+            response_status = status.HTTP_201_CREATED
+        else:
+            instances = self.get_bulk_instances(request.data)
+            serializer = self.get_bulk_serializer(instances, data=request.data, partial=True)
+            response_status = status.HTTP_200_OK
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            self.perform_bulk_save(serializer)
+        return Response(serializer.data, status=response_status)
+
+    def get_bulk_instances(self, data):
+        """
+        Charge en une requête les objets désignés par les éléments du lot.
+
+        Args:
+            data (list): Éléments du lot.
+
+        Returns:
+            dict: Objets indexés par identifiant (en chaîne).
+        """
+        lookup_field = self.get_bulk_lookup_field()
+        queryset = self.get_queryset()
+        model_field = queryset.model._meta.get_field(lookup_field)
+        values = []
+        for item in data if isinstance(data, list) else []:
+            try:
+                values.append(model_field.to_python(item.get(lookup_field)))
+            except (AttributeError, DjangoValidationError):
+                continue  # Élément invalide : l'erreur est rapportée à la validation
+        queryset = self.apply_query_plan(queryset.filter(**{f'{lookup_field}__in': values}))
+        return {str(getattr(obj, lookup_field)): obj for obj in queryset}
+
+    def perform_bulk_save(self, serializer):
+        """
+        Enregistre le lot ; les objets créés ont l'utilisateur connecté pour auteur.
+
+        bulk_create et bulk_update n'émettent pas de signaux : la version du projet est
+        incrémentée une fois pour tout le lot.
+        """
+        if serializer.instance is None:
+            serializer.save(author=self.request.user)
+        else:
+            serializer.save()
+        bump_project_version(self.kwargs['project_id'])
+
+
+class ReadReplicaMixin:
+    """
+    Sert les actions de lecture d'un ViewSet depuis la base en lecture seule (project/routing.py).
+
+    Les actions `replica_actions` en GET (ou HEAD) lisent la réplique : version du projet,
+    comptage, page et sérialisation. Les vérifications de permissions lisent la réplique pour
+    toute requête GET, HEAD ou OPTIONS, et la base principale pour une écriture : un
+    contributeur retiré ne peut pas écrire pendant le retard de la réplique. Après une écriture,
+    les lectures suivantes de la requête restent sur la base principale (ReadReplicaRouter).
+    À placer avant les autres mixins, pour englober tout le traitement de la requête.
+
+    Attributes:
+        replica_actions (tuple): Actions servies depuis la réplique.
+    """
+    replica_actions = ('list', 'retrieve')
+
+    def dispatch(self, request, *args, **kwargs):
+        with routing_scope():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        current_routing.get().replica = request.method in SAFE_METHODS and self.action in self.replica_actions
+
+    def check_permissions(self, request):
+        with replica_reads(request.method in SAFE_METHODS):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with replica_reads(request.method in SAFE_METHODS):
+            super().check_object_permissions(request, obj)
+
+
+class ConditionalGetMixin:
+    """
+    Gère les GET conditionnels (If-None-Match, If-Modified-Since) à partir de la version du projet.
+
+    L'ETag combine l'URL complète et Project.version ; Last-Modified vaut Project.updated_time.
+    Ils sont lus par une requête sur la clé primaire du projet, après la vérification des
+    permissions : si le client possède déjà la représentation, la réponse 304 est renvoyée sans
+    lire ni sérialiser aucune ligne.
+
+    Attributes:
+        conditional_actions (tuple): Actions pour lesquelles les GET conditionnels sont gérés.
+    """
+    conditional_actions = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_etag(self, request, version):
+        """
+        Calcule l'ETag de la représentation demandée pour une version du projet.
+
+        Args:
+            request (Request): Requête en cours.
+            version (int): Version du projet.
+
+        Returns:
+            str: ETag entre guillemets.
+        """
+        key = f'{request.accepted_renderer.format}:{request.get_full_path()}:{version}'
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """
+        Renvoie 304 si la représentation du client est à jour, sinon la réponse du handler.
+
+        Args:
+            handler (callable): Action à exécuter si la représentation a changé.
+            request (Request): Requête en cours.
+
+        Returns:
+            HttpResponse: Réponse 304 ou réponse du handler, avec ETag et Last-Modified.
+        """
+        if self.action not in self.conditional_actions or request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+        state = get_project_state(self.kwargs.get(getattr(self, 'project_lookup_url_kwarg', 'project_id')))
+        if state is None:
+            return handler(request, *args, **kwargs)
+
+        version, updated_time = state
+        self.project_version = version
+        etag = self.get_etag(request, version)
+        last_modified = timegm(updated_time.utctimetuple())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Met en cache le corps rendu des listes, par projet et par version du projet.
+
+    La clé combine l'endpoint, le projet, sa version, le type de média négocié, la version de
+    l'API et l'URL complète (page, curseur, filtres, format). Les en-têtes de la réponse (ETag,
+    Vary, Allow, pagination...) sont mis en cache avec le corps et restitués tels quels. Chaque écriture incrémente la version du projet depuis les signaux des issues,
+    commentaires et contributeurs : les entrées antérieures ne sont plus jamais lues et expirent
+    d'elles-mêmes. Le cache n'intervient qu'après l'authentification et les permissions.
+    À placer après ConditionalGetMixin, qui lit la version du projet.
+
+    Attributes:
+        cached_actions (tuple): Actions dont la réponse est mise en cache.
+    """
+    cached_actions = ('list',)
+    project_version = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def get_response_cache(self):
+        """Renvoie le cache des réponses, ou None s'il est désactivé (SOFTDESK_RESPONSE_CACHE)."""
+        alias = getattr(settings, 'SOFTDESK_RESPONSE_CACHE', None)
+        return caches[alias] if alias else None
+
+    def get_response_cache_key(self, request):
+        """
+        Calcule la clé de cache de la réponse demandée.
+
+        Args:
+            request (Request): Requête en cours.
+
+        Returns:
+            str: Clé de cache.
+        """
+        representation = ':'.join((
+            request.accepted_renderer.format, request.accepted_media_type, str(request.version),
+            request.build_absolute_uri(),
+        ))
+        digest = hashlib.md5(representation.encode(), usedforsecurity=False).hexdigest()
+        project_id = self.kwargs.get(getattr(self, 'project_lookup_url_kwarg', 'project_id'))
+        return f'softdesk:response:{self.basename}:{self.action}:{project_id}:{self.project_version}:{digest}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """
+        Renvoie la réponse en cache, ou exécute le handler et met en cache son rendu et ses en-têtes.
+
+        Args:
+            handler (callable): Action à exécuter en l'absence d'entrée.
+            request (Request): Requête en cours.
+
+        Returns:
+            HttpResponse: Réponse lue dans le cache ou réponse du handler.
+        """
+        cache = self.get_response_cache()
+        if cache is None or self.action not in self.cached_actions or self.project_version is None:
+            return handler(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            return HttpResponse(content, headers=headers)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, (rendered.content, dict(rendered.items())))
+            )
+        return response
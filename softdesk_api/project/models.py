@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from authentication.models import CustomUser
+from .search import FullTextField
 import uuid
 
 
@@ -13,6 +14,9 @@ class Project(models.Model):
         type (CharField): Type de projet (choix parmi Back-end, Front-end, iOS, Android).
         author (ForeignKey): Utilisateur ayant créé le projet.
         created_time (DateTimeField): Date et heure de création, automatiquement définies.
+        updated_time (DateTimeField): Date et heure de la dernière écriture sur le projet ou son contenu.
+        version (PositiveBigIntegerField): Compteur incrémenté à chaque écriture sur le projet ou son contenu
+            (contributeurs, issues, commentaires), utilisé pour les ETag.
     """
     TYPE_CHOICES = (
         ('BACKEND', 'Back-end'),
@@ -25,6 +29,8 @@ class Project(models.Model):
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='projects')
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    version = models.PositiveBigIntegerField(default=0)
 
     def __str__(self):
         """
@@ -76,7 +82,13 @@ class Issue(models.Model):
         author (ForeignKey): Utilisateur ayant créé le problème.
         assignee (ForeignKey): Utilisateur assigné au problème, peut être nul.
         created_time (DateTimeField): Date et heure de création.
+        updated_time (DateTimeField): Date et heure de la dernière modification.
+        comment_count (PositiveIntegerField): Nombre de commentaires, maintenu par project/stats.py.
+        last_comment_time (DateTimeField): Date du dernier commentaire, nulle sans commentaire.
     """
+    # Champs dénormalisés, écrits uniquement par des UPDATE ciblés (project/stats.py)
+    DENORMALIZED_FIELDS = ('comment_count', 'last_comment_time')
+
     STATUS_CHOICES = (
         ('TODO', 'To Do'),
         ('INPROGRESS', 'In Progress'),
@@ -101,6 +113,19 @@ class Issue(models.Model):
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='issues')
     assignee = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_issues')
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    comment_count = models.PositiveIntegerField(default=0)
+    last_comment_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Liste des issues d'un projet triée par date (pagination par curseur)
+            models.Index(fields=['project', 'created_time'], name='issue_project_created_idx'),
+            # Filtres par statut, priorité et assigné à l'intérieur d'un projet
+            models.Index(fields=['project', 'status'], name='issue_project_status_idx'),
+            models.Index(fields=['project', 'priority'], name='issue_project_priority_idx'),
+            models.Index(fields=['project', 'assignee'], name='issue_project_assignee_idx'),
+        ]
 
     def __str__(self):
         """
@@ -111,6 +136,42 @@ class Issue(models.Model):
         """
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Enregistre le problème sans réécrire les champs dénormalisés.
+
+        Une modification n'écrit que les autres champs : un commentaire ajouté entre la lecture
+        et l'enregistrement du problème n'est pas écrasé par l'ancien compteur.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class IssueSearchIndex(models.Model):
+    """
+    Index plein texte des issues : table virtuelle FTS5 project_issue_fts (SQLite uniquement).
+
+    La table, à contenu externe, est créée par la migration 0004 et tenue à jour par des
+    triggers sur project_issue ; Django ne l'utilise qu'en jointure (voir project/search.py).
+
+    Attributes:
+        issue (OneToOneField): Issue indexée (rowid de la table virtuelle).
+        document (FullTextField): Colonne cachée cible de l'opérateur MATCH.
+        rank (FloatField): Pertinence bm25 de la ligne pour la requête MATCH (plus petit = meilleur).
+    """
+    issue = models.OneToOneField(Issue, primary_key=True, db_column='rowid', db_constraint=False,
+                                 on_delete=models.DO_NOTHING, related_name='search_index')
+    document = FullTextField(db_column='project_issue_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'project_issue_fts'
+
 
 class Comment(models.Model):
     """
@@ -122,12 +183,20 @@ class Comment(models.Model):
         issue (ForeignKey): Problème associé au commentaire.
         author (ForeignKey): Utilisateur ayant créé le commentaire.
         created_time (DateTimeField): Date et heure de création.
+        updated_time (DateTimeField): Date et heure de la dernière modification.
     """
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     description = models.TextField()
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='comments')
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Liste des commentaires d'une issue triée par date (pagination par curseur)
+            models.Index(fields=['issue', 'created_time'], name='comment_issue_created_idx'),
+        ]
 
     def __str__(self):
         """
@@ -137,3 +206,85 @@ class Comment(models.Model):
             str: UUID du commentaire et titre du problème associé.
         """
         return f"Comment {self.uuid} on {self.issue.title}"
+
+    def save(self, *args, **kwargs):
+        """Enregistre le commentaire et met à jour les compteurs de l'issue dans la même transaction."""
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Supprime le commentaire et met à jour les compteurs de l'issue dans la même transaction."""
+        with transaction.atomic(savepoint=False):
+            return super().delete(*args, **kwargs)
+
+
+class CommentSearchIndex(models.Model):
+    """
+    Index plein texte des commentaires : table virtuelle FTS5 project_comment_fts (SQLite uniquement).
+
+    Le contenu indexé est lu dans la vue project_comment_fts_content, qui ajoute aux
+    commentaires le projet de leur issue ; la recherche est ainsi restreinte au projet dans
+    l'index. Créée par la migration 0005 et tenue à jour par des triggers.
+
+    Attributes:
+        comment (OneToOneField): Commentaire indexé (rowid de la table virtuelle).
+        document (FullTextField): Colonne cachée cible de l'opérateur MATCH.
+        rank (FloatField): Pertinence bm25 de la ligne pour la requête MATCH.
+    """
+    comment = models.OneToOneField(Comment, primary_key=True, db_column='rowid', db_constraint=False,
+                                   on_delete=models.DO_NOTHING, related_name='search_index')
+    document = FullTextField(db_column='project_comment_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'project_comment_fts'
+
+
+class ProjectStats(models.Model):
+    """
+    Compteur agrégé des issues d'un projet, pour le tableau de bord (action stats).
+
+    Une ligne par projet, dimension et valeur : nombre d'issues par statut, priorité et tag, et
+    nombre d'issues ouvertes (non terminées) par assigné. Les lignes sont mises à jour par
+    incréments à chaque écriture d'une issue (project/stats.py) et recalculées par la
+    commande rebuild_project_stats.
+
+    Attributes:
+        project (ForeignKey): Projet compté.
+        dimension (CharField): Dimension du compteur (status, priority, tag, assignee).
+        key (CharField): Valeur comptée : statut, priorité, tag ou identifiant de l'assigné
+            ('' pour les issues non assignées).
+        count (IntegerField): Nombre d'issues.
+    """
+    STATUS = 'status'
+    PRIORITY = 'priority'
+    TAG = 'tag'
+    ASSIGNEE = 'assignee'
+    DIMENSION_CHOICES = (
+        (STATUS, 'Status'),
+        (PRIORITY, 'Priority'),
+        (TAG, 'Tag'),
+        (ASSIGNEE, 'Open issues per assignee'),
+    )
+    # Statut d'une issue qui n'est plus comptée pour son assigné
+    CLOSED_STATUS = 'FINISHED'
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='stats')
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=20, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'dimension', 'key'], name='unique_project_stat'),
+        ]
+
+    def __str__(self):
+        """
+        Représentation en chaîne du compteur.
+
+        Returns:
+            str: Projet, dimension, valeur et nombre d'issues.
+        """
+        return f"{self.project_id} {self.dimension}={self.key}: {self.count}"
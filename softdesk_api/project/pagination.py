@@ -0,0 +1,101 @@
+"""
+Classes de pagination de l'API SoftDesk.
+
+La pagination par numéro de page (PageNumberPagination, réglage global) reste le comportement
+par défaut. Les listes volumineuses (contributeurs, issues, commentaires) acceptent en plus une
+pagination par curseur, sans COUNT(*) ni OFFSET, demandée par le client à chaque requête.
+"""
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class RowsPaginator(Paginator):
+    """
+    Paginator qui compte les lignes values() d'un ReadSerializer sur le queryset dont elles sont issues.
+
+    Les colonnes des utilisateurs sont lues par jointure, que Django conserverait dans le
+    COUNT(*) ; ReadSerializer.rows() mémorise le queryset sans jointure dans `count_queryset`.
+    """
+
+    @cached_property
+    def count(self):
+        count_queryset = getattr(self.object_list, 'count_queryset', None)
+        return super().count if count_queryset is None else count_queryset.count()
+
+
+class RowsPageNumberPagination(PageNumberPagination):
+    """Pagination par numéro de page (réglage global), compatible avec les lignes des ReadSerializer."""
+    django_paginator_class = RowsPaginator
+
+
+class CreatedTimeCursorPagination(CursorPagination):
+    """
+    Pagination par curseur sur (created_time, id).
+
+    La position est encodée dans un curseur opaque : la page suivante est lue par une
+    comparaison sur l'index au lieu d'un OFFSET, et aucun COUNT(*) n'est exécuté.
+    """
+    ordering = ('created_time', 'id')
+
+
+class CursorOrPageNumberPagination(BasePagination):
+    """
+    Pagination par numéro de page par défaut, par curseur à la demande du client.
+
+    Le mode curseur est choisi avec `?pagination=cursor` ; les liens `next` et `previous`
+    renvoyés dans ce mode portent le paramètre `cursor`, qui le sélectionne aussi.
+
+    Attributes:
+        mode_query_param (str): Paramètre de requête choisissant le mode de pagination.
+        cursor_mode (str): Valeur du paramètre sélectionnant la pagination par curseur.
+    """
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    page_number_class = RowsPageNumberPagination
+    cursor_class = CreatedTimeCursorPagination
+
+    def __init__(self):
+        self.page_number = self.page_number_class()
+        self.cursor = self.cursor_class()
+        self.paginator = self.page_number
+
+    def uses_cursor(self, request):
+        """
+        Indique si la requête demande la pagination par curseur.
+
+        Args:
+            request (Request): Requête en cours.
+
+        Returns:
+            bool: True pour le mode curseur.
+        """
+        params = request.query_params
+        return params.get(self.mode_query_param) == self.cursor_mode or self.cursor.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.cursor if self.uses_cursor(request) else self.page_number
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_number.get_schema_operation_parameters(view)
+        return parameters + self.cursor.get_schema_operation_parameters(view) + [{
+            'name': self.mode_query_param,
+            'required': False,
+            'in': 'query',
+            'description': "Mode de pagination : 'cursor' pour la pagination par curseur.",
+            'schema': {'type': 'string', 'enum': [self.cursor_mode]},
+        }]
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
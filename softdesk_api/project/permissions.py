@@ -1,12 +1,150 @@
+from collections import namedtuple
 from rest_framework.permissions import BasePermission
+from .membership import membership_index
 from .models import Project, Contributor, Issue, Comment
 
 
+Membership = namedtuple('Membership', ['project_id', 'is_author', 'is_contributor'])
+NO_MEMBERSHIP = Membership(None, False, False)
+
+
+def get_project_id(request, view):
+    """
+    Détermine l'identifiant du projet visé par la requête.
+
+    L'identifiant est lu dans les kwargs de l'URL (`project_lookup_url_kwarg` du ViewSet,
+    `project_id` par défaut), puis, pour une création, dans le corps de la requête.
+
+    Args:
+        request (Request): Requête en cours.
+        view (APIView): Vue appelée.
+
+    Returns:
+        str | int | None: Identifiant du projet, ou None s'il ne peut être déterminé.
+    """
+    kwarg = getattr(view, 'project_lookup_url_kwarg', 'project_id')
+    for name in (kwarg, 'project_id', 'projects_pk'):
+        if name in view.kwargs:
+            return view.kwargs[name]
+
+    if getattr(view, 'action', None) == 'create':
+        if request.data.get('project'):
+            return request.data.get('project')
+        if request.data.get('issue'):
+            return Issue.objects.filter(id=request.data.get('issue')).values_list('project_id', flat=True).first()
+    return None
+
+
+def get_user_projects(request):
+    """
+    Renvoie les projets de l'utilisateur connecté, mémorisés sur la requête.
+
+    Args:
+        request (Request): Requête en cours, portant l'utilisateur authentifié.
+
+    Returns:
+        UserProjects: Identifiants des projets contribués et des projets créés.
+    """
+    projects = getattr(request, '_user_projects', None)
+    if projects is None:
+        projects = request._user_projects = membership_index.get(request.user.pk)
+    return projects
+
+
+async def aget_user_projects(request):
+    """
+    Version asynchrone de get_user_projects(), pour les vues async.
+
+    Args:
+        request (HttpRequest): Requête en cours, portant l'utilisateur authentifié.
+
+    Returns:
+        UserProjects: Identifiants des projets contribués et des projets créés.
+    """
+    projects = getattr(request, '_user_projects', None)
+    if projects is None:
+        projects = request._user_projects = await membership_index.aget(request.user.pk)
+    return projects
+
+
+def get_membership(request, project_id):
+    """
+    Résout l'appartenance de l'utilisateur au projet.
+
+    Les projets de l'utilisateur sont lus dans l'index partagé (project/membership.py),
+    en une requête SQL au plus ; le résultat est en outre mémorisé sur la requête, si bien
+    que les permissions et les vues qui le redemandent ne refont aucune lecture.
+
+    Args:
+        request (Request): Requête en cours, portant l'utilisateur authentifié.
+        project_id (str | int): Identifiant du projet.
+
+    Returns:
+        Membership: Appartenance de l'utilisateur au projet.
+    """
+    project_id, memberships = membership_lookup(request, project_id)
+    if project_id is None:
+        return NO_MEMBERSHIP
+    if project_id not in memberships:
+        memberships[project_id] = resolve_membership(get_user_projects(request), project_id)
+    return memberships[project_id]
+
+
+async def aget_membership(request, project_id):
+    """
+    Version asynchrone de get_membership(), pour les vues async.
+
+    Args:
+        request (HttpRequest): Requête en cours, portant l'utilisateur authentifié.
+        project_id (str | int): Identifiant du projet.
+
+    Returns:
+        Membership: Appartenance de l'utilisateur au projet.
+    """
+    project_id, memberships = membership_lookup(request, project_id)
+    if project_id is None:
+        return NO_MEMBERSHIP
+    if project_id not in memberships:
+        memberships[project_id] = resolve_membership(await aget_user_projects(request), project_id)
+    return memberships[project_id]
+
+
+def membership_lookup(request, project_id):
+    """
+    Valide l'utilisateur et l'identifiant du projet, et renvoie le mémo des appartenances de la requête.
+
+    Args:
+        request (Request | HttpRequest): Requête en cours.
+        project_id (str | int): Identifiant du projet.
+
+    Returns:
+        tuple: Identifiant entier du projet (None si l'utilisateur est anonyme ou l'identifiant
+            invalide) et dictionnaire des appartenances déjà résolues.
+    """
+    user = request.user
+    if not user or not user.is_authenticated:
+        return None, {}
+    try:
+        project_id = int(project_id)
+    except (TypeError, ValueError):
+        return None, {}
+
+    memberships = getattr(request, '_project_memberships', None)
+    if memberships is None:
+        memberships = request._project_memberships = {}
+    return project_id, memberships
+
+
+def resolve_membership(projects, project_id):
+    """Construit l'appartenance à un projet à partir des projets de l'utilisateur."""
+    return Membership(project_id, project_id in projects.authored, project_id in projects.contributed)
+
+
 def check_contributor(user, project):
     """Vérifie si l'utilisateur est contributeur du projet."""
     if not project or not user:
         return False
-    return Contributor.objects.filter(project=project, user=user).exists()
+    return project.pk in membership_index.get(user.pk).contributed
 
 
 class IsAuthor(BasePermission):
@@ -14,7 +152,7 @@ class IsAuthor(BasePermission):
     message = "Vous devez être l'auteur pour effectuer cette action."
 
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
+        return obj.author_id == request.user.pk
 
 
 class IsProjectContributor(BasePermission):
@@ -26,32 +164,15 @@ class IsProjectContributor(BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        project_id = None
-        if 'project_id' in view.kwargs:
-            project_id = view.kwargs['project_id']
-        elif 'projects_pk' in view.kwargs:
-            project_id = view.kwargs['projects_pk']
-
-        if view.action == 'create':
-            if not project_id:
-                if request.data.get('project'):
-                    project_id = request.data.get('project')
-                elif request.data.get('issue'):
-                    issue_id = request.data.get('issue')
-                    issue = Issue.objects.filter(id=issue_id).first()
-                    if issue:
-                        project_id = issue.project.id
-            if not project_id:
+        project_id = get_project_id(request, view)
+        if not project_id:
+            if view.action == 'create':
                 return True  # Pour la création de projet
-        elif view.action == 'list':
-            if not project_id:
+            if view.action == 'list':
                 return True  # Pour la liste globale, filtrée par queryset
-
-        if not project_id:
             return False
 
-        project = Project.objects.filter(id=project_id).first()
-        return check_contributor(request.user, project)
+        return get_membership(request, project_id).is_contributor
 
     def has_object_permission(self, request, view, obj):
         """Pour les actions avec objet (retrieve, update, destroy)"""
@@ -59,18 +180,18 @@ class IsProjectContributor(BasePermission):
             return False
 
         if view.action in ['update', 'partial_update', 'destroy']:
-            return obj.author == request.user
+            return obj.author_id == request.user.pk
 
         if isinstance(obj, Project):
-            project = obj
-        elif isinstance(obj, Issue):
-            project = obj.project
+            project_id = obj.pk
+        elif isinstance(obj, (Contributor, Issue)):
+            project_id = obj.project_id
         elif isinstance(obj, Comment):
-            project = obj.issue.project
+            project_id = obj.issue.project_id
         else:
             return False
 
-        return check_contributor(request.user, project)
+        return get_membership(request, project_id).is_contributor
 
 
 class IsProjectAuthor(BasePermission):
@@ -81,21 +202,15 @@ class IsProjectAuthor(BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        project_id = None
-        if 'project_id' in view.kwargs:
-            project_id = view.kwargs['project_id']
-        elif 'projects_pk' in view.kwargs:
-            project_id = view.kwargs['projects_pk']
-
+        project_id = get_project_id(request, view)
         if not project_id:
             return False
 
-        project = Project.objects.filter(id=project_id).first()
-        return request.user == project.author
+        return get_membership(request, project_id).is_author
 
     def has_object_permission(self, request, view, obj):
         if isinstance(obj, Project):
-            return obj.author == request.user
+            return obj.author_id == request.user.pk
         if isinstance(obj, Contributor):
-            return obj.project.author == request.user
+            return get_membership(request, obj.project_id).is_author
         return False
@@ -0,0 +1,107 @@
+"""
+Renderers de l'API.
+
+FastJSONRenderer rend toutes les réponses JSON (réglage REST_FRAMEWORK) avec orjson lorsqu'il
+est installé, et avec le module json de la bibliothèque standard sinon ; les deux rendus sont
+identiques octet pour octet (voir FastJSONTestCase).
+
+NDJSONRenderer et CSVRenderer permettent la négociation du format d'export
+(`?format=ndjson|csv` ou en-tête Accept). Les exports eux-mêmes sont diffusés en flux (voir
+project/exports.py) ; ces renderers servent aux réponses ordinaires de ces endpoints, par
+exemple les erreurs.
+"""
+import csv
+import io
+import json
+import math
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance facultative
+    orjson = None
+
+# Sortie identique à celle de JSONRenderer : datetimes UTC en « Z » (comme DateTimeField),
+# clés non textuelles converties en chaînes
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def has_non_finite_float(data):
+    """
+    Indique si les données contiennent un float NaN ou infini (orjson les rendrait par null).
+
+    Args:
+        data (object): Données à rendre (dictionnaires, listes et tuples imbriqués).
+
+    Returns:
+        bool: True si un float non fini est trouvé.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer rendu par orjson, avec repli sur le rendu de DRF.
+
+    orjson sérialise nativement dictionnaires, listes, chaînes (ErrorDetail compris), dates,
+    datetimes et UUID ; les autres types (Decimal, chaînes traduites paresseuses, QuerySet...)
+    passent par l'encodeur de DRF. Le rendu indenté (`Accept: application/json; indent=4`) et
+    l'absence d'orjson utilisent le rendu de DRF.
+
+    Comme JSONRenderer, U+2028 et U+2029 sont échappés (JSON inclus dans du JavaScript). orjson
+    rend NaN et les infinis par null : une sortie contenant null est vérifiée, et confiée au rendu
+    de DRF (erreur avec STRICT_JSON, littéraux NaN/Infinity sinon) si elle vient d'un tel float.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or '', renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+        if b'null' in ret and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Rend une liste d'objets à raison d'un objet JSON par ligne."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in rows).encode()
+
+
+class CSVRenderer(BaseRenderer):
+    """Rend une liste de dictionnaires en CSV, avec une ligne d'en-tête."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        fieldnames = list(rows[0].keys()) if rows else []
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
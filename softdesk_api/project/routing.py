@@ -0,0 +1,99 @@
+"""
+Routage des lectures vers une base en lecture seule (réplique).
+
+La base de lecture est l'alias SOFTDESK_READ_DATABASE, s'il figure dans DATABASES (profil
+'production' de settings.py) ; sinon tout reste sur 'default'. Hors d'une requête servie par
+un ViewSet (ReadReplicaMixin, project/mixins.py), lectures et écritures vont à 'default'.
+
+L'état du routage est propre à la requête (ContextVar) : le ViewSet autorise la réplique pour
+ses actions de lecture et pour ses vérifications de permissions en GET ; la première écriture
+de la requête la fixe ensuite sur 'default', pour que ses lectures suivantes voient l'écriture.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class ReadRouting:
+    """
+    État du routage d'une requête.
+
+    Attributes:
+        replica (bool): Les lectures peuvent aller à la réplique.
+        pinned (bool): Une écriture a eu lieu : les lectures restent sur la base principale.
+    """
+    __slots__ = ('replica', 'pinned')
+
+    def __init__(self):
+        self.replica = False
+        self.pinned = False
+
+
+current_routing = ContextVar('softdesk_db_routing', default=None)
+
+
+def read_database():
+    """Renvoie l'alias de la base de lecture configurée, ou None."""
+    alias = getattr(settings, 'SOFTDESK_READ_DATABASE', None)
+    return alias if alias and alias in connections.settings else None
+
+
+def reads_from_replica():
+    """Indique si les lectures en cours sont routées vers la réplique."""
+    routing = current_routing.get()
+    return routing is not None and routing.replica and not routing.pinned and read_database() is not None
+
+
+@contextmanager
+def routing_scope():
+    """Ouvre l'état de routage d'une requête : lectures sur la base principale jusqu'à autorisation."""
+    token = current_routing.set(ReadRouting())
+    try:
+        yield
+    finally:
+        current_routing.reset(token)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    Autorise (ou interdit) la réplique le temps du bloc, dans l'état de routage de la requête.
+
+    Args:
+        enabled (bool): Les lectures du bloc peuvent aller à la réplique.
+    """
+    routing = current_routing.get()
+    if routing is None:
+        yield
+        return
+    previous, routing.replica = routing.replica, enabled
+    try:
+        yield
+    finally:
+        routing.replica = previous
+
+
+class ReadReplicaRouter:
+    """
+    Routeur de bases de données : lectures autorisées sur la réplique, tout le reste sur 'default'.
+
+    Les lectures hors réplique renvoient explicitement 'default' : un objet lu sur la réplique
+    ne doit pas y entraîner les lectures de ses relations après une écriture.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database() if reads_from_replica() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            routing.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplique reçoit le schéma de la base principale
+        return False if db == read_database() else None
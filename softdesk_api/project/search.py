@@ -0,0 +1,117 @@
+"""
+Recherche plein texte.
+
+Sous SQLite, les textes sont indexés dans des tables virtuelles FTS5 à contenu externe
+(project_issue_fts...), créées par les migrations et tenues à jour par des triggers SQL.
+Chaque table indexe aussi la colonne de portée (project_id) : la requête MATCH restreint les
+résultats au projet de l'URL dans l'index lui-même, puis les trie par pertinence (bm25).
+Sur les autres moteurs, ou si SQLite est compilé sans FTS5, la recherche se replie sur
+des filtres icontains triés par date.
+"""
+import re
+from functools import lru_cache, reduce
+from operator import and_
+from django.conf import settings
+from django.db import connections, models
+from django.db.models import Q
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class FullTextField(models.TextField):
+    """
+    Colonne cachée d'une table FTS5, qui porte le nom de la table.
+
+    Elle n'est jamais lue : elle sert de membre gauche à l'opérateur MATCH (lookup `match`).
+    """
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    """Lookup `match` : `<table> MATCH <requête FTS5>`."""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+def search_terms(text):
+    """
+    Découpe le texte recherché en mots, en minuscules.
+
+    Seuls les caractères de mots sont conservés : la syntaxe FTS5 saisie par l'utilisateur
+    (guillemets, opérateurs, colonnes) n'est jamais transmise telle quelle.
+
+    Args:
+        text (str): Texte saisi par l'utilisateur.
+
+    Returns:
+        list: Mots recherchés, au plus SOFTDESK_SEARCH_MAX_TERMS (10 par défaut).
+    """
+    return WORD_PATTERN.findall(text.lower())[:getattr(settings, 'SOFTDESK_SEARCH_MAX_TERMS', 10)]
+
+
+def build_fts_query(terms, columns, scope_column, scope_id):
+    """
+    Construit la requête FTS5 : tous les mots dans les colonnes de texte, le dernier en préfixe.
+
+    Args:
+        terms (list): Mots recherchés.
+        columns (tuple): Colonnes de texte interrogées.
+        scope_column (str): Colonne de portée indexée.
+        scope_id (int): Valeur de la colonne de portée.
+
+    Returns:
+        str: Requête MATCH.
+    """
+    phrases = ' '.join(f'"{term}"' for term in terms)
+    return f'{scope_column}:"{int(scope_id)}" AND {{{" ".join(columns)}}}: ({phrases}*)'
+
+
+@lru_cache(maxsize=None)
+def fts_available(using, table):
+    """
+    Indique si la table FTS5 existe sur la base désignée.
+
+    Args:
+        using (str): Alias de la base de données.
+        table (str): Nom de la table virtuelle.
+
+    Returns:
+        bool: True si la recherche peut utiliser FTS5.
+    """
+    connection = connections[using]
+    return connection.vendor == 'sqlite' and table in connection.introspection.table_names()
+
+
+def full_text_search(queryset, text, index_relation, columns, scope_column, scope_id):
+    """
+    Filtre un queryset par recherche plein texte et le trie par pertinence.
+
+    Args:
+        queryset (QuerySet): Queryset à filtrer.
+        text (str): Texte saisi par l'utilisateur.
+        index_relation (str): Relation inverse vers le modèle de la table FTS5 (search_index).
+        columns (tuple): Colonnes de texte interrogées.
+        scope_column (str): Colonne de portée indexée.
+        scope_id (int): Valeur de la colonne de portée.
+
+    Returns:
+        QuerySet: Objets correspondant à tous les mots, les plus pertinents en premier.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    index_model = queryset.model._meta.get_field(index_relation).related_model
+    if fts_available(queryset.db, index_model._meta.db_table):
+        query = build_fts_query(terms, columns, scope_column, scope_id)
+        return queryset.filter(**{f'{index_relation}__document__match': query}).order_by(
+            f'{index_relation}__rank', 'id'
+        )
+    condition = reduce(and_, (
+        reduce(lambda left, right: left | right, (Q(**{f'{column}__icontains': term}) for column in columns))
+        for term in terms
+    ))
+    return queryset.filter(condition).order_by('-created_time', '-id')
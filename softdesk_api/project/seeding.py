@@ -0,0 +1,152 @@
+"""
+Génération de données synthétiques pour les benchmarks et les tests de charge.
+
+Les lignes sont créées par lots (bulk_create) dans une seule transaction ; les compteurs que
+les signaux tiendraient à jour (commentaires des issues, ProjectStats) sont recalculés par
+requêtes groupées, et l'index plein texte est alimenté par ses triggers. La génération est
+déterministe pour une graine donnée : textes, choix, auteurs, assignés et UUID des commentaires.
+
+Conventions, sur lesquelles s'appuient les benchmarks :
+    - les utilisateurs s'appellent `<préfixe>-user<n>` et partagent le même mot de passe ;
+    - le projet n a pour auteur l'utilisateur n modulo le nombre d'utilisateurs : le premier
+      utilisateur est donc l'auteur (et contributeur) du premier projet.
+"""
+import random
+import uuid
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from authentication.models import CustomUser
+from .membership import membership_index
+from .models import Project, Contributor, Issue, Comment
+from .stats import rebuild_project_stats, refresh_comment_stats
+
+WORDS = (
+    'serveur', 'connexion', 'erreur', 'base', 'données', 'requête', 'page', 'utilisateur', 'projet',
+    'ticket', 'interface', 'bouton', 'formulaire', 'export', 'import', 'jeton', 'session', 'cache',
+    'lenteur', 'mobile', 'android', 'ios', 'affichage', 'recherche', 'filtre', 'tri', 'droits',
+    'notification', 'courriel', 'paiement', 'facture', 'rapport', 'migration', 'version', 'déploiement',
+    'test', 'correctif', 'régression', 'plantage', 'délai', 'mémoire', 'disque', 'réseau', 'api',
+)
+
+
+def sentence(rng, words):
+    """Renvoie une phrase de `words` mots tirés du vocabulaire."""
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize() + '.'
+
+
+def seed_softdesk(users=100, projects=10, contributors=10, issues=100, comments=5,
+                  prefix='seed', password='softdesk-seed', batch_size=2000, seed=0, log=None):
+    """
+    Crée des utilisateurs, des projets, leurs contributeurs, leurs issues et leurs commentaires.
+
+    Args:
+        users (int): Nombre d'utilisateurs.
+        projects (int): Nombre de projets.
+        contributors (int): Contributeurs par projet, auteur compris (au plus `users`).
+        issues (int): Issues par projet.
+        comments (int): Commentaires par issue, en moyenne (de 0 au double).
+        prefix (str): Préfixe des noms d'utilisateur.
+        password (str): Mot de passe commun des utilisateurs, haché une seule fois.
+        batch_size (int): Taille des lots de bulk_create.
+        seed (int): Graine du générateur pseudo-aléatoire.
+        log (callable | None): Fonction appelée avec un message à chaque étape.
+
+    Returns:
+        dict: Nombre de lignes créées par modèle.
+    """
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    contributors = max(1, min(contributors, users))
+    counts = dict.fromkeys(('users', 'projects', 'contributors', 'issues', 'comments'), 0)
+
+    with transaction.atomic():
+        hashed = make_password(password)
+        created_users = CustomUser.objects.bulk_create(
+            (
+                CustomUser(
+                    username=f'{prefix}-user{i}', username_lower=f'{prefix}-user{i}',
+                    email=f'{prefix}-user{i}@example.com', email_lower=f'{prefix}-user{i}@example.com',
+                    password=hashed, can_be_contacted=rng.random() < 0.5, can_data_be_shared=rng.random() < 0.5,
+                )
+                for i in range(users)
+            ),
+            batch_size=batch_size,
+        )
+        user_ids = [user.pk for user in created_users]
+        counts['users'] = len(user_ids)
+        log(f"{counts['users']} utilisateurs")
+
+        created_projects = Project.objects.bulk_create(
+            (
+                Project(
+                    name=f'Projet {i}', description=sentence(rng, 12), type=rng.choice(Project.TYPE_CHOICES)[0],
+                    author_id=user_ids[i % users],
+                )
+                for i in range(projects)
+            ),
+            batch_size=batch_size,
+        )
+        counts['projects'] = len(created_projects)
+        log(f"{counts['projects']} projets")
+
+        members = {}
+        for project in created_projects:
+            others = [user_id for user_id in rng.sample(user_ids, contributors) if user_id != project.author_id]
+            members[project.pk] = [project.author_id] + others[:contributors - 1]
+        counts['contributors'] = len(Contributor.objects.bulk_create(
+            (Contributor(user_id=user_id, project_id=project_id)
+             for project_id, member_ids in members.items() for user_id in member_ids),
+            batch_size=batch_size,
+        ))
+        log(f"{counts['contributors']} contributeurs")
+        # bulk_create n'émet pas de signaux : l'index des appartenances est invalidé ici
+        membership_index.invalidate(*user_ids)
+
+        pending = []
+        for project in created_projects:
+            for i in range(issues):
+                author_id, assignee_id = rng.choice(members[project.pk]), rng.choice(members[project.pk])
+                pending.append(Issue(
+                    title=sentence(rng, 5)[:100], description=sentence(rng, 30), project_id=project.pk,
+                    status=rng.choice(Issue.STATUS_CHOICES)[0], priority=rng.choice(Issue.PRIORITY_CHOICES)[0],
+                    tag=rng.choice(Issue.TAG_CHOICES)[0], author_id=author_id,
+                    assignee_id=assignee_id if rng.random() < 0.8 else None,
+                ))
+                if len(pending) >= batch_size:
+                    counts['comments'] += create_issues(pending, members, comments, rng, batch_size)
+                    counts['issues'] += len(pending)
+                    pending = []
+                    log(f"{counts['issues']} issues, {counts['comments']} commentaires")
+        if pending:
+            counts['comments'] += create_issues(pending, members, comments, rng, batch_size)
+            counts['issues'] += len(pending)
+            log(f"{counts['issues']} issues, {counts['comments']} commentaires")
+
+        rebuild_project_stats([project.pk for project in created_projects])
+        log("statistiques des projets recalculées")
+    return counts
+
+
+def create_issues(issues, members, comments, rng, batch_size):
+    """
+    Crée un lot d'issues, puis leurs commentaires, et met à jour leurs compteurs.
+
+    Returns:
+        int: Nombre de commentaires créés.
+    """
+    Issue.objects.bulk_create(issues, batch_size=batch_size)
+    created = 0
+    pending = []
+    for issue in issues:
+        for _ in range(rng.randint(0, 2 * comments)):
+            pending.append(Comment(
+                uuid=uuid.UUID(int=rng.getrandbits(128), version=4), description=sentence(rng, 15),
+                issue_id=issue.pk, author_id=rng.choice(members[issue.project_id]),
+            ))
+            if len(pending) >= batch_size:
+                created += len(Comment.objects.bulk_create(pending))
+                pending = []
+    if pending:
+        created += len(Comment.objects.bulk_create(pending))
+    refresh_comment_stats([issue.pk for issue in issues])
+    return created
@@ -1,10 +1,117 @@
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Project, Contributor, Issue, Comment
+from .metrics import TimedListSerializer, TimedSerializerMixin, timer
 from authentication.models import CustomUser
 from authentication.serializers import UserSerializer
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ScopedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Clé primaire de l'objet de l'URL, lorsque son chargement est fourni dans le contexte.
+
+    Les écritures, unitaires ou par lots, placent dans `context['scope']` le chargement du
+    projet ou de l'issue de l'URL (ScopedWriteMixin) : la valeur doit y faire référence.
+    """
+    default_error_messages = {
+        'out_of_scope': "L'objet {pk_value} ne correspond pas à celui de l'URL.",
+    }
+
+    def to_internal_value(self, data):
+        load_scope = self.context.get('scope', {}).get(self.field_name)
+        if load_scope is None:
+            return super().to_internal_value(data)
+        scope = load_scope()
+        if str(data) != str(scope.pk):
+            self.fail('out_of_scope', pk_value=data)
+        return scope
+
+
+class BulkListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    ListSerializer qui crée et modifie les objets par lots.
+
+    La création utilise bulk_create et la modification bulk_update ; les erreurs de
+    validation sont rapportées élément par élément, dans l'ordre du lot.
+    En modification, `instance` est un dictionnaire {identifiant: objet} et chaque élément
+    porte l'identifiant désigné par `context['bulk_lookup_field']`.
+    """
+
+    def run_child_validation(self, data):
+        """
+        Valide un élément, contre l'objet existant qu'il désigne en cas de modification.
+
+        Args:
+            data (dict): Élément du lot.
+
+        Returns:
+            dict: Données validées de l'élément.
+        """
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        lookup_field = self.context['bulk_lookup_field']
+        instance = self.instance.get(str(data.get(lookup_field))) if isinstance(data, dict) else None
+        if instance is None:
+            raise serializers.ValidationError({lookup_field: ["Objet introuvable."]})
+        if instance.author_id != self.context['request'].user.pk:
+            raise serializers.ValidationError({lookup_field: ["Vous devez être l'auteur pour effectuer cette action."]})
+        self.child.instance = instance
+        self.child.initial_data = data
+        try:
+            attrs = super().run_child_validation(data)
+        finally:
+            self.child.instance = None
+        self._matched_instances.append(instance)
+        return attrs
+
+    def to_internal_value(self, data):
+        self._matched_instances = []
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        """
+        Crée tous les objets du lot en une requête.
+
+        Args:
+            validated_data (list): Données validées de chaque élément.
+
+        Returns:
+            list: Objets créés.
+        """
+        model = self.child.Meta.model
+        return model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+    def update(self, instance, validated_data):
+        """
+        Applique les modifications de tous les éléments du lot avec bulk_update.
+
+        Args:
+            instance (dict): Objets existants, indexés par identifiant.
+            validated_data (list): Données validées, dans l'ordre des objets désignés.
+
+        Returns:
+            list: Objets modifiés.
+        """
+        model = self.child.Meta.model
+        objects, fields = self._matched_instances, set()
+        for obj, attrs in zip(objects, validated_data):
+            for field, value in attrs.items():
+                setattr(obj, field, value)
+                fields.add(field)
+        if fields:
+            # bulk_update n'appelle pas save() : les champs auto_now sont renseignés ici
+            auto_now_fields = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+            for obj in objects:
+                for field in auto_now_fields:
+                    field.pre_save(obj, add=False)
+            fields.update(field.name for field in auto_now_fields)
+            model.objects.bulk_update(objects, fields)
+        return objects
+
+
+class ProjectSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Project.
 
@@ -21,6 +128,7 @@ class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = ['id', 'name', 'description', 'type', 'author', 'created_time']
+        list_serializer_class = TimedListSerializer
 
     def create(self, validated_data):
         """
@@ -37,7 +145,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Contributor.
 
@@ -56,6 +164,7 @@ class ContributorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Contributor
         fields = ['id', 'user', 'project', 'created_time']
+        list_serializer_class = TimedListSerializer
 
     def to_representation(self, instance):
         """
@@ -72,28 +181,34 @@ class ContributorSerializer(serializers.ModelSerializer):
         return representation
 
 
-class IssueSerializer(serializers.ModelSerializer):
+class IssueSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Issue.
 
     Gère la sérialisation et la désérialisation des problèmes, incluant l'auteur
     et l'assigné en lecture seule, le projet comme clé primaire, et la création
-    avec l'utilisateur connecté comme auteur.
+    avec l'utilisateur connecté comme auteur. Le nombre de commentaires et la date du
+    dernier sont des compteurs dénormalisés, en lecture seule.
 
     Attributes:
         author (UserSerializer): Sérialiseur pour l'auteur, en lecture seule.
         assignee (UserSerializer): Sérialiseur pour l'assigné, en lecture seule.
-        project (PrimaryKeyRelatedField): Clé primaire du projet.
+        project (ScopedPrimaryKeyRelatedField): Clé primaire du projet.
         model (Model): Le modèle Issue.
         fields (list): Champs inclus dans la sérialisation.
     """
     author = UserSerializer(read_only=True)
     assignee = UserSerializer(read_only=True)
-    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    project = ScopedPrimaryKeyRelatedField(queryset=Project.objects.all())
 
     class Meta:
         model = Issue
-        fields = ['id', 'title', 'description', 'status', 'priority', 'tag', 'project', 'author', 'assignee', 'created_time']
+        list_serializer_class = BulkListSerializer
+        fields = [
+            'id', 'title', 'description', 'status', 'priority', 'tag', 'project', 'author', 'assignee', 'created_time',
+            'comment_count', 'last_comment_time',
+        ]
+        read_only_fields = ['comment_count', 'last_comment_time']
 
     def create(self, validated_data):
         """
@@ -110,7 +225,7 @@ class IssueSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Sérialiseur pour le modèle Comment.
 
@@ -120,17 +235,18 @@ class CommentSerializer(serializers.ModelSerializer):
 
     Attributes:
         author (UserSerializer): Sérialiseur pour l'auteur, en lecture seule.
-        issue (PrimaryKeyRelatedField): Clé primaire du problème.
+        issue (ScopedPrimaryKeyRelatedField): Clé primaire du problème.
         uuid (UUIDField): Identifiant unique, en lecture seule.
         model (Model): Le modèle Comment.
         fields (list): Champs inclus dans la sérialisation.
     """
     author = UserSerializer(read_only=True)
-    issue = serializers.PrimaryKeyRelatedField(queryset=Issue.objects.all())
+    issue = ScopedPrimaryKeyRelatedField(queryset=Issue.objects.all())
     uuid = serializers.UUIDField(read_only=True)
 
     class Meta:
         model = Comment
+        list_serializer_class = BulkListSerializer
         fields = ['id', 'uuid', 'description', 'issue', 'author', 'created_time']
 
     def create(self, validated_data):
@@ -146,4 +262,102 @@ class CommentSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         validated_data['author'] = request.user
         return super().create(validated_data)
-    
\ No newline at end of file
+
+
+# Champs lisibles de UserSerializer (le mot de passe est en écriture seule)
+USER_FIELDS = tuple(name for name, field in UserSerializer().fields.items() if not field.write_only)
+
+
+class ReadSerializer:
+    """
+    Sérialiseur en lecture seule, sur des lignes values() plutôt que sur des instances.
+
+    Les listes n'instancient ni objets du modèle ni champs DRF : `rows()` restreint le queryset
+    aux colonnes de la représentation (utilisateurs compris, par jointure), et chaque ligne est
+    convertie en dictionnaire de même forme que celle du ModelSerializer correspondant.
+    Les datetimes sont ramenés au fuseau courant, comme DateTimeField ; datetimes, dates et
+    UUID sont convertis en texte par le renderer JSON.
+
+    Attributes:
+        model (Model): Modèle des lignes.
+        fields (tuple): Champs de la représentation, dans l'ordre du ModelSerializer.
+        user_fields (tuple): Relations vers CustomUser, représentées comme UserSerializer.
+    """
+    model = None
+    fields = ()
+    user_fields = ()
+
+    def __init__(self, instance=None, many=False, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.timezone = timezone.get_current_timezone()
+        self.datetime_fields = [
+            name for name in self.fields if isinstance(self.model._meta.get_field(name), models.DateTimeField)
+        ]
+
+    @classmethod
+    def rows(cls, queryset):
+        """
+        Restreint un queryset aux colonnes lues par le sérialiseur.
+
+        Args:
+            queryset (QuerySet): Queryset filtré et ordonné du modèle.
+
+        Returns:
+            QuerySet: Lignes values() de la représentation, avec le queryset d'origine en
+            `count_queryset`.
+        """
+        names = []
+        for name in cls.fields:
+            if name in cls.user_fields:
+                names.extend(f'{name}__{user_field}' for user_field in USER_FIELDS)
+            else:
+                names.append(name)
+        rows = queryset.values(*names)
+        # COUNT(*) sans les jointures des utilisateurs (voir project/pagination.py)
+        rows.count_queryset = queryset
+        return rows
+
+    def to_representation(self, row):
+        """
+        Convertit une ligne values() en représentation.
+
+        Args:
+            row (dict): Ligne renvoyée par `rows()`.
+
+        Returns:
+            dict: Représentation de la ligne.
+        """
+        data = {}
+        for name in self.fields:
+            if name not in self.user_fields:
+                data[name] = row[name]
+            elif row[f'{name}__id'] is None:
+                data[name] = None
+            else:
+                data[name] = {user_field: row[f'{name}__{user_field}'] for user_field in USER_FIELDS}
+        for name in self.datetime_fields:
+            if data[name] is not None:
+                data[name] = data[name].astimezone(self.timezone)
+        return data
+
+    @property
+    def data(self):
+        with timer('serializer'):
+            if self.many:
+                return [self.to_representation(row) for row in self.instance]
+            return self.to_representation(self.instance)
+
+
+class IssueReadSerializer(ReadSerializer):
+    """Représentation des issues en liste, identique à celle d'IssueSerializer."""
+    model = Issue
+    fields = tuple(IssueSerializer.Meta.fields)
+    user_fields = ('author', 'assignee')
+
+
+class CommentReadSerializer(ReadSerializer):
+    """Représentation des commentaires en liste, identique à celle de CommentSerializer."""
+    model = Comment
+    fields = tuple(CommentSerializer.Meta.fields)
+    user_fields = ('author',)
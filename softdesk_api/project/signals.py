@@ -0,0 +1,215 @@
+"""
+Signaux du module project.
+
+Ils maintiennent la cohérence des données dérivées des modèles lorsque les contributeurs,
+projets, issues et commentaires sont créés, modifiés ou supprimés :
+index des appartenances (project/membership.py), version des projets (project/versioning.py)
+et compteurs dénormalisés (commentaires des issues, statistiques des projets : project/stats.py).
+"""
+from django.db.models import Q, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from authentication.models import CustomUser
+from .membership import membership_index
+from .models import Project, Contributor, Issue, Comment
+from .stats import (
+    ISSUE_STATS_FIELDS, issue_stat_values, rebuild_project_stats, record_comment_created, record_issue_changes,
+    refresh_comment_stats,
+)
+from .versioning import bump_project_version, bump_user_projects_version
+
+# Champs de l'utilisateur imbriqués dans les représentations des projets, issues et commentaires
+USER_REPRESENTATION_FIELDS = {'username', 'email', 'date_birth', 'can_be_contacted', 'can_data_be_shared'}
+
+# Noms (champ ou colonne) des champs de l'issue comptés par ProjectStats, tels qu'ils figurent dans update_fields
+ISSUE_STATS_UPDATE_FIELDS = {*ISSUE_STATS_FIELDS, *(name.removesuffix('_id') for name in ISSUE_STATS_FIELDS)}
+
+
+def deleted_with(origin, *parents):
+    """
+    Indique si une suppression découle en cascade de celle d'un objet parent.
+
+    La suppression du parent incrémente déjà la version du projet : inutile de le refaire
+    pour chacun de ses enfants. Un utilisateur supprimé est le parent de ses contributions,
+    issues et commentaires : ses propres signaux font le travail une fois pour tous.
+
+    Args:
+        origin (Model | QuerySet): Objet ou queryset à l'origine de la suppression.
+        *parents (Model): Modèles parents.
+
+    Returns:
+        bool: True si l'origine est un des modèles parents.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in parents
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def invalidate_contributor_membership(sender, instance, **kwargs):
+    """Invalide l'index de l'utilisateur ajouté ou retiré d'un projet."""
+    membership_index.invalidate(instance.user_id)
+    if not deleted_with(kwargs.get('origin'), Project, CustomUser):
+        bump_project_version(instance.project_id)
+
+
+@receiver(pre_save, sender=Project)
+def remember_previous_project_author(sender, instance, update_fields=None, **kwargs):
+    """Mémorise l'auteur enregistré en base avant une modification du projet."""
+    if instance._state.adding or (update_fields is not None and 'author' not in update_fields):
+        instance._previous_author_id = None
+    else:
+        instance._previous_author_id = (
+            Project.objects.filter(pk=instance.pk).values_list('author_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_membership(sender, instance, **kwargs):
+    """Invalide l'index de l'auteur du projet (et de l'auteur précédent s'il a changé)."""
+    membership_index.invalidate(instance.author_id, getattr(instance, '_previous_author_id', None))
+
+
+@receiver(post_save, sender=Project)
+def bump_updated_project_version(sender, instance, created, **kwargs):
+    """Incrémente la version d'un projet modifié."""
+    if not created:
+        bump_project_version(instance.pk)
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def bump_issue_project_version(sender, instance, **kwargs):
+    """
+    Incrémente la version du projet d'une issue créée, modifiée ou supprimée.
+
+    Une issue déplacée change le contenu de deux projets : l'ancien (mémorisé par
+    remember_previous_issue_stats) et le nouveau sont incrémentés ensemble.
+    """
+    if deleted_with(kwargs.get('origin'), Project, CustomUser):
+        return
+    previous = getattr(instance, '_previous_stats', None) if kwargs['signal'] is post_save else None
+    if previous is not None and previous['project_id'] != instance.project_id:
+        bump_project_version(pk__in=[previous['project_id'], instance.project_id])
+    else:
+        bump_project_version(instance.project_id)
+
+
+@receiver(pre_save, sender=Issue)
+def remember_previous_issue_stats(sender, instance, update_fields=None, **kwargs):
+    """Mémorise les champs comptés par ProjectStats, dont le projet, tels qu'enregistrés avant la modification."""
+    instance._previous_stats = None
+    if instance._state.adding or (update_fields is not None and not ISSUE_STATS_UPDATE_FIELDS & set(update_fields)):
+        return
+    instance._previous_stats = Issue.objects.filter(pk=instance.pk).values(*ISSUE_STATS_FIELDS).first()
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance, created, **kwargs):
+    """Applique aux statistiques du projet la création ou la modification d'une issue."""
+    if created:
+        record_issue_changes([(None, issue_stat_values(instance))])
+    elif getattr(instance, '_previous_stats', None) is not None:
+        record_issue_changes([(instance._previous_stats, issue_stat_values(instance))])
+
+
+@receiver(post_delete, sender=Issue)
+def uncount_deleted_issue(sender, instance, **kwargs):
+    """Retire une issue supprimée des statistiques, sauf si le projet ou l'auteur disparaît aussi."""
+    if not deleted_with(kwargs.get('origin'), Project, CustomUser):
+        record_issue_changes([(issue_stat_values(instance), None)])
+
+
+@receiver(pre_save, sender=Comment)
+def remember_previous_comment_issue(sender, instance, update_fields=None, **kwargs):
+    """Mémorise l'issue enregistrée en base avant une modification du commentaire."""
+    if instance._state.adding or (update_fields is not None and not {'issue', 'issue_id'} & set(update_fields)):
+        instance._previous_issue_id = None
+    else:
+        instance._previous_issue_id = Comment.objects.filter(pk=instance.pk).values_list('issue_id', flat=True).first()
+
+
+def moved_comment_issue_ids(instance, **kwargs):
+    """Renvoie l'issue précédente et l'issue actuelle d'un commentaire déplacé par save(), sinon None."""
+    previous_issue_id = getattr(instance, '_previous_issue_id', None) if kwargs['signal'] is post_save else None
+    if previous_issue_id is None or previous_issue_id == instance.issue_id:
+        return None
+    return [previous_issue_id, instance.issue_id]
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_project_version(sender, instance, **kwargs):
+    """Incrémente la version du projet d'un commentaire créé, modifié (déplacé) ou supprimé."""
+    if deleted_with(kwargs.get('origin'), Project, Issue, CustomUser):
+        return
+    moved = moved_comment_issue_ids(instance, **kwargs)
+    if moved:
+        bump_project_version(issues__id__in=moved)
+    else:
+        bump_project_version(issues__id=instance.issue_id)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    """
+    Compte un nouveau commentaire dans son issue (Comment.save est transactionnel).
+
+    Un commentaire déplacé vers une autre issue fait recalculer les compteurs des deux issues.
+    """
+    if created:
+        record_comment_created(instance)
+        return
+    moved = moved_comment_issue_ids(instance, **kwargs)
+    if moved:
+        refresh_comment_stats(moved)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_deleted_comment(sender, instance, **kwargs):
+    """Recalcule les compteurs de l'issue d'un commentaire supprimé, sauf si l'issue ou l'auteur disparaît."""
+    if not deleted_with(kwargs.get('origin'), Project, Issue, CustomUser):
+        refresh_comment_stats([instance.issue_id])
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_user_projects(sender, instance, created, update_fields=None, **kwargs):
+    """Incrémente la version des projets affichant un utilisateur dont le profil a changé."""
+    if created or (update_fields is not None and not USER_REPRESENTATION_FIELDS & set(update_fields)):
+        return
+    bump_user_projects_version(instance.pk)
+
+
+@receiver(pre_delete, sender=CustomUser)
+def remember_deleted_user_content(sender, instance, **kwargs):
+    """
+    Incrémente la version des projets de l'utilisateur supprimé et mémorise les compteurs à recalculer.
+
+    Ses contributions, issues et commentaires sont supprimés en cascade sans que leurs signaux
+    n'agissent (deleted_with) : les versions sont incrémentées ici en une requête, et les
+    compteurs recalculés une fois pour tous par recount_deleted_user_content.
+    """
+    bump_user_projects_version(instance.pk)
+    instance._stats_project_ids = set(Issue.objects.filter(
+        Q(author_id=instance.pk) | Q(assignee_id=instance.pk),
+    ).values_list('project_id', flat=True).distinct())
+    instance._commented_issue_ids = list(Comment.objects.filter(author_id=instance.pk).exclude(
+        issue__author_id=instance.pk,
+    ).values_list('issue_id', flat=True).distinct())
+
+
+@receiver(post_delete, sender=CustomUser)
+def recount_deleted_user_content(sender, instance, **kwargs):
+    """
+    Recalcule les statistiques et les compteurs de commentaires touchés par la suppression d'un utilisateur.
+
+    Sont recalculés les projets où il était auteur ou assigné d'issues, et les issues
+    (d'autres auteurs) qu'il avait commentées. La suppression passe ses issues assignées à « non assigné » par un UPDATE, sans signal.
+    """
+    project_ids = getattr(instance, '_stats_project_ids', None)
+    if project_ids:
+        rebuild_project_stats(project_ids)
+    issue_ids = getattr(instance, '_commented_issue_ids', None)
+    if issue_ids:
+        refresh_comment_stats(issue_ids)
@@ -0,0 +1,217 @@
+"""
+Compteurs dénormalisés.
+
+Issue.comment_count et Issue.last_comment_time évitent un COUNT et un MAX par issue dans les
+listes. Ils sont écrits par des UPDATE ciblés, dans la transaction qui crée ou supprime le
+commentaire (project/signals.py), jamais par Issue.save().
+
+ProjectStats compte les issues de chaque projet par statut, priorité, tag et assigné (issues
+ouvertes). Chaque écriture d'une issue applique la différence entre ses anciens et ses nouveaux
+compteurs ; rebuild_project_stats recalcule tout en une requête groupée.
+"""
+from collections import Counter
+from functools import reduce
+from operator import or_
+from django.db import transaction
+from django.db.models import Case, CharField, Count, F, IntegerField, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce
+from .models import Issue, Comment, ProjectStats
+
+# Champs de l'issue qui déterminent ses compteurs
+ISSUE_STATS_FIELDS = ('project_id', 'status', 'priority', 'tag', 'assignee_id')
+
+
+def record_comment_created(comment):
+    """
+    Compte un commentaire créé dans son issue, en une requête.
+
+    Args:
+        comment (Comment): Commentaire créé.
+    """
+    Issue.objects.filter(pk=comment.issue_id).update(
+        comment_count=F('comment_count') + 1, last_comment_time=comment.created_time,
+    )
+
+
+def refresh_comment_stats(issue_ids):
+    """
+    Recalcule les compteurs de commentaires des issues désignées, en une requête.
+
+    Utilisé après une suppression (la date du dernier commentaire doit être recalculée) et
+    après une création par lots, qui n'envoie pas de signaux.
+
+    Args:
+        issue_ids (Iterable[int]): Identifiants des issues.
+    """
+    comments = Comment.objects.filter(issue=OuterRef('pk')).order_by().values('issue')
+    Issue.objects.filter(pk__in=issue_ids).update(
+        comment_count=Coalesce(Subquery(comments.annotate(count=Count('pk')).values('count')), 0),
+        last_comment_time=Subquery(comments.annotate(last=Max('created_time')).values('last')),
+    )
+
+
+def issue_stat_keys(values):
+    """
+    Renvoie les compteurs auxquels une issue contribue.
+
+    Args:
+        values (dict): Valeurs des champs ISSUE_STATS_FIELDS de l'issue.
+
+    Returns:
+        list: Clés (project_id, dimension, valeur) des compteurs.
+    """
+    project_id = values['project_id']
+    keys = [
+        (project_id, ProjectStats.STATUS, values['status']),
+        (project_id, ProjectStats.PRIORITY, values['priority']),
+        (project_id, ProjectStats.TAG, values['tag']),
+    ]
+    if values['status'] != ProjectStats.CLOSED_STATUS:
+        keys.append((project_id, ProjectStats.ASSIGNEE, str(values['assignee_id'] or '')))
+    return keys
+
+
+def issue_stat_values(issue):
+    """
+    Lit sur une instance les champs qui déterminent ses compteurs.
+
+    Args:
+        issue (Issue): Issue.
+
+    Returns:
+        dict: Valeurs des champs ISSUE_STATS_FIELDS.
+    """
+    return {field: getattr(issue, field) for field in ISSUE_STATS_FIELDS}
+
+
+def issue_stat_deltas(previous, current):
+    """
+    Calcule les différences de compteurs causées par l'écriture d'une issue.
+
+    Args:
+        previous (dict | None): Valeurs avant l'écriture (None pour une création).
+        current (dict | None): Valeurs après l'écriture (None pour une suppression).
+
+    Returns:
+        Counter: Différences indexées par clé (project_id, dimension, valeur).
+    """
+    deltas = Counter()
+    for key in issue_stat_keys(previous) if previous else ():
+        deltas[key] -= 1
+    for key in issue_stat_keys(current) if current else ():
+        deltas[key] += 1
+    return deltas
+
+
+def record_issue_changes(changes):
+    """
+    Met à jour les compteurs des projets après l'écriture d'une ou plusieurs issues.
+
+    Args:
+        changes (Iterable[tuple]): Couples (valeurs avant, valeurs après) ; voir issue_stat_deltas.
+    """
+    deltas = Counter()
+    for previous, current in changes:
+        deltas.update(issue_stat_deltas(previous, current))
+    apply_stat_deltas(deltas)
+
+
+def apply_stat_deltas(deltas):
+    """
+    Ajoute des différences aux compteurs, en deux requêtes au plus.
+
+    Les compteurs incrémentés sont d'abord créés à zéro s'ils n'existent pas (INSERT ignorant
+    les conflits, sans course entre deux créations), puis un seul UPDATE applique toutes les
+    différences.
+
+    Args:
+        deltas (Counter): Différences indexées par clé (project_id, dimension, valeur).
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    created = [
+        ProjectStats(project_id=project_id, dimension=dimension, key=value)
+        for (project_id, dimension, value), delta in deltas.items() if delta > 0
+    ]
+    if created:
+        ProjectStats.objects.bulk_create(created, ignore_conflicts=True)
+    conditions = {
+        key: Q(project_id=key[0], dimension=key[1], key=key[2]) for key in deltas
+    }
+    ProjectStats.objects.filter(reduce(or_, conditions.values())).update(count=F('count') + Case(
+        *(When(condition, then=Value(deltas[key])) for key, condition in conditions.items()),
+        default=Value(0), output_field=IntegerField(),
+    ))
+
+
+def grouped_issue_stats(issues):
+    """
+    Construit la requête groupée qui compte des issues selon toutes les dimensions.
+
+    Args:
+        issues (QuerySet): Issues à compter.
+
+    Returns:
+        QuerySet: Lignes {project_id, dimension, key, count}, réunies par UNION ALL.
+    """
+    issues = issues.order_by()
+    grouped = [
+        issues.values('project_id', dimension=Value(dimension), key=F(dimension)).annotate(count=Count('id'))
+        for dimension in (ProjectStats.STATUS, ProjectStats.PRIORITY, ProjectStats.TAG)
+    ]
+    open_issues = issues.exclude(status=ProjectStats.CLOSED_STATUS).values(
+        'project_id', dimension=Value(ProjectStats.ASSIGNEE),
+        key=Coalesce(Cast('assignee_id', CharField()), Value('')),
+    ).annotate(count=Count('id'))
+    return grouped[0].union(*grouped[1:], open_issues, all=True)
+
+
+def rebuild_project_stats(project_ids=None):
+    """
+    Recalcule les compteurs des projets à partir des issues, en une requête groupée.
+
+    Args:
+        project_ids (Iterable[int] | None): Projets à recalculer ; tous si None.
+
+    Returns:
+        int: Nombre de compteurs écrits.
+    """
+    issues = Issue.objects.all()
+    stats = ProjectStats.objects.all()
+    if project_ids is not None:
+        issues = issues.filter(project_id__in=project_ids)
+        stats = stats.filter(project_id__in=project_ids)
+    rows = [ProjectStats(**row) for row in grouped_issue_stats(issues)]
+    with transaction.atomic(savepoint=False):
+        stats.delete()
+        ProjectStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def get_project_stats(project_id):
+    """
+    Lit les compteurs d'un projet.
+
+    Les statuts, priorités et tags sans issue valent zéro ; les assignés sans issue ouverte
+    sont omis.
+
+    Args:
+        project_id (int): Identifiant du projet.
+
+    Returns:
+        dict: Compteurs par dimension ; `assignee` associe l'identifiant de l'assigné
+            (None pour les issues non assignées) au nombre d'issues ouvertes.
+    """
+    stats = {
+        ProjectStats.STATUS: dict.fromkeys([value for value, _ in Issue.STATUS_CHOICES], 0),
+        ProjectStats.PRIORITY: dict.fromkeys([value for value, _ in Issue.PRIORITY_CHOICES], 0),
+        ProjectStats.TAG: dict.fromkeys([value for value, _ in Issue.TAG_CHOICES], 0),
+        ProjectStats.ASSIGNEE: {},
+    }
+    rows = ProjectStats.objects.filter(project_id=project_id, count__gt=0).values_list('dimension', 'key', 'count')
+    for dimension, key, count in rows:
+        if dimension == ProjectStats.ASSIGNEE:
+            key = int(key) if key else None
+        stats[dimension][key] = count
+    return stats
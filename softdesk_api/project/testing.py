@@ -0,0 +1,170 @@
+"""
+Outils de test partagés pour l'API SoftDesk.
+
+Ce module fournit des mixins pour les TestCase : remise à zéro des caches entre les tests
+et vérification du nombre de requêtes SQL émises par un endpoint, afin de détecter les
+régressions N+1. router_routes() énumère les routes des routeurs DRF, dont les budgets
+sont déclarés par les ViewSets (attribut query_budgets). SoftDeskTestRunner (TEST_RUNNER)
+garde les lectures sur 'default' lorsque la base de lecture n'est qu'un miroir de test, et
+place les caches fichier dans un répertoire temporaire.
+"""
+import os
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, override_settings
+
+Route = namedtuple('Route', ['name', 'basename', 'viewset', 'method', 'action', 'detail'])
+
+
+def clear_caches():
+    """Vide les caches déjà initialisés."""
+    for cache in caches.all(initialized_only=True):
+        cache.clear()
+
+
+class SoftDeskTestRunner(DiscoverRunner):
+    """
+    Lanceur de tests : isole les caches fichier et désactive le routage vers un miroir de test.
+
+    Les caches fichier (dont l'index des appartenances) sont déplacés dans un répertoire
+    temporaire : les bases de test réutilisent les identifiants des bases de développement,
+    dont les entrées ne doivent pas être lues par les tests.
+
+    Un alias déclaré TEST['MIRROR'] (alias 'read' du profil 'production') lit la même base de
+    test que l'alias qu'il reflète : il n'est pas une réplique, et les TestCase n'y autorisent
+    pas les requêtes. Les tests d'une vraie réplique désignent la leur (SOFTDESK_READ_DATABASE).
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_directory = tempfile.TemporaryDirectory(prefix='softdesk-test-cache-')
+        self.overrides = [override_settings(CACHES={
+            alias: {**config, 'LOCATION': os.path.join(self.cache_directory.name, alias)}
+            if config['BACKEND'].endswith('FileBasedCache') else config
+            for alias, config in settings.CACHES.items()
+        })]
+        alias = getattr(settings, 'SOFTDESK_READ_DATABASE', None)
+        if alias in connections.settings and connections.settings[alias]['TEST'].get('MIRROR'):
+            self.overrides.append(override_settings(SOFTDESK_READ_DATABASE=None))
+        for override in self.overrides:
+            override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        for override in reversed(self.overrides):
+            override.disable()
+        self.cache_directory.cleanup()
+        super().teardown_test_environment(**kwargs)
+
+
+def router_routes(*routers):
+    """
+    Énumère les routes des routeurs DRF, une par couple (URL, méthode HTTP).
+
+    Args:
+        routers (SimpleRouter): Routeurs dont les ViewSets sont enregistrés.
+
+    Yields:
+        Route: Nom de l'URL, basename, ViewSet, méthode HTTP (minuscules), action et portée (détail ou liste).
+    """
+    for router in routers:
+        for _, viewset, basename in router.registry:
+            for route in router.get_routes(viewset):
+                for method, action in route.mapping.items():
+                    yield Route(route.name.format(basename=basename), basename, viewset, method, action, route.detail)
+
+
+class CacheResetMixin:
+    """
+    Mixin de TestCase qui vide les caches avant chaque test.
+
+    Les identifiants sont réutilisés d'un test à l'autre après le rollback de la base :
+    une entrée de cache laissée par un test précédent désignerait d'autres lignes.
+    """
+
+    def _pre_setup(self):
+        super()._pre_setup()
+        clear_caches()
+
+
+class QueryBudgetMixin:
+    """
+    Mixin de TestCase pour vérifier le budget de requêtes SQL d'un endpoint.
+
+    À combiner avec APITestCase : le client de test doit être authentifié au préalable.
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, budget, using=DEFAULT_DB_ALIAS):
+        """
+        Vérifie que le bloc exécute au plus `budget` requêtes SQL.
+
+        Args:
+            budget (int): Nombre maximal de requêtes autorisées.
+            using (str): Alias de la base de données observée.
+
+        Yields:
+            CaptureQueriesContext: Contexte contenant les requêtes capturées.
+        """
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        if len(context) > budget:
+            queries = '\n'.join(f"  {query['sql']}" for query in context.captured_queries)
+            self.fail(f"{len(context)} requêtes exécutées, budget de {budget} :\n{queries}")
+
+    def assertQueryBudget(self, url, budget, grow=None):
+        """
+        Vérifie qu'une page de l'endpoint coûte au plus `budget` requêtes, quelle que soit sa taille.
+
+        L'URL est appelée une première fois, puis, si `grow` est fourni, une seconde fois après
+        l'ajout de lignes : le budget doit être respecté dans les deux cas.
+
+        Args:
+            url (str): URL de l'endpoint à appeler en GET.
+            budget (int): Nombre maximal de requêtes autorisées par appel.
+            grow (callable): Fonction sans argument ajoutant des lignes à la page.
+
+        Returns:
+            list: Nombre de requêtes mesuré pour chaque appel.
+        """
+        counts = []
+        for step in range(2 if grow else 1):
+            if step:
+                grow()
+            with self.assertMaxQueries(budget) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            counts.append(len(context))
+        return counts
+
+    def count_queries(self, method, url, data=None, **extra):
+        """
+        Appelle l'URL à froid et compte ses requêtes SQL, sans conserver ses écritures.
+
+        Les caches sont vidés avant l'appel, et l'appel est exécuté dans une transaction
+        annulée ensuite : les routes d'un même test se mesurent indépendamment les unes des
+        autres. Le contenu d'une réponse en flux est consommé pendant la mesure.
+
+        Args:
+            method (str): Méthode HTTP, en minuscules.
+            url (str): URL à appeler.
+            data (dict | list): Corps JSON de la requête.
+            **extra: En-têtes et options transmis au client de test.
+
+        Returns:
+            tuple: Réponse et requêtes capturées (CaptureQueriesContext).
+        """
+        if method != 'get':
+            extra.setdefault('format', 'json')
+        with transaction.atomic():
+            clear_caches()
+            with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as context:
+                response = getattr(self.client, method)(url, data, **extra)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            transaction.set_rollback(True)
+        return response, context
@@ -1,15 +1,44 @@
-from django.test import TestCase
-from rest_framework.test import APITestCase
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APITestCase, APIRequestFactory, APITransactionTestCase
 from rest_framework import status
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import OperationalError, connection, connections
+from django.db.utils import ConnectionHandler
+from django.test import override_settings
+from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
 from authentication.models import CustomUser
 from project.models import Project, Contributor, Issue, Comment
+from project.testing import CacheResetMixin, QueryBudgetMixin, clear_caches, router_routes
+from project.seeding import seed_softdesk
+from project.urls import router as project_router
+from authentication.urls import router as user_router
+from project.permissions import check_contributor, get_membership
+from project.pagination import CursorOrPageNumberPagination
+from project.membership import MembershipIndex, membership_index
+from project.routing import replica_reads, routing_scope
 from datetime import date
+import copy
+import csv
+import io
+import re
+import json
+import os
+import tempfile
+import tracemalloc
 import uuid
+from itertools import groupby
+from unittest.mock import patch
+from django.core.management import CommandError, call_command
+from asgiref.sync import async_to_sync, sync_to_async
+from authentication.tokens import ClaimsRefreshToken
 
 # Create your tests here.
 
 
-class SoftDeskAPITestCase(APITestCase):
+class SoftDeskAPITestCase(CacheResetMixin, APITestCase):
     def setUp(self):
         # Créer des utilisateurs de test
         self.admin = CustomUser.objects.create_superuser(
@@ -228,7 +257,7 @@ class SoftDeskAPITestCase(APITestCase):
         # GET choices pour Project
         response = self.client.get('/api/choices/projects/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('type', response.data)
+        self.assertIn('type', response.json())
 
         # POST interdit
         response = self.client.post('/api/choices/projects/', {}, format='json')
@@ -237,9 +266,9 @@ class SoftDeskAPITestCase(APITestCase):
         # GET choices pour Issue
         response = self.client.get('/api/choices/issues/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('status', response.data)
-        self.assertIn('priority', response.data)
-        self.assertIn('tag', response.data)
+        self.assertIn('status', response.json())
+        self.assertIn('priority', response.json())
+        self.assertIn('tag', response.json())
 
     def test_pagination(self):
         """Test pagination pour les listes."""
@@ -264,3 +293,1577 @@ class SoftDeskAPITestCase(APITestCase):
         response = self.client.get('/api/projects/?page=2')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIsNotNone(response.data['previous'])
+
+
+@override_settings(SOFTDESK_RESPONSE_CACHE=None)
+class QueryPlanTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie que le coût en requêtes d'une page ne dépend pas de sa taille."""
+
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create(username=f'user{i}', email=f'user{i}@test.com')
+            for i in range(10)
+        ]
+        self.author = self.users[0]
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.author)
+        for user in self.users:
+            Contributor.objects.create(user=user, project=self.project)
+        self.issue = Issue.objects.create(
+            title='Issue', tag='BUG', project=self.project, author=self.author, assignee=self.author
+        )
+        Comment.objects.create(description='Commentaire', issue=self.issue, author=self.author)
+        self.client.force_authenticate(self.author)
+
+    def add_issues(self):
+        for user in self.users[1:]:
+            Issue.objects.create(title='Issue', tag='TASK', project=self.project, author=user, assignee=user)
+
+    def add_comments(self):
+        for user in self.users[1:]:
+            Comment.objects.create(description='Commentaire', issue=self.issue, author=user)
+
+    def add_projects(self):
+        for user in self.users[1:]:
+            project = Project.objects.create(name='Autre', description='', type='IOS', author=user)
+            Contributor.objects.create(user=self.author, project=project)
+
+    def test_project_list_query_budget(self):
+        self.assertQueryBudget('/api/projects/', 3, grow=self.add_projects)
+
+    def test_contributor_list_query_budget(self):
+        self.assertQueryBudget(f'/api/projects/{self.project.id}/contributors/', 4)
+
+    def test_issue_list_query_budget(self):
+        self.assertQueryBudget(f'/api/projects/{self.project.id}/issues/', 4, grow=self.add_issues)
+
+    def test_comment_list_query_budget(self):
+        url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+        self.assertQueryBudget(url, 4, grow=self.add_comments)
+
+
+class MembershipTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie la résolution de l'appartenance au projet, une seule fois par requête."""
+
+    def setUp(self):
+        self.author = CustomUser.objects.create(username='author')
+        self.contributor = CustomUser.objects.create(username='contributor')
+        self.outsider = CustomUser.objects.create(username='outsider')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.author)
+        Contributor.objects.create(user=self.author, project=self.project)
+        Contributor.objects.create(user=self.contributor, project=self.project)
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.author)
+
+    def make_request(self, user):
+        request = APIRequestFactory().get('/')
+        request.user = user
+        return request
+
+    def test_membership_is_memoized_on_request(self):
+        request = self.make_request(self.contributor)
+        with self.assertNumQueries(1):
+            first = get_membership(request, self.project.id)
+            second = get_membership(request, str(self.project.id))
+        self.assertIs(first, second)
+        self.assertTrue(first.is_contributor)
+        self.assertFalse(first.is_author)
+
+    def test_membership_resolves_author_and_missing_project(self):
+        membership = get_membership(self.make_request(self.author), self.project.id)
+        self.assertTrue(membership.is_author and membership.is_contributor)
+        membership = get_membership(self.make_request(self.outsider), self.project.id)
+        self.assertFalse(membership.is_author or membership.is_contributor)
+        self.assertFalse(get_membership(self.make_request(self.author), 0).is_contributor)
+        self.assertFalse(get_membership(self.make_request(self.author), 'abc').is_contributor)
+
+    def test_issue_detail_checks_membership_once(self):
+        self.client.force_authenticate(self.contributor)
+        with self.assertMaxQueries(3):
+            response = self.client.get(f'/api/projects/{self.project.id}/issues/{self.issue.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_comment_creation_checks_membership_once(self):
+        self.client.force_authenticate(self.contributor)
+        url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+        with self.assertMaxQueries(5):
+            response = self.client.post(url, {'description': 'Commentaire', 'issue': self.issue.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_outsider_is_denied(self):
+        self.client.force_authenticate(self.outsider)
+        response = self.client.get(f'/api/projects/{self.project.id}/issues/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(f'/api/projects/{self.project.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_only_project_author_manages_contributors(self):
+        url = f'/api/projects/{self.project.id}/contributors/'
+        self.client.force_authenticate(self.contributor)
+        response = self.client.post(url, {'user': self.outsider.id, 'project': self.project.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(self.author)
+        response = self.client.post(url, {'user': self.outsider.id, 'project': self.project.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_contributor_detail_requires_membership(self):
+        contributor_id = Contributor.objects.get(user=self.author, project=self.project).id
+        url = f'/api/projects/{self.project.id}/contributors/{contributor_id}/'
+        self.client.force_authenticate(self.contributor)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['id'], self.author.id)
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class MembershipIndexTestCase(CacheResetMixin, APITestCase):
+    """Vérifie l'index partagé des appartenances et son invalidation par signaux."""
+
+    def setUp(self):
+        self.author = CustomUser.objects.create(username='author')
+        self.user = CustomUser.objects.create(username='user')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.author)
+        Contributor.objects.create(user=self.author, project=self.project)
+        membership_index.reset_stats()
+
+    def test_second_lookup_is_a_cache_hit(self):
+        with self.assertNumQueries(1):
+            projects = membership_index.get(self.author.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(membership_index.get(self.author.pk), projects)
+        self.assertEqual(projects.contributed, {self.project.pk})
+        self.assertEqual(projects.authored, {self.project.pk})
+        self.assertEqual(membership_index.stats(), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_contributor_changes_invalidate_index(self):
+        self.assertFalse(check_contributor(self.user, self.project))
+        contributor = Contributor.objects.create(user=self.user, project=self.project)
+        self.assertTrue(check_contributor(self.user, self.project))
+        contributor.delete()
+        self.assertFalse(check_contributor(self.user, self.project))
+
+    def test_project_changes_invalidate_index(self):
+        self.assertEqual(membership_index.get(self.user.pk).authored, set())
+        self.project.author = self.user
+        self.project.save()
+        self.assertEqual(membership_index.get(self.user.pk).authored, {self.project.pk})
+        self.assertEqual(membership_index.get(self.author.pk).authored, set())
+        self.project.delete()
+        self.assertEqual(membership_index.get(self.user.pk), (set(), set()))
+        self.assertEqual(membership_index.get(self.author.pk), (set(), set()))
+
+    def test_list_uses_index(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/api/projects/').data['count'], 0)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.assertEqual(self.client.get('/api/projects/').data['count'], 1)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+            with self.settings(CACHES={'default': backend, 'membership': backend}):
+                self.assertTrue(check_contributor(self.author, self.project))
+                with self.assertNumQueries(0):
+                    self.assertTrue(check_contributor(self.author, self.project))
+                Contributor.objects.filter(user=self.author).delete()
+                self.assertFalse(check_contributor(self.author, self.project))
+
+    def test_removal_revokes_access_through_another_worker_cache(self):
+        contributor = Contributor.objects.create(user=self.user, project=self.project)
+        # Une seconde instance du cache, comme celle d'un autre worker ; LocMem ne serait pas partagé
+        other_worker = caches.create_connection(settings.SOFTDESK_MEMBERSHIP_CACHE)
+        self.assertNotIsInstance(other_worker, LocMemCache)
+        self.assertTrue(check_contributor(self.user, self.project))
+        with patch.object(MembershipIndex, 'cache', other_worker):
+            with self.assertNumQueries(0):
+                self.assertTrue(check_contributor(self.user, self.project))
+        contributor.delete()
+        with patch.object(MembershipIndex, 'cache', other_worker):
+            self.assertFalse(check_contributor(self.user, self.project))
+
+
+class CursorPaginationTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie la pagination par curseur des issues, commentaires et contributeurs."""
+
+    def setUp(self):
+        self.author = CustomUser.objects.create(username='author')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.author)
+        Contributor.objects.create(user=self.author, project=self.project)
+        Issue.objects.bulk_create(
+            Issue(title=f'Issue {i}', tag='BUG', project=self.project, author=self.author) for i in range(25)
+        )
+        self.issue = Issue.objects.order_by('id').first()
+        self.client.force_authenticate(self.author)
+
+    def collect_pages(self, url):
+        ids, pages = [], 0
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+            ids.extend(item['id'] for item in response.data['results'])
+            url, pages = response.data['next'], pages + 1
+        return ids, pages
+
+    def test_issue_cursor_pages_cover_every_issue_once(self):
+        ids, pages = self.collect_pages(f'/api/projects/{self.project.id}/issues/?pagination=cursor')
+        expected = list(Issue.objects.order_by('created_time', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_comment_and_contributor_cursor_pages(self):
+        Comment.objects.bulk_create(
+            Comment(description=f'Commentaire {i}', issue=self.issue, author=self.author) for i in range(12)
+        )
+        url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/?pagination=cursor'
+        ids, pages = self.collect_pages(url)
+        self.assertEqual(len(set(ids)), 12)
+        self.assertEqual(pages, 2)
+        ids, pages = self.collect_pages(f'/api/projects/{self.project.id}/contributors/?pagination=cursor')
+        self.assertEqual(pages, 1)
+
+    def test_page_number_remains_default(self):
+        response = self.client.get(f'/api/projects/{self.project.id}/issues/')
+        self.assertEqual(response.data['count'], 25)
+        self.assertIn('page=2', response.data['next'])
+
+
+@override_settings(SOFTDESK_RESPONSE_CACHE=None)
+class UrlScopeTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie que les issues et commentaires sont limités au projet et à l'issue de l'URL."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.project = self.create_project()
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.user)
+        Comment.objects.create(description='Commentaire', issue=self.issue, author=self.user)
+        self.client.force_authenticate(self.user)
+
+    def create_project(self):
+        project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=project)
+        return project
+
+    def add_unrelated_projects(self):
+        for _ in range(5):
+            project = self.create_project()
+            issue = Issue.objects.create(title='Autre', tag='TASK', project=project, author=self.user)
+            Comment.objects.create(description='Autre', issue=issue, author=self.user)
+
+    def test_issue_list_is_scoped_to_url_project(self):
+        url = f'/api/projects/{self.project.id}/issues/'
+        counts = self.assertQueryBudget(url, 4, grow=self.add_unrelated_projects)
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(self.client.get(url).data['count'], 1)
+
+    def test_comment_list_is_scoped_to_url_issue(self):
+        url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+        counts = self.assertQueryBudget(url, 4, grow=self.add_unrelated_projects)
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(self.client.get(url).data['count'], 1)
+
+    def test_issue_of_another_project_is_not_found(self):
+        other = self.create_project()
+        response = self.client.get(f'/api/projects/{other.id}/issues/{self.issue.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(f'/api/projects/{other.id}/issues/{self.issue.id}/comments/')
+        self.assertEqual(response.data['count'], 0)
+
+    def test_writes_cannot_leave_url_scope(self):
+        owner = CustomUser.objects.create(username='owner')
+        foreign = Project.objects.create(name='Étranger', description='', type='IOS', author=owner)
+        foreign_issue = Issue.objects.create(title='Étrangère', tag='BUG', project=foreign, author=owner)
+        mine = self.create_project()
+        issues_url = f'/api/projects/{self.project.id}/issues/'
+
+        response = self.client.post(issues_url, {'title': 'Intruse', 'tag': 'BUG', 'project': foreign.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('project', response.data)
+        response = self.client.post(f'{issues_url}{self.issue.id}/comments/',
+                                    {'description': 'Intrus', 'issue': foreign_issue.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('issue', response.data)
+        for project in (foreign, mine):
+            response = self.client.patch(f'{issues_url}{self.issue.id}/', {'project': project.id})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(foreign.issues.exclude(pk=foreign_issue.pk).exists())
+        self.assertFalse(foreign_issue.comments.exists())
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.project_id, self.project.id)
+
+        response = self.client.patch(f'{issues_url}{self.issue.id}/', {'project': self.project.id, 'title': 'Gardée'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class BulkEndpointTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie la création et la modification par lots des issues et des commentaires."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.other = CustomUser.objects.create(username='other')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        self.other_project = Project.objects.create(name='Autre', description='', type='IOS', author=self.user)
+        for user, project in ((self.user, self.project), (self.other, self.project), (self.user, self.other_project)):
+            Contributor.objects.create(user=user, project=project)
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.user)
+        self.url = f'/api/projects/{self.project.id}/issues/bulk/'
+        self.client.force_authenticate(self.user)
+
+    def issue_payload(self, count, project=None):
+        return [
+            {'title': f'Issue {i}', 'tag': 'TASK', 'priority': 'HIGH', 'project': project or self.project.id}
+            for i in range(count)
+        ]
+
+    def test_bulk_create_issues_in_constant_queries(self):
+        for count in (5, 50):
+            with self.assertMaxQueries(8):
+                response = self.client.post(self.url, self.issue_payload(count), format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(response.data), count)
+            self.assertEqual(response.data[0]['author']['id'], self.user.id)
+        self.assertEqual(Issue.objects.filter(project=self.project, author=self.user).count(), 56)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        payload = self.issue_payload(3)
+        payload[1]['tag'] = 'UNKNOWN'
+        payload[2]['project'] = self.other_project.id
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('tag', response.data[1])
+        self.assertIn('project', response.data[2])
+        self.assertEqual(Issue.objects.count(), 1)
+
+    def test_single_and_bulk_writes_share_url_scope(self):
+        payload = self.issue_payload(1, project=self.other_project.id)
+        single = self.client.post(f'/api/projects/{self.project.id}/issues/', payload[0], format='json')
+        bulk = self.client.post(self.url, payload, format='json')
+        self.assertEqual(single.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(bulk.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(single.data['project'], bulk.data[0]['project'])
+        self.assertFalse(Issue.objects.filter(project=self.other_project).exists())
+
+    def test_bulk_create_rejects_oversized_batch(self):
+        with self.settings(SOFTDESK_BULK_MAX_ITEMS=2):
+            response = self.client.post(self.url, self.issue_payload(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_requires_contributor(self):
+        self.client.force_authenticate(CustomUser.objects.create(username='outsider'))
+        response = self.client.post(self.url, self.issue_payload(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_update_issues(self):
+        foreign = Issue.objects.create(title='Autre', tag='BUG', project=self.project, author=self.other)
+        payload = [{'id': self.issue.id, 'status': 'FINISHED'}, {'id': foreign.id, 'status': 'FINISHED'}, {'id': 0}]
+        response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('id', response.data[1])
+        self.assertIn('id', response.data[2])
+
+        issues = Issue.objects.bulk_create(
+            Issue(title=f'Issue {i}', tag='BUG', project=self.project, author=self.user) for i in range(20)
+        )
+        payload = [{'id': issue.id, 'status': 'INPROGRESS', 'title': 'Modifiée'} for issue in issues]
+        with self.assertMaxQueries(8):
+            response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Issue.objects.filter(status='INPROGRESS', title='Modifiée').count(), 20)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.status, 'TODO')
+
+    def test_bulk_comments(self):
+        url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/bulk/'
+        payload = [{'description': f'Commentaire {i}', 'issue': self.issue.id} for i in range(10)]
+        response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        uuids = [item['uuid'] for item in response.data]
+        self.assertEqual(len(set(uuids)), 10)
+
+        payload = [{'uuid': value, 'description': 'Modifié'} for value in uuids] + [{'uuid': 'invalide'}]
+        response = self.client.patch(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('uuid', response.data[10])
+        response = self.client.patch(url, payload[:-1], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Comment.objects.filter(description='Modifié').count(), 10)
+
+
+class ProjectExportTestCase(CacheResetMixin, APITestCase):
+    """Vérifie l'export en flux des issues et commentaires d'un projet."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issue = Issue.objects.create(title='Issue, "1"', tag='BUG', project=self.project, author=self.user)
+        Issue.objects.create(title='Issue 2', tag='TASK', project=self.project, author=self.user, assignee=self.user)
+        self.comment = Comment.objects.create(description='Commentaire\nsur deux lignes', issue=self.issue,
+                                              author=self.user)
+        self.url = f'/api/projects/{self.project.id}/export/'
+        self.client.force_authenticate(self.user)
+
+    def add_issues(self, count):
+        Issue.objects.bulk_create(
+            (Issue(title=f'Issue {i}', description='x' * 200, tag='BUG', project=self.project, author=self.user)
+             for i in range(count)),
+            batch_size=5000,
+        )
+
+    def export_peak_memory(self):
+        tracemalloc.start()
+        try:
+            response = self.client.get(self.url)
+            lines = sum(chunk.count(b'\n') for chunk in response.streaming_content)
+            return lines, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['type'] for row in rows], ['issue', 'issue', 'comment'])
+        self.assertEqual(rows[0]['title'], 'Issue, "1"')
+        self.assertEqual(rows[2]['uuid'], str(self.comment.uuid))
+        self.assertEqual(rows[2]['issue_id'], self.issue.id)
+
+    def test_csv_export(self):
+        response = self.client.get(self.url, {'format': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('project-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['type'] for row in rows], ['issue', 'issue', 'comment'])
+        self.assertEqual(rows[0]['title'], 'Issue, "1"')
+        self.assertEqual(rows[2]['description'], 'Commentaire\nsur deux lignes')
+
+    def test_export_dates_match_api(self):
+        api_time = self.client.get(f'/api/projects/{self.project.id}/issues/{self.issue.id}/').data['created_time']
+        ndjson = json.loads(b''.join(self.client.get(self.url).streaming_content).decode().splitlines()[0])
+        response = self.client.get(self.url, {'format': 'csv'})
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertTrue(api_time.endswith('Z'))
+        self.assertEqual(ndjson['created_time'], api_time)
+        self.assertEqual(rows[0]['created_time'], api_time)
+
+    def test_csv_export_escapes_formulas(self):
+        titles = ['=1+1', '+1', '-1', '@SUM(A1)', '\tx', '\rx']
+        for title in titles:
+            Issue.objects.create(title=title, tag='BUG', project=self.project, author=self.user)
+        response = self.client.get(self.url, {'format': 'csv'})
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode(), newline='')))
+        self.assertEqual([row['title'] for row in rows if row['type'] == 'issue'][2:], [f"'{title}" for title in titles])
+        self.assertEqual(rows[0]['title'], 'Issue, "1"')
+        self.assertEqual(rows[0]['author_id'], str(self.user.id))
+
+    def test_export_requires_contributor(self):
+        self.client.force_authenticate(CustomUser.objects.create(username='outsider'))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(SOFTDESK_EXPORT_CHUNK_SIZE=500)
+    def test_export_memory_stays_flat(self):
+        """Mémoire de pointe identique pour N et 10 N issues (SOFTDESK_EXPORT_TEST_ISSUES, 500000 en local)."""
+        large = int(os.environ.get('SOFTDESK_EXPORT_TEST_ISSUES', 20000))
+        self.add_issues(large // 10)
+        small_lines, small_peak = self.export_peak_memory()
+        self.add_issues(large - large // 10)
+        large_lines, large_peak = self.export_peak_memory()
+        self.assertEqual(large_lines - small_lines, large - large // 10)
+        self.assertLess(large_peak, small_peak * 1.5 + 256 * 1024)
+
+
+class ConditionalGetTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie les GET conditionnels (ETag, Last-Modified) fondés sur la version du projet."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.other = CustomUser.objects.create(username='other')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        Contributor.objects.create(user=self.other, project=self.project)
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.user,
+                                          assignee=self.other)
+        self.comment = Comment.objects.create(description='Commentaire', issue=self.issue, author=self.user)
+        self.issues_url = f'/api/projects/{self.project.id}/issues/'
+        self.comments_url = f'{self.issues_url}{self.issue.id}/comments/'
+        self.client.force_authenticate(self.user)
+
+    def get_etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response['ETag']
+
+    def test_not_modified_without_serialization(self):
+        etag = self.get_etag(self.issues_url)
+        self.client.get(self.issues_url)  # Index d'appartenance chargé
+        with self.assertNumQueries(1):
+            response = self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_query_string(self):
+        self.assertNotEqual(self.get_etag(self.issues_url), self.get_etag(f'{self.issues_url}?pagination=cursor'))
+
+    def test_writes_change_etag(self):
+        writes = (
+            lambda: Issue.objects.create(title='Autre', tag='TASK', project=self.project, author=self.user),
+            lambda: self.issue.save(),
+            lambda: Comment.objects.create(description='Autre', issue=self.issue, author=self.user),
+            lambda: self.comment.delete(),
+            lambda: Contributor.objects.filter(user=self.other).get().delete(),
+            lambda: self.client.post(f'{self.issues_url}bulk/', [{'title': 'Lot', 'tag': 'BUG',
+                                                                 'project': self.project.id}], format='json'),
+            lambda: self.other.save(),
+        )
+        for write in writes:
+            etag = self.get_etag(self.comments_url)
+            write()
+            response = self.client.get(self.comments_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_moved_issue_changes_both_etags(self):
+        other_project = Project.objects.create(name='Autre', description='', type='IOS', author=self.user)
+        Contributor.objects.create(user=self.user, project=other_project)
+        other_url = f'/api/projects/{other_project.id}/issues/'
+        etags = self.get_etag(self.issues_url), self.get_etag(other_url)
+        self.issue.project = other_project
+        self.issue.save()
+        for url, etag in zip((self.issues_url, other_url), etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_other_project_writes_keep_etag(self):
+        etag = self.get_etag(self.issues_url)
+        other_project = Project.objects.create(name='Autre', description='', type='IOS', author=self.user)
+        Issue.objects.create(title='Autre', tag='TASK', project=other_project, author=self.user)
+        response = self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.issues_url)['Last-Modified']
+        response = self.client.get(self.issues_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.issues_url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_project_detail_and_permissions(self):
+        url = f'/api/projects/{self.project.id}/'
+        etag = self.get_etag(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn('ETag', self.client.get('/api/projects/'))
+        self.client.force_authenticate(CustomUser.objects.create(username='outsider'))
+        response = self.client.get(self.issues_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ResponseCacheTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie le cache des réponses des listes d'issues et de commentaires."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.user)
+        Comment.objects.create(description='Commentaire', issue=self.issue, author=self.user)
+        self.issues_url = f'/api/projects/{self.project.id}/issues/'
+        self.comments_url = f'{self.issues_url}{self.issue.id}/comments/'
+        self.client.force_authenticate(self.user)
+
+    def test_cached_list_skips_queries(self):
+        for url in (self.issues_url, self.comments_url):
+            first = self.client.get(url)
+            with self.assertNumQueries(1):
+                second = self.client.get(url)
+            self.assertEqual(second.status_code, status.HTTP_200_OK)
+            self.assertEqual(second.content, first.content)
+            self.assertEqual(second['ETag'], first['ETag'])
+            self.assertEqual(second['Content-Type'], first['Content-Type'])
+
+    def test_cached_list_keeps_headers(self):
+        Issue.objects.create(title='Autre', tag='TASK', project=self.project, author=self.user)
+        get_paginated_response = CursorOrPageNumberPagination.get_paginated_response
+
+        def with_link_header(paginator, data):
+            response = get_paginated_response(paginator, data)
+            response['Link'] = f'<{response.data["next"]}>; rel="next"'
+            return response
+
+        with patch.object(CursorOrPageNumberPagination, 'get_paginated_response', with_link_header):
+            for url, params in ((self.issues_url, {'page_size': 1}), (self.comments_url, {})):
+                miss = self.client.get(url, params)
+                with self.assertNumQueries(1):
+                    hit = self.client.get(url, params)
+                self.assertEqual(dict(hit.items()), dict(miss.items()))
+                self.assertIn('Link', hit)
+                self.assertIn('Allow', hit)
+                self.assertIn('Accept', hit['Vary'])
+
+    def test_key_includes_query_string(self):
+        Issue.objects.create(title='Autre', tag='TASK', project=self.project, author=self.user)
+        page = self.client.get(self.issues_url).json()
+        cursor = self.client.get(self.issues_url, {'pagination': 'cursor'}).json()
+        self.assertIn('count', page)
+        self.assertNotIn('count', cursor)
+
+    def test_writes_invalidate_cached_lists(self):
+        writes = (
+            lambda: Issue.objects.create(title='Autre', tag='TASK', project=self.project, author=self.user),
+            lambda: Comment.objects.create(description='Autre', issue=self.issue, author=self.user),
+            lambda: Contributor.objects.create(user=CustomUser.objects.create(username='new'), project=self.project),
+        )
+        urls = (self.issues_url, self.comments_url)
+        for write in writes:
+            for url in urls:
+                self.client.get(url)
+            write()
+            for url in urls:
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url)
+                self.assertGreater(len(context), 1)
+            self.assertEqual(self.client.get(self.issues_url).json()['count'], Issue.objects.count())
+            self.assertEqual(self.client.get(self.comments_url).json()['count'], Comment.objects.count())
+
+    def test_moved_issue_leaves_the_old_project_list(self):
+        Issue.objects.create(title='Déplacée', tag='TASK', project=self.project, author=self.user)
+        other_project = Project.objects.create(name='Autre', description='', type='IOS', author=self.user)
+        self.assertEqual(self.client.get(self.issues_url).json()['count'], 2)
+        self.issue.project = other_project
+        self.issue.save()
+        self.assertEqual(self.client.get(self.issues_url).json()['count'], 1)
+
+    def test_membership_checked_before_cache(self):
+        self.client.get(self.issues_url)
+        self.client.force_authenticate(CustomUser.objects.create(username='outsider'))
+        self.assertEqual(self.client.get(self.issues_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(SOFTDESK_RESPONSE_CACHE=None)
+    def test_cache_can_be_disabled(self):
+        self.client.get(self.issues_url)
+        with self.assertNumQueries(3):
+            self.client.get(self.issues_url)
+
+
+@override_settings(SOFTDESK_RESPONSE_CACHE=None)
+class IssueFilterTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie les filtres, les tris et la recherche plein texte de la liste des issues."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.other = CustomUser.objects.create(username='other')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issues = [
+            Issue.objects.create(title='Erreur de connexion', description='La page de login plante',
+                                 status='TODO', priority='HIGH', tag='BUG', project=self.project,
+                                 author=self.user, assignee=self.other),
+            Issue.objects.create(title='Export CSV', description='Ajouter une option de connexion SSO',
+                                 status='INPROGRESS', priority='LOW', tag='FEATURE', project=self.project,
+                                 author=self.user),
+            Issue.objects.create(title='Documentation', description='Décrire les élèves',
+                                 status='FINISHED', priority='MEDIUM', tag='TASK', project=self.project,
+                                 author=self.user, assignee=self.user),
+        ]
+        other_project = Project.objects.create(name='Autre', description='', type='IOS', author=self.user)
+        Issue.objects.create(title='Connexion', tag='BUG', project=other_project, author=self.user)
+        self.url = f'/api/projects/{self.project.id}/issues/'
+        self.client.force_authenticate(self.user)
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [issue['title'] for issue in response.data['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.titles(status='TODO'), ['Erreur de connexion'])
+        self.assertEqual(self.titles(status='TODO,FINISHED', tag='TASK'), ['Documentation'])
+        self.assertEqual(self.titles(priority='LOW'), ['Export CSV'])
+        self.assertEqual(self.titles(assignee=self.other.id), ['Erreur de connexion'])
+        self.assertEqual(self.titles(assignee='none'), ['Export CSV'])
+        self.assertEqual(self.titles(assignee=f'none,{self.user.id}'), ['Export CSV', 'Documentation'])
+
+    def test_invalid_filter_values(self):
+        for params in ({'status': 'DONE'}, {'assignee': 'abc'}, {'ordering': 'title'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering(self):
+        self.assertEqual(self.titles(ordering='priority'), ['Export CSV', 'Documentation', 'Erreur de connexion'])
+        self.assertEqual(self.titles(ordering='-priority'), ['Erreur de connexion', 'Documentation', 'Export CSV'])
+        self.assertEqual(self.titles(ordering='-created_time'), ['Documentation', 'Export CSV', 'Erreur de connexion'])
+
+    def test_search_is_ranked_and_scoped(self):
+        self.assertEqual(self.titles(search='connexion'), ['Erreur de connexion', 'Export CSV'])
+        self.assertEqual(self.titles(search='conn', status='INPROGRESS'), ['Export CSV'])
+        self.assertEqual(self.titles(search='ERREUR connex'), ['Erreur de connexion'])
+        self.assertEqual(self.titles(search='eleves'), ['Documentation'])
+        self.assertEqual(self.titles(search='" OR project_id:*'), [])
+        self.assertEqual(self.titles(search='...'), ['Erreur de connexion', 'Export CSV', 'Documentation'])
+
+    def test_search_index_follows_writes(self):
+        issue = self.issues[2]
+        issue.title = 'Migration'
+        issue.save()
+        self.assertEqual(self.titles(search='migration'), ['Migration'])
+        self.assertEqual(self.titles(search='documentation'), [])
+        self.client.delete(f'{self.url}{issue.id}/')
+        self.assertEqual(self.titles(search='migration'), [])
+
+    def test_search_fallback_without_fts(self):
+        with patch('project.search.fts_available', return_value=False):
+            self.assertEqual(self.titles(search='connexion'), ['Export CSV', 'Erreur de connexion'])
+            self.assertEqual(self.titles(search='erreur conn'), ['Erreur de connexion'])
+
+    def test_search_query_budget(self):
+        self.assertQueryBudget(f'{self.url}?search=connexion&status=TODO,INPROGRESS&ordering=-priority', 4)
+
+
+@override_settings(SOFTDESK_RESPONSE_CACHE=None)
+class CommentStatsTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie les compteurs de commentaires des issues et la recherche des commentaires d'un projet."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.user)
+        self.other_project = Project.objects.create(name='Autre', description='', type='IOS', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.other_project)
+        self.other_issue = Issue.objects.create(title='Autre', tag='BUG', project=self.other_project, author=self.user)
+        self.comments_url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+        self.client.force_authenticate(self.user)
+
+    def stats(self):
+        self.issue.refresh_from_db()
+        return self.issue.comment_count, self.issue.last_comment_time
+
+    def search(self, text, project=None):
+        project = project or self.project
+        response = self.client.get(f'/api/projects/{project.id}/comments/', {'search': text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [comment['description'] for comment in response.data['results']]
+
+    def test_counters_follow_create_and_delete(self):
+        self.assertEqual(self.stats(), (0, None))
+        first = self.client.post(self.comments_url, {'description': 'Un', 'issue': self.issue.id}, format='json')
+        second = self.client.post(self.comments_url, {'description': 'Deux', 'issue': self.issue.id}, format='json')
+        last = Comment.objects.get(uuid=second.data['uuid'])
+        self.assertEqual(self.stats(), (2, last.created_time))
+        response = self.client.get(f'/api/projects/{self.project.id}/issues/{self.issue.id}/')
+        self.assertEqual(response.data['comment_count'], 2)
+        self.client.delete(f"{self.comments_url}{second.data['uuid']}/")
+        first_comment = Comment.objects.get(uuid=first.data['uuid'])
+        self.assertEqual(self.stats(), (1, first_comment.created_time))
+        first_comment.delete()
+        self.assertEqual(self.stats(), (0, None))
+
+    def test_counters_follow_moved_comments(self):
+        comment = Comment.objects.create(description='Déplacé', issue=self.issue, author=self.user)
+        etag = self.client.get(self.comments_url)['ETag']
+        comment.issue = self.other_issue
+        comment.save()
+        self.assertEqual(self.stats(), (0, None))
+        self.other_issue.refresh_from_db()
+        self.assertEqual((self.other_issue.comment_count, self.other_issue.last_comment_time), (1, comment.created_time))
+        self.assertNotEqual(self.client.get(self.comments_url)['ETag'], etag)
+
+    def test_counters_follow_bulk_create(self):
+        response = self.client.post(f'{self.comments_url}bulk/', [
+            {'description': 'Un', 'issue': self.issue.id}, {'description': 'Deux', 'issue': self.issue.id},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(self.stats()[0], 2)
+
+    def test_counters_are_read_only_and_not_overwritten(self):
+        stale = Issue.objects.get(pk=self.issue.pk)
+        Comment.objects.create(description='Un', issue=self.issue, author=self.user)
+        stale.title = 'Renommée'
+        stale.save()
+        self.assertEqual(self.stats()[0], 1)
+        response = self.client.patch(f'/api/projects/{self.project.id}/issues/{self.issue.id}/',
+                                     {'comment_count': 10}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.stats()[0], 1)
+
+    def test_comment_search_is_scoped_to_project(self):
+        Comment.objects.create(description='Le serveur de connexion répond', issue=self.issue, author=self.user)
+        Comment.objects.create(description='Connexion, connexion, connexion', issue=self.issue, author=self.user)
+        Comment.objects.create(description='Rien à signaler', issue=self.issue, author=self.user)
+        Comment.objects.create(description='Connexion ailleurs', issue=self.other_issue, author=self.user)
+        self.assertEqual(self.search('connexion'), ['Connexion, connexion, connexion', 'Le serveur de connexion répond'])
+        self.assertEqual(self.search('serveur conn'), ['Le serveur de connexion répond'])
+        self.assertEqual(self.search('repond'), ['Le serveur de connexion répond'])
+        self.assertEqual(len(self.search('')), 3)
+        with patch('project.search.fts_available', return_value=False):
+            self.assertEqual(len(self.search('connexion')), 2)
+
+    def test_comment_search_follows_writes(self):
+        comment = Comment.objects.create(description='Connexion', issue=self.issue, author=self.user)
+        comment.description = 'Migration'
+        comment.save()
+        self.assertEqual(self.search('migration'), ['Migration'])
+        self.assertEqual(self.search('connexion'), [])
+        self.issue.project = self.other_project
+        self.issue.save()
+        self.assertEqual(self.search('migration'), [])
+        self.assertEqual(self.search('migration', self.other_project), ['Migration'])
+        self.issue.delete()
+        self.assertEqual(self.search('migration', self.other_project), [])
+
+    def test_comment_search_requires_contributor(self):
+        self.client.force_authenticate(CustomUser.objects.create(username='outsider'))
+        response = self.client.get(f'/api/projects/{self.project.id}/comments/', {'search': 'connexion'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ProjectStatsTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """Vérifie les statistiques incrémentales des projets et leur recalcul."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.other = CustomUser.objects.create(username='other')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        Contributor.objects.create(user=self.other, project=self.project)
+        self.issues = [
+            Issue.objects.create(title='Un', tag='BUG', priority='HIGH', project=self.project, author=self.user,
+                                 assignee=self.other),
+            Issue.objects.create(title='Deux', tag='BUG', project=self.project, author=self.user,
+                                 assignee=self.other),
+            Issue.objects.create(title='Trois', tag='TASK', status='FINISHED', project=self.project,
+                                 author=self.user, assignee=self.user),
+            Issue.objects.create(title='Quatre', tag='FEATURE', status='INPROGRESS', project=self.project,
+                                 author=self.user),
+        ]
+        self.url = f'/api/projects/{self.project.id}/stats/'
+        self.client.force_authenticate(self.user)
+
+    def stats(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def rebuilt_stats(self):
+        call_command('rebuild_project_stats', project=[self.project.id], stdout=io.StringIO())
+        return self.stats()
+
+    def test_stats(self):
+        data = self.stats()
+        self.assertEqual(data['issues'], 4)
+        self.assertEqual(data['status'], {'TODO': 2, 'INPROGRESS': 1, 'FINISHED': 1})
+        self.assertEqual(data['priority'], {'LOW': 3, 'MEDIUM': 0, 'HIGH': 1})
+        self.assertEqual(data['tag'], {'BUG': 2, 'FEATURE': 1, 'TASK': 1})
+        self.assertEqual(data['open_by_assignee'], [
+            {'assignee': {'id': self.other.id, 'username': 'other'}, 'count': 2},
+            {'assignee': None, 'count': 1},
+        ])
+        self.assertEqual(self.rebuilt_stats(), data)
+
+    def test_stats_follow_status_transitions(self):
+        before = self.stats()
+        response = self.client.patch(f'/api/projects/{self.project.id}/issues/{self.issues[0].id}/',
+                                     {'status': 'FINISHED'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = self.stats()
+        self.assertEqual(data['status'], {'TODO': 1, 'INPROGRESS': 1, 'FINISHED': 2})
+        self.assertEqual(data['open_by_assignee'][0]['count'], 1)
+        self.assertNotEqual(data, before)
+
+        issue = self.issues[2]
+        issue.status = 'TODO'
+        issue.save(update_fields=['status'])
+        self.issues[3].delete()
+        data = self.stats()
+        self.assertEqual(data['issues'], 3)
+        self.assertEqual(data['status'], {'TODO': 2, 'INPROGRESS': 0, 'FINISHED': 1})
+        self.assertEqual(data['open_by_assignee'], [
+            {'assignee': {'id': self.user.id, 'username': 'user'}, 'count': 1},
+            {'assignee': {'id': self.other.id, 'username': 'other'}, 'count': 1},
+        ])
+        self.assertEqual(self.rebuilt_stats(), data)
+
+    def test_stats_follow_project_moves_and_bulk_writes(self):
+        other_project = Project.objects.create(name='Autre', description='', type='IOS', author=self.user)
+        issue = self.issues[1]
+        issue.project = other_project
+        issue.save()
+        self.assertEqual(self.stats()['issues'], 3)
+        self.assertEqual(other_project.stats.get(dimension='status', key='TODO').count, 1)
+
+        bulk_url = f'/api/projects/{self.project.id}/issues/bulk/'
+        response = self.client.post(bulk_url, [{'title': 'Lot', 'tag': 'TASK', 'project': self.project.id}] * 3,
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.client.patch(bulk_url, [{'id': item['id'], 'priority': 'MEDIUM'} for item in response.data],
+                          format='json')
+        data = self.stats()
+        self.assertEqual(data['issues'], 6)
+        self.assertEqual(data['priority'], {'LOW': 2, 'MEDIUM': 3, 'HIGH': 1})
+        self.assertEqual(self.rebuilt_stats(), data)
+
+    def test_deleted_assignee_is_recounted(self):
+        self.other.delete()
+        self.assertEqual(self.stats()['open_by_assignee'], [{'assignee': None, 'count': 3}])
+
+    def test_deleted_author_content_is_recounted(self):
+        Issue.objects.create(title='Cinq', tag='BUG', project=self.project, author=self.other)
+        Comment.objects.create(description='Commentaire', issue=self.issues[0], author=self.other)
+        self.other.delete()
+        data = self.stats()
+        self.assertEqual(data['issues'], 4)
+        self.assertEqual(self.rebuilt_stats(), data)
+        self.issues[0].refresh_from_db()
+        self.assertEqual(self.issues[0].comment_count, 0)
+        self.assertIsNone(self.issues[0].last_comment_time)
+
+    def test_stats_query_budget_and_etag(self):
+        self.assertQueryBudget(self.url, 4)
+        response = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+    def test_stats_require_contributor(self):
+        self.client.force_authenticate(CustomUser.objects.create(username='outsider'))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(SOFTDESK_RESPONSE_CACHE=None)
+class AsyncReadViewTestCase(CacheResetMixin, APITestCase):
+    """Vérifie que les endpoints de lecture async renvoient les mêmes données que les ViewSets."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.outsider = CustomUser.objects.create(username='outsider')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issues = Issue.objects.bulk_create(
+            Issue(title=f'Issue {i}', tag='BUG', project=self.project, author=self.user) for i in range(12)
+        )
+        self.comment = Comment.objects.create(description='Commentaire', issue=self.issues[0], author=self.user)
+        self.client.force_authenticate(self.user)
+        self.headers = self.auth_headers(self.user)
+        self.outsider_headers = self.auth_headers(self.outsider)
+
+    def auth_headers(self, user):
+        return {'Authorization': f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'}
+
+    async def test_async_endpoints_match_sync_endpoints(self):
+        issue = self.issues[0]
+        paths = [
+            '/api/projects/',
+            f'/api/projects/{self.project.id}/',
+            f'/api/projects/{self.project.id}/issues/',
+            f'/api/projects/{self.project.id}/issues/?page=2',
+            f'/api/projects/{self.project.id}/issues/{issue.id}/',
+            f'/api/projects/{self.project.id}/issues/{issue.id}/comments/',
+            f'/api/projects/{self.project.id}/issues/{issue.id}/comments/{self.comment.uuid}/',
+        ]
+        for path in paths:
+            expected = await sync_to_async(self.client.get)(path)
+            response = await self.async_client.get(path.replace('/api/', '/api/async/', 1), headers=self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, path)
+            data = json.loads(response.content)
+            if 'next' in data:
+                for link in ('next', 'previous'):
+                    data[link] = data[link] and data[link].replace('/api/async/', '/api/', 1)
+            self.assertEqual(data, json.loads(expected.content), path)
+
+    async def test_async_endpoints_check_authentication_and_membership(self):
+        url = f'/api/async/projects/{self.project.id}/issues/'
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', response)
+        response = await self.async_client.get(url, headers={'Authorization': 'Bearer invalide'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get(url, headers=self.outsider_headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertIn('detail', json.loads(response.content))
+
+    async def test_async_endpoints_not_found(self):
+        other = await Project.objects.acreate(name='Autre', description='', type='IOS', author=self.user)
+        await Contributor.objects.acreate(user=self.user, project=other)
+        issue = self.issues[0]
+        for path in (
+            f'/api/async/projects/{other.id}/issues/{issue.id}/',
+            f'/api/async/projects/{other.id}/issues/{issue.id}/comments/',
+            f'/api/async/projects/{self.project.id}/issues/?page=3',
+            f'/api/async/projects/{self.project.id}/issues/{issue.id}/comments/{uuid.uuid4()}/',
+        ):
+            response = await self.async_client.get(path, headers=self.headers)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, path)
+
+    def test_async_list_query_count(self):
+        url = f'/api/async/projects/{self.project.id}/issues/'
+        self.client.get(url, headers=self.headers)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, headers=self.headers)
+        self.assertEqual(len(context), 2)  # COUNT et page ; l'appartenance est en cache
+
+
+class ChoicesTestCase(CacheResetMixin, APITestCase):
+    """Vérifie les réponses pré-rendues des choix."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.headers = {'Authorization': f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}'}
+
+    def test_combined_versioned_payload(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/choices/', headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['project'], {'type': ['BACKEND', 'FRONTEND', 'IOS', 'ANDROID']})
+        self.assertEqual(data['issue']['status'], ['TODO', 'INPROGRESS', 'FINISHED'])
+        self.assertTrue(data['version'])
+        self.assertIn('max-age=86400', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+        self.assertFalse(response['ETag'].startswith('W/'))
+
+    def test_etag_and_authentication(self):
+        for url in ('/api/choices/', '/api/choices/issues/', '/api/async/choices/projects/'):
+            response = self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            revalidated = self.client.get(url, headers={**self.headers, 'If-None-Match': response['ETag']})
+            self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            self.assertEqual(revalidated.content, b'')
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED, url)
+        self.assertEqual(self.client.get('/api/async/choices/', headers=self.headers).content,
+                         self.client.get('/api/choices/', headers=self.headers).content)
+
+
+class FastJSONTestCase(CacheResetMixin, APITestCase):
+    """Vérifie le renderer et le parser JSON rapides, avec et sans orjson."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.user)
+        self.comment = Comment.objects.create(description='Commentaire', issue=self.issue, author=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_renders_like_json_renderer(self):
+        from rest_framework.renderers import JSONRenderer
+        from project.renderers import FastJSONRenderer
+        from project.serializers import CommentSerializer
+        data = {
+            'comment': CommentSerializer(self.comment).data,
+            'uuid': self.comment.uuid,
+            'created_time': self.comment.created_time,
+            'day': date(2024, 1, 2),
+            1: 'clé entière',
+            'texte': 'é',
+        }
+        rendered = json.loads(FastJSONRenderer().render(data))
+        self.assertEqual(rendered['uuid'], str(self.comment.uuid))
+        self.assertEqual(rendered['created_time'], data['comment']['created_time'])
+        self.assertTrue(rendered['created_time'].endswith('Z'))
+        self.assertEqual(rendered['day'], '2024-01-02')
+        self.assertEqual(rendered['1'], 'clé entière')
+        del data['created_time']
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        with patch('project.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_orjson_and_fallback_render_identically(self):
+        from rest_framework.renderers import JSONRenderer
+        from project.renderers import FastJSONRenderer
+        data = {'texte': 'ligne\u2028paragraphe\u2029fin', 'assignee': None, 'rank': -1.5, 'ids': [1, 2.0]}
+        expected = JSONRenderer().render(data)
+        self.assertIn(b'\\u2028', expected)
+        self.assertEqual(FastJSONRenderer().render(data), expected)
+        with patch('project.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data), expected)
+        for value in (float('nan'), float('inf'), float('-inf')):
+            data = {'results': [{'rank': value}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(data)
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render(data)
+            with patch('project.renderers.orjson', None), self.assertRaises(ValueError):
+                FastJSONRenderer().render(data)
+
+    def test_api_round_trip(self):
+        url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+        response = self.client.post(url, '{"description": "Nouveau \\u00e9", "issue": %d}' % self.issue.id, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['description'], 'Nouveau é')
+        self.assertEqual(response.json()['uuid'], str(Comment.objects.get(description='Nouveau é').uuid))
+        response = self.client.post(url, '{"description": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', response.json()['detail'])
+        with patch('project.renderers.orjson', None), patch('project.parsers.orjson', None):
+            response = self.client.post(url, {'description': 'Sans orjson', 'issue': self.issue.id}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.json()['description'], 'Sans orjson')
+        indented = self.client.get(f'{url}{self.comment.uuid}/', HTTP_ACCEPT='application/json; indent=2')
+        self.assertIn(b'\n  "uuid"', indented.content)
+
+
+class ReadSerializerTestCase(CacheResetMixin, APITestCase):
+    """Vérifie que les sérialiseurs de lecture rendent les listes comme les ModelSerializer."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username='user', email='user@example.com', date_birth=date(1990, 5, 1))
+        self.other = CustomUser.objects.create(username='other', can_be_contacted=True)
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issues = [
+            Issue.objects.create(title='Issue 1', tag='BUG', project=self.project, author=self.user),
+            Issue.objects.create(title='Issue 2', tag='TASK', project=self.project, author=self.other,
+                                 assignee=self.user),
+        ]
+        for i in range(3):
+            Comment.objects.create(description=f'Commentaire {i}', issue=self.issues[0], author=self.user)
+        self.client.force_authenticate(self.user)
+
+    def render(self, data):
+        from project.renderers import FastJSONRenderer
+        return json.loads(FastJSONRenderer().render(data))
+
+    def test_parity_with_model_serializers(self):
+        from project.serializers import (
+            IssueSerializer, CommentSerializer, IssueReadSerializer, CommentReadSerializer,
+        )
+        for model, serializer_class, read_serializer_class in (
+            (Issue, IssueSerializer, IssueReadSerializer),
+            (Comment, CommentSerializer, CommentReadSerializer),
+        ):
+            queryset = model.objects.order_by('id')
+            expected = serializer_class(queryset, many=True).data
+            rows = read_serializer_class.rows(queryset)
+            self.assertEqual(self.render(read_serializer_class(rows, many=True).data), self.render(expected))
+            self.assertEqual(self.render(read_serializer_class(rows[0]).data), self.render(expected[0]))
+            with patch('project.renderers.orjson', None):
+                self.assertEqual(self.render(read_serializer_class(rows, many=True).data), self.render(expected))
+
+    def test_list_endpoints(self):
+        from project.serializers import IssueSerializer, CommentSerializer
+        issues_url = f'/api/projects/{self.project.id}/issues/'
+        comments_url = f'{issues_url}{self.issues[0].id}/comments/'
+        issues = self.render(IssueSerializer(Issue.objects.order_by('id'), many=True).data)
+        comments = self.render(CommentSerializer(Comment.objects.order_by('id'), many=True).data)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(issues_url)
+        self.assertEqual(response.json()['results'], issues)
+        # Appartenance, version du projet, COUNT(*) sans jointure, page avec ses utilisateurs
+        self.assertEqual(len(context), 4)
+        count_sql = next(query['sql'] for query in context if 'COUNT(*)' in query['sql'])
+        self.assertNotIn('JOIN', count_sql)
+        self.assertEqual(self.client.get(f'{issues_url}?assignee=none').json()['results'], issues[:1])
+        self.assertEqual(self.client.get(f'{comments_url}?pagination=cursor').json()['results'], comments)
+        headers = {'Authorization': f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}'}
+        response = self.client.get(f'/api/async{comments_url.removeprefix("/api")}', headers=headers)
+        self.assertEqual(response.json()['results'], comments)
+        response = self.client.get(f'/api/projects/{self.project.id}/comments/?search=commentaire')
+        self.assertCountEqual(response.json()['results'], comments)
+
+
+@override_settings(SOFTDESK_METRICS_TOKEN='secret')
+class MetricsTestCase(CacheResetMixin, APITestCase):
+    """Vérifie les mesures par route, leur exposition et la commande slowest_queries."""
+
+    def setUp(self):
+        from project.metrics import registry
+        self.registry = registry
+        self.registry.reset()
+        self.user = CustomUser.objects.create(username='user')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.user)
+        Contributor.objects.create(user=self.user, project=self.project)
+        self.issue = Issue.objects.create(title='Issue', tag='BUG', project=self.project, author=self.user)
+        self.headers = {'Authorization': f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}'}
+        self.metrics_headers = {'Authorization': 'Bearer secret'}
+
+    def histogram(self, text, name, route):
+        """Renvoie le nombre et la somme d'un histogramme de l'exposition Prometheus."""
+        labels = f'{{route="{route}",method="GET"}}'
+        lines = dict(line.rsplit(' ', 1) for line in text.splitlines() if not line.startswith('#'))
+        return int(lines[f'{name}_count{labels}']), float(lines[f'{name}_sum{labels}'])
+
+    def test_prometheus_exposition(self):
+        url = f'/api/projects/{self.project.id}/issues/'
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, headers=self.headers)
+        self.client.get(url, headers=self.headers)
+        self.client.get('/api/inconnu/')
+
+        response = self.client.get('/api/_metrics', headers=self.metrics_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        text = response.content.decode()
+        self.assertIn('softdesk_requests_total{route="issue-list",method="GET",status="200"} 2', text)
+        self.assertIn('softdesk_requests_total{route="unmatched",method="GET",status="404"} 1', text)
+        self.assertIn('softdesk_request_duration_seconds_bucket{route="issue-list",method="GET",le="+Inf"} 2', text)
+        count, queries = self.histogram(text, 'softdesk_request_db_queries', 'issue-list')
+        self.assertEqual(count, 2)
+        self.assertGreaterEqual(queries, len(context))
+        for name in ('db_duration', 'serializer_duration', 'permission_duration', 'duration'):
+            self.assertGreater(self.histogram(text, f'softdesk_request_{name}_seconds', 'issue-list')[1], 0, name)
+
+    def test_drf_is_not_patched(self):
+        from rest_framework.serializers import BaseSerializer
+        from rest_framework.views import APIView
+        self.assertEqual(APIView.check_permissions.__module__, 'rest_framework.views')
+        self.assertEqual(BaseSerializer.data.fget.__module__, 'rest_framework.serializers')
+
+        for url in ('/api/projects/', f'/api/projects/{self.project.id}/contributors/'):
+            self.client.get(url, headers=self.headers)
+        text = self.registry.render_prometheus()
+        for route in ('project-list', 'contributor-list'):
+            for name in ('serializer_duration', 'permission_duration'):
+                self.assertGreater(self.histogram(text, f'softdesk_request_{name}_seconds', route)[1], 0, route)
+
+    async def test_async_views_are_measured(self):
+        url = f'/api/async/projects/{self.project.id}/issues/{self.issue.id}/'
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        text = self.registry.render_prometheus()
+        count, queries = self.histogram(text, 'softdesk_request_db_queries', 'async-issue-detail')
+        # Index des appartenances (vide au premier appel), puis l'issue
+        self.assertEqual((count, queries), (1, 2))
+        for name in ('db_duration', 'serializer_duration', 'permission_duration'):
+            self.assertGreater(self.histogram(text, f'softdesk_request_{name}_seconds', 'async-issue-detail')[1], 0)
+
+    def test_access_requires_token(self):
+        for url in ('/api/_metrics', '/api/_metrics/queries'):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+            self.assertEqual(self.client.get(url, headers=self.headers).status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(SOFTDESK_METRICS_TOKEN=None, DEBUG=True):
+            self.assertEqual(self.client.get('/api/_metrics').status_code, status.HTTP_200_OK)
+
+    def test_query_shapes(self):
+        from project.metrics import query_shape
+        self.assertEqual(query_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)'), 'SELECT * FROM t WHERE id IN (%s, ...)')
+        self.assertEqual(query_shape('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)'),
+                         'INSERT INTO t (a, b) VALUES (%s, ...), ...')
+
+        for _ in range(3):
+            self.client.get(f'/api/projects/{self.project.id}/issues/', headers=self.headers)
+        response = self.client.get('/api/_metrics/queries?limit=2&sort=count', headers=self.metrics_headers)
+        queries = response.json()['queries']
+        self.assertEqual(len(queries), 2)
+        self.assertGreaterEqual(queries[0]['count'], queries[1]['count'])
+        self.assertEqual(queries[0]['count'], 3)  # Version du projet, lue à chaque requête
+
+        class FakeResponse(io.BytesIO):
+            def __enter__(self):
+                return self
+
+        def fake_urlopen(request, timeout):
+            self.assertEqual(request.get_header('Authorization'), 'Bearer secret')
+            path = request.full_url.removeprefix('http://127.0.0.1:8000')
+            return FakeResponse(self.client.get(path, headers=self.metrics_headers).content)
+
+        out = io.StringIO()
+        with patch('project.management.commands.slowest_queries.urlopen', fake_urlopen):
+            call_command('slowest_queries', limit=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('SELECT', lines[1])
+
+
+class SeedCommandTestCase(TestCase):
+    """Vérifie les options de la commande seed_softdesk."""
+
+    def test_invalid_options_are_named(self):
+        cases = {'users': 0, 'projects': -1, 'contributors': 0, 'issues': -1, 'comments': -1, 'batch_size': 0}
+        for option, value in cases.items():
+            with self.subTest(option=option), self.assertRaisesMessage(CommandError, option.replace('_', '-')):
+                call_command('seed_softdesk', **{option: value}, stdout=io.StringIO())
+        self.assertFalse(CustomUser.objects.exists())
+
+    def test_users_without_projects(self):
+        call_command('seed_softdesk', users=3, projects=0, stdout=io.StringIO())
+        self.assertEqual(CustomUser.objects.count(), 3)
+        self.assertFalse(Project.objects.exists())
+
+
+class RouteQueryBudgetTestCase(CacheResetMixin, QueryBudgetMixin, APITestCase):
+    """
+    Vérifie le budget de requêtes SQL de chaque route des DefaultRouter, déclaré par son ViewSet.
+
+    Chaque route est appelée à froid (caches vides) sur deux jeux de données générés par
+    seed_softdesk : dans le petit, les pages sont incomplètes et les lots ne comptent que deux
+    éléments ; dans le grand, les pages sont pleines et les lots en comptent dix. Le nombre de
+    requêtes doit respecter le budget de l'action (`query_budgets` du ViewSet) et ne pas
+    dépendre de la taille des pages ni des lots.
+    """
+    datasets = {
+        'small': {'volumes': dict(users=6, projects=2, contributors=3, issues=3, comments=1), 'batch': 2},
+        'large': {'volumes': dict(users=30, projects=2, contributors=25, issues=30, comments=8), 'batch': 10},
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixtures = {name: cls.seed(name, **dataset) for name, dataset in cls.datasets.items()}
+
+    @classmethod
+    def seed(cls, prefix, volumes, batch):
+        """
+        Génère un jeu de données et choisit les objets désignés par les URL.
+
+        L'utilisateur connecté, `<préfixe>-user0`, est l'auteur du premier projet ; il devient
+        aussi l'auteur de ses issues et de ses commentaires, qu'il peut ainsi tous modifier. Dans
+        les deux jeux, il contribue au second projet avec une issue et un commentaire : la
+        suppression de son compte touche les mêmes tables.
+        """
+        seed_softdesk(prefix=prefix, **volumes)
+        user = CustomUser.objects.get(username=f'{prefix}-user0')
+        project, other = Project.objects.filter(author__username__startswith=f'{prefix}-').order_by('id')[:2]
+        Issue.objects.filter(project=project).update(author=user)
+        Comment.objects.filter(issue__project=project).update(author=user)
+        Contributor.objects.get_or_create(user=user, project=other)
+        first, second = Issue.objects.filter(project=other).order_by('id')[:2]
+        Issue.objects.filter(pk=first.pk).update(author=user)
+        Issue.objects.filter(pk=second.pk).update(author=other.author)
+        Comment.objects.create(description='Commentaire', issue=second, author=user)
+        issue = Issue.objects.filter(project=project).order_by('-comment_count', 'id').first()
+        members = Contributor.objects.filter(project=project)
+        return {
+            'prefix': prefix,
+            'batch': batch,
+            'user': user.id,
+            'token': str(ClaimsRefreshToken.for_user(user).access_token),
+            'project': project.id,
+            'issue': issue.id,
+            'issues': list(Issue.objects.filter(project=project).order_by('id').values_list('id', flat=True)[:batch]),
+            'comment': str(Comment.objects.filter(issue=issue).order_by('id').values_list('uuid', flat=True)[0]),
+            'comments': [str(uuid) for uuid in Comment.objects.filter(issue=issue).order_by('id')
+                         .values_list('uuid', flat=True)[:batch]],
+            'contributor': members.exclude(user=user).order_by('id').first().id,
+            'member': members.exclude(user=user).order_by('id').values_list('user', flat=True).first(),
+            'outsider': CustomUser.objects.filter(username__startswith=f'{prefix}-')
+            .exclude(contributions__project=project).values_list('id', flat=True).first(),
+        }
+
+    def url(self, route, fixture):
+        scope = {
+            'project': {},
+            'contributor': {'project_id': fixture['project']},
+            'issue': {'project_id': fixture['project']},
+            'comment': {'project_id': fixture['project'], 'issue_id': fixture['issue']},
+            'customuser': {},
+        }[route.basename]
+        if route.detail:
+            scope.update({
+                'project': {'pk': fixture['project']},
+                'contributor': {'pk': fixture['contributor']},
+                'issue': {'pk': fixture['issue']},
+                'comment': {'uuid': fixture['comment']},
+                'customuser': {'pk': fixture['user']},
+            }[route.basename])
+        return reverse(route.name, kwargs=scope)
+
+    def payload(self, route, fixture):
+        """Corps de la requête d'écriture de la route, pour le jeu de données."""
+        prefix, batch = fixture['prefix'], fixture['batch']
+        project = {'name': 'Projet', 'description': 'Budget', 'type': 'BACKEND'}
+        issue = {'title': 'Issue', 'tag': 'BUG', 'priority': 'HIGH', 'project': fixture['project']}
+        comment = {'description': 'Commentaire', 'issue': fixture['issue']}
+        user = {
+            'username': f'{prefix}-nouveau', 'email': f'{prefix}-nouveau@example.com', 'password': 'budget-pass-123',
+            'date_birth': '1990-01-01', 'can_be_contacted': True, 'can_data_be_shared': False,
+        }
+        payloads = {
+            ('project', 'create'): project,
+            ('project', 'update'): project,
+            ('project', 'partial_update'): {'name': 'Renommé'},
+            ('contributor', 'create'): {'user': fixture['outsider'], 'project': fixture['project']},
+            ('contributor', 'update'): {'user': fixture['member'], 'project': fixture['project']},
+            ('contributor', 'partial_update'): {'user': fixture['member']},
+            ('issue', 'create'): issue,
+            ('issue', 'update'): issue,
+            ('issue', 'partial_update'): {'status': 'INPROGRESS'},
+            ('comment', 'create'): comment,
+            ('comment', 'update'): comment,
+            ('comment', 'partial_update'): {'description': 'Modifié'},
+            ('customuser', 'create'): user,
+            ('customuser', 'update'): {**user, 'username': f'{prefix}-user0'},
+            ('customuser', 'partial_update'): {'can_be_contacted': False},
+        }
+        if route.action == 'bulk' and route.method == 'post':
+            return [issue if route.basename == 'issue' else comment] * batch
+        if route.action == 'bulk':
+            if route.basename == 'issue':
+                return [{'id': issue_id, 'status': 'FINISHED'} for issue_id in fixture['issues']]
+            return [{'uuid': uuid, 'description': 'Modifié'} for uuid in fixture['comments']]
+        return payloads.get((route.basename, route.action))
+
+    def query_count(self, route, context):
+        """
+        Nombre de requêtes comparé d'un jeu de données à l'autre.
+
+        Django supprime les objets en cascade par DELETE de 100 lignes au plus : pour une
+        suppression, des DELETE consécutifs sur une même table ne comptent que pour un.
+        """
+        if route.action != 'destroy':
+            return len(context)
+        statements = (re.sub(r' IN \([^)]*\)', ' IN (...)', query['sql']) for query in context.captured_queries)
+        return sum(1 for _ in groupby(statements))
+
+    def test_every_route_meets_its_query_budget(self):
+        for route in router_routes(project_router, user_router):
+            with self.subTest(route=route.name, method=route.method):
+                budget = getattr(route.viewset, 'query_budgets', {}).get(route.action)
+                self.assertIsNotNone(budget, f"{route.viewset.__name__}.query_budgets n'a pas de budget "
+                                             f"pour l'action {route.action}")
+                counts = {}
+                for name, fixture in self.fixtures.items():
+                    response, context = self.count_queries(
+                        route.method, self.url(route, fixture), self.payload(route, fixture),
+                        headers={'Authorization': f"Bearer {fixture['token']}"},
+                    )
+                    self.assertLess(response.status_code, 400, getattr(response, 'data', None))
+                    counts[name] = self.query_count(route, context)
+                    queries = '\n'.join(f"  {query['sql']}" for query in context.captured_queries)
+                    self.assertLessEqual(len(context), budget, f"{name} : budget de {budget} :\n{queries}")
+                self.assertEqual(counts['small'], counts['large'], 'le nombre de requêtes dépend des données')
+
+
+class DatabaseProfileTestCase(SimpleTestCase):
+    """Vérifie le profil de base de données 'production' sur un fichier SQLite temporaire."""
+    # Les connexions du test ouvrent leur propre fichier, hors des bases de test
+    databases = '__all__'
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        databases = copy.deepcopy(settings.DATABASE_PROFILES['production'])
+        for database in databases.values():
+            database['NAME'] = os.path.join(directory.name, 'profile.sqlite3')
+        self.connections = ConnectionHandler(databases)
+        self.addCleanup(self.connections.close_all)
+
+    def pragma(self, alias, name):
+        with self.connections[alias].cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_set_on_connect(self):
+        self.assertEqual(self.pragma('default', 'journal_mode'), 'wal')
+        self.assertEqual(self.connections['default'].transaction_mode, 'IMMEDIATE')
+        for alias in ('default', 'read'):
+            self.assertEqual(self.pragma(alias, 'synchronous'), 1)  # NORMAL
+            for name in ('busy_timeout', 'mmap_size', 'cache_size'):
+                self.assertEqual(self.pragma(alias, name), settings.SOFTDESK_SQLITE_PRAGMAS[name])
+        self.assertEqual(self.pragma('read', 'journal_mode'), 'wal')
+        self.assertTrue(self.connections['default'].settings_dict['CONN_HEALTH_CHECKS'])
+        self.assertGreater(self.connections['default'].settings_dict['CONN_MAX_AGE'], 0)
+
+    def test_read_alias_is_read_only(self):
+        with self.connections['default'].cursor() as cursor:
+            cursor.execute('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+            cursor.execute('INSERT INTO item VALUES (1)')
+        with self.connections['read'].cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM item')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            with self.assertRaisesMessage(OperationalError, 'readonly'):
+                cursor.execute('INSERT INTO item VALUES (2)')
+
+
+@override_settings(SOFTDESK_READ_DATABASE='replica')
+class ReadReplicaTestCase(APITransactionTestCase):
+    """
+    Vérifie le routage des lectures vers une réplique.
+
+    La réplique est un second fichier SQLite : une copie de la base de test prise avant les
+    dernières écritures du test, qui joue une réplique en retard sur la base principale.
+    """
+    # L'alias 'replica' n'existe qu'à partir de setUpClass : il doit être déclaré avant super()
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.replica_path = os.path.join(cls.directory.name, 'replica.sqlite3')
+        databases = {
+            'default': connections['default'].settings_dict,
+            'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': cls.replica_path},
+        }
+        connections.settings['replica'] = connections.configure_settings(databases)['replica']
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        cls.directory.cleanup()
+
+    def setUp(self):
+        clear_caches()
+        self.author = CustomUser.objects.create(username='author')
+        self.reader = CustomUser.objects.create(username='reader')
+        self.project = Project.objects.create(name='Projet', description='', type='BACKEND', author=self.author)
+        Contributor.objects.create(user=self.author, project=self.project)
+        self.issue = Issue.objects.create(title='Répliquée', tag='BUG', project=self.project, author=self.author)
+
+        connections['replica'].close()
+        if os.path.exists(self.replica_path):
+            os.remove(self.replica_path)
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM INTO %s', [self.replica_path])
+
+        # Écritures que la réplique n'a pas encore reçues
+        self.recent = Issue.objects.create(title='Récente', tag='TASK', project=self.project, author=self.author)
+        Contributor.objects.create(user=self.reader, project=self.project)
+        self.url = f'/api/projects/{self.project.id}/issues/'
+
+    def test_list_and_retrieve_read_the_replica(self):
+        self.client.force_authenticate(self.author)
+        response = self.client.get(self.url)
+        self.assertEqual([issue['title'] for issue in response.data['results']], ['Répliquée'])
+        self.assertEqual(self.client.get(f'{self.url}{self.issue.id}/').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(f'{self.url}{self.recent.id}/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_writes_and_other_actions_use_the_primary(self):
+        self.client.force_authenticate(self.author)
+        response = self.client.patch(f'{self.url}{self.recent.id}/', {'status': 'INPROGRESS'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(f'/api/projects/{self.project.id}/stats/').data['issues'], 2)
+
+    def test_permission_lookups(self):
+        self.client.force_authenticate(self.reader)
+        # L'index des appartenances est alimenté par la base principale, qui connaît le contributeur
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        Contributor.objects.filter(user=self.reader).delete()
+        response = self.client.post(self.url, {'title': 'Nouvelle', 'tag': 'BUG', 'project': self.project.id},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_membership_index_is_filled_under_replica_routing(self):
+        membership_index.reset_stats()
+        self.client.force_authenticate(self.author)
+        with CaptureQueriesContext(connections['replica']) as replica, CaptureQueriesContext(connection) as primary:
+            for _ in range(3):
+                self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.assertEqual(membership_index.stats(), {'hits': 2, 'misses': 1, 'hit_ratio': 2 / 3})
+        self.assertEqual(sum('UNION ALL' in query['sql'] for query in primary), 1)
+        self.assertFalse(any('UNION ALL' in query['sql'] for query in replica))
+
+    def test_membership_miss_reads_the_primary(self):
+        with routing_scope(), replica_reads():
+            self.assertEqual(Contributor.objects.filter(user=self.reader).count(), 0)
+            with CaptureQueriesContext(connections['replica']) as replica, CaptureQueriesContext(connection) as primary:
+                self.assertEqual(membership_index.get(self.reader.pk).contributed, {self.project.pk})
+                clear_caches()
+                projects = async_to_sync(membership_index.aget)(self.reader.pk)
+        self.assertEqual(projects.contributed, {self.project.pk})
+        self.assertEqual(sum('UNION ALL' in query['sql'] for query in primary), 2)
+        self.assertEqual(len(replica), 0)
+
+    def test_reads_after_a_write_stick_to_the_primary(self):
+        with routing_scope(), replica_reads():
+            self.assertEqual(Issue.objects.count(), 1)
+            Issue.objects.create(title='Écrite', tag='BUG', project=self.project, author=self.author)
+            self.assertEqual(Issue.objects.count(), 3)
+        with routing_scope(), replica_reads():
+            self.assertEqual(Issue.objects.count(), 1)
+        self.assertEqual(Issue.objects.count(), 3)
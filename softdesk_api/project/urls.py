@@ -1,16 +1,22 @@
-from django.urls import path
+from django.urls import include, path
 from rest_framework.routers import DefaultRouter
-from .views import ProjectViewSet, ContributorViewSet, IssueViewSet, CommentViewSet, ProjectChoicesView, IssueChoicesView
+from .views import ProjectViewSet, ContributorViewSet, IssueViewSet, CommentViewSet
+from .choices import ALL_CHOICES, ISSUE_CHOICES, PROJECT_CHOICES, AsyncChoicesView, ChoicesView
+from .metrics import MetricsView, QueryShapesView
+from . import async_views
 
 """
 Configuration des routes pour l'API SoftDesk.
 
 Ce module utilise DefaultRouter pour enregistrer les ViewSets des modèles
 Project, Contributor, Issue et Comment, et définit des chemins supplémentaires
-pour les vues de choix de projets et d'issues.
+pour les vues de choix (réponses pré-rendues, project/choices.py). Les versions
+asynchrones des endpoints de lecture (project/async_views.py) sont servies sous
+le préfixe async/. Les mesures du processus (project/metrics.py) sont exposées sous _metrics.
 
 Attributes:
     router (DefaultRouter): Routeur pour générer les URL des ViewSets.
+    async_urlpatterns (list): Endpoints de lecture asynchrones.
     urlpatterns (list): Liste des URL combinant les routes du routeur et les chemins personnalisés.
 """
 router = DefaultRouter()
@@ -19,7 +25,26 @@ router.register(r'projects/(?P<project_id>\d+)/contributors', ContributorViewSet
 router.register(r'projects/(?P<project_id>\d+)/issues', IssueViewSet, basename='issue')
 router.register(r'projects/(?P<project_id>\d+)/issues/(?P<issue_id>\d+)/comments', CommentViewSet, basename='comment')
 
+async_urlpatterns = [
+    path('projects/', async_views.ProjectListView.as_view(), name='async-project-list'),
+    path('projects/<int:project_id>/', async_views.ProjectDetailView.as_view(), name='async-project-detail'),
+    path('projects/<int:project_id>/issues/', async_views.IssueListView.as_view(), name='async-issue-list'),
+    path('projects/<int:project_id>/issues/<int:issue_id>/', async_views.IssueDetailView.as_view(),
+         name='async-issue-detail'),
+    path('projects/<int:project_id>/issues/<int:issue_id>/comments/', async_views.CommentListView.as_view(),
+         name='async-comment-list'),
+    path('projects/<int:project_id>/issues/<int:issue_id>/comments/<uuid:uuid>/',
+         async_views.CommentDetailView.as_view(), name='async-comment-detail'),
+    path('choices/', AsyncChoicesView.as_view(payload=ALL_CHOICES), name='async-choices'),
+    path('choices/projects/', AsyncChoicesView.as_view(payload=PROJECT_CHOICES), name='async-project-choices'),
+    path('choices/issues/', AsyncChoicesView.as_view(payload=ISSUE_CHOICES), name='async-issue-choices'),
+]
+
 urlpatterns = router.urls + [
-    path('choices/projects/', ProjectChoicesView.as_view(), name='project-choices'),
-    path('choices/issues/', IssueChoicesView.as_view(), name='issue-choices'),
+    path('async/', include(async_urlpatterns)),
+    path('choices/', ChoicesView.as_view(payload=ALL_CHOICES), name='choices'),
+    path('choices/projects/', ChoicesView.as_view(payload=PROJECT_CHOICES), name='project-choices'),
+    path('choices/issues/', ChoicesView.as_view(payload=ISSUE_CHOICES), name='issue-choices'),
+    path('_metrics', MetricsView.as_view(), name='metrics'),
+    path('_metrics/queries', QueryShapesView.as_view(), name='metrics-queries'),
 ]
@@ -0,0 +1,61 @@
+"""
+Version des projets, utilisée pour les requêtes conditionnelles (ETag, Last-Modified).
+
+Chaque écriture sur un projet ou sur son contenu (contributeurs, issues, commentaires)
+incrémente Project.version et met à jour Project.updated_time. Les signaux (project/signals.py)
+et les traitements par lots appellent bump_project_version.
+"""
+from functools import reduce
+from operator import or_
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+from .models import Project, Contributor, Issue, Comment
+
+
+def bump_project_version(project_id=None, **filters):
+    """
+    Incrémente la version des projets désignés, en une requête.
+
+    Args:
+        project_id (int): Identifiant du projet.
+        **filters: Filtres désignant les projets lorsque l'identifiant n'est pas connu
+            (par exemple issues__id=...).
+    """
+    if project_id is not None:
+        filters['pk'] = project_id
+    Project.objects.filter(**filters).update(version=F('version') + 1, updated_time=timezone.now())
+
+
+def bump_user_projects_version(user_id):
+    """
+    Incrémente la version des projets où figurent les données d'un utilisateur.
+
+    Les représentations des projets, issues et commentaires imbriquent l'auteur et l'assigné :
+    une modification de l'utilisateur doit invalider leurs ETag.
+
+    Args:
+        user_id (int): Identifiant de l'utilisateur modifié.
+    """
+    conditions = (
+        Q(author_id=user_id),
+        Q(Exists(Contributor.objects.filter(project=OuterRef('pk'), user_id=user_id))),
+        Q(Exists(Issue.objects.filter(Q(author_id=user_id) | Q(assignee_id=user_id), project=OuterRef('pk')))),
+        Q(Exists(Comment.objects.filter(issue__project=OuterRef('pk'), author_id=user_id))),
+    )
+    bump_project_version(pk__in=Project.objects.filter(reduce(or_, conditions)).values('pk'))
+
+
+def get_project_state(project_id):
+    """
+    Lit la version et la date de dernière écriture d'un projet, par sa clé primaire.
+
+    Args:
+        project_id (int | str): Identifiant du projet.
+
+    Returns:
+        tuple | None: (version, updated_time), ou None si le projet n'existe pas.
+    """
+    try:
+        return Project.objects.filter(pk=int(project_id)).values_list('version', 'updated_time').first()
+    except (TypeError, ValueError):
+        return None
@@ -1,33 +1,124 @@
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
-from django.http import Http404
-from .models import Project, Contributor, Issue, Comment
-from .serializers import ProjectSerializer, ContributorSerializer, IssueSerializer, CommentSerializer
-from .permissions import IsProjectContributor, IsProjectAuthor
+from django.conf import settings
+from django.db.models import Case, IntegerField, Value, When
+from django.http import Http404, StreamingHttpResponse
+from .models import Project, Contributor, Issue, Comment, ProjectStats
+from .serializers import (
+    ProjectSerializer, ContributorSerializer, IssueSerializer, CommentSerializer, IssueReadSerializer,
+    CommentReadSerializer,
+)
+from authentication.models import CustomUser
+from authentication.serializers import UserPickerSerializer
+from .permissions import IsProjectContributor, IsProjectAuthor, get_membership, get_user_projects
+from .metrics import TimedPermissionsMixin
+from .mixins import (
+    BulkMixin, ConditionalGetMixin, QueryPlanMixin, ReadReplicaMixin, ReadSerializerMixin, ResponseCacheMixin,
+    ScopedWriteMixin,
+)
+from .pagination import CursorOrPageNumberPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .exports import iter_project_rows, stream_csv, stream_ndjson
+from .filters import FieldFilterBackend, OrderingBackend, SearchFilterBackend
+from .search import full_text_search
+from .stats import get_project_stats, issue_stat_values, record_issue_changes, refresh_comment_stats
 
 
-class ProjectViewSet(ModelViewSet):
+class ProjectViewSet(ReadReplicaMixin, ConditionalGetMixin, QueryPlanMixin, TimedPermissionsMixin, ModelViewSet):
 
     queryset = Project.objects.all().order_by('id')
     serializer_class = ProjectSerializer
     permission_classes = [IsProjectContributor]
+    select_related_fields = ('author',)
+    project_lookup_url_kwarg = 'pk'
+    conditional_actions = ('retrieve', 'stats')
+    # Requêtes SQL par action, à froid, vérifiées pour chaque route par RouteQueryBudgetTestCase
+    query_budgets = {
+        'list': 3, 'retrieve': 3, 'create': 4, 'update': 6, 'partial_update': 6, 'destroy': 12,
+        'comments': 3, 'export': 3, 'stats': 4,
+    }
 
     def get_queryset(self):
-        return Project.objects.filter(contributors__user=self.request.user).order_by('id')
+        project_ids = get_user_projects(self.request).contributed
+        return Project.objects.filter(id__in=project_ids).order_by('id')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
         Contributor.objects.create(user=self.request.user, project=serializer.instance)
 
+    @action(detail=True, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request, pk=None):
+        """
+        Exporte en flux les issues puis les commentaires du projet, en NDJSON ou en CSV.
 
-class ContributorViewSet(ModelViewSet):
+        Le format est choisi par `?format=ndjson|csv` ou par l'en-tête Accept (NDJSON par défaut).
+        L'appartenance au projet est vérifiée par IsProjectContributor avant toute lecture.
+        """
+        renderer = request.accepted_renderer
+        stream = stream_csv if renderer.format == 'csv' else stream_ndjson
+        rows = iter_project_rows(pk, chunk_size=getattr(settings, 'SOFTDESK_EXPORT_CHUNK_SIZE', 2000))
+        response = StreamingHttpResponse(stream(rows), content_type=f'{renderer.media_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="project-{pk}.{renderer.format}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        Renvoie le tableau de bord du projet, lu dans ProjectStats (sans parcourir les issues).
+
+        Nombre d'issues par statut, priorité et tag, et nombre d'issues ouvertes par assigné,
+        de la plus chargée à la moins chargée (`assignee` nul pour les issues non assignées).
+        Les GET conditionnels sont gérés par ConditionalGetMixin.
+        """
+        return self.conditional_response(self.stats_response, request, pk=pk)
+
+    def stats_response(self, request, pk=None):
+        """Construit la réponse de l'action stats."""
+        stats = get_project_stats(pk)
+        open_by_assignee = stats.pop(ProjectStats.ASSIGNEE)
+        assignee_ids = [user_id for user_id in open_by_assignee if user_id is not None]
+        users = CustomUser.objects.only('id', 'username').in_bulk(assignee_ids) if assignee_ids else {}
+        # Du plus chargé au moins chargé ; à égalité, par identifiant, les issues non assignées en dernier
+        ordered = sorted(open_by_assignee.items(), key=lambda item: (-item[1], item[0] is None, item[0] or 0))
+        return Response({
+            'project': int(pk),
+            'issues': sum(stats[ProjectStats.STATUS].values()),
+            **stats,
+            'open_by_assignee': [
+                {'assignee': UserPickerSerializer(users[user_id]).data if user_id else None, 'count': count}
+                for user_id, count in ordered
+                if user_id is None or user_id in users
+            ],
+        })
+
+    @action(detail=True, methods=['get'], serializer_class=CommentSerializer)
+    def comments(self, request, pk=None):
+        """
+        Recherche les commentaires de toutes les issues du projet : `?search=`.
+
+        Les résultats sont triés par pertinence (index FTS5 project_comment_fts, restreint au
+        projet) ; sans recherche, les commentaires les plus récents viennent en premier.
+        """
+        queryset = Comment.objects.filter(issue__project_id=pk).order_by('-created_time', '-id')
+        text = request.query_params.get('search', '')
+        if text.strip():
+            queryset = full_text_search(queryset, text, 'search_index', ('description',), 'project_id', pk)
+        page = self.paginate_queryset(CommentReadSerializer.rows(queryset))
+        return self.get_paginated_response(CommentReadSerializer(page, many=True).data)
+
+
+class ContributorViewSet(ReadReplicaMixin, ConditionalGetMixin, QueryPlanMixin, TimedPermissionsMixin, ModelViewSet):
     """ViewSet pour gérer les contributeurs d'un projet."""
     queryset = Contributor.objects.all().order_by('id')
     serializer_class = ContributorSerializer
+    select_related_fields = ('user',)
+    pagination_class = CursorOrPageNumberPagination
+    query_budgets = {'list': 4, 'retrieve': 3, 'create': 6, 'update': 8, 'partial_update': 7, 'destroy': 4}
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -41,47 +132,92 @@ class ContributorViewSet(ModelViewSet):
         return Contributor.objects.filter(project_id=project_id).order_by('id')
 
 
-class IssueViewSet(ModelViewSet):
-    """ViewSet pour gérer les opérations CRUD sur les issues."""
+class IssueViewSet(ReadReplicaMixin, ConditionalGetMixin, ResponseCacheMixin, ScopedWriteMixin, BulkMixin,
+                   QueryPlanMixin, ReadSerializerMixin, TimedPermissionsMixin, ModelViewSet):
+    """
+    ViewSet pour gérer les opérations CRUD sur les issues.
+
+    La liste accepte les filtres `status`, `priority`, `tag` et `assignee` (valeurs séparées par
+    des virgules, `assignee=none` pour les issues non assignées), le tri `ordering`
+    (created_time, priority, préfixés de `-` pour l'ordre décroissant) et la recherche plein
+    texte `search` sur le titre et la description, triée par pertinence.
+    """
     queryset = Issue.objects.all().order_by('id')
     serializer_class = IssueSerializer
+    read_serializer_class = IssueReadSerializer
     permission_classes = [IsProjectContributor]
+    select_related_fields = ('author', 'assignee')
+    pagination_class = CursorOrPageNumberPagination
+    scope_field = 'project'
+    filter_backends = [FieldFilterBackend, SearchFilterBackend, OrderingBackend]
+    filter_fields = ('status', 'priority', 'tag', 'assignee')
+    search_index = 'search_index'
+    search_fields = ('title', 'description')
+    ordering_fields = {
+        'created_time': 'created_time',
+        'priority': Case(
+            *(When(priority=value, then=Value(rank)) for rank, (value, _) in enumerate(Issue.PRIORITY_CHOICES)),
+            output_field=IntegerField(),
+        ),
+    }
+    query_budgets = {
+        'list': 4, 'retrieve': 3, 'create': 7, 'bulk': 9, 'update': 10, 'partial_update': 9, 'destroy': 7,
+    }
 
     def get_queryset(self):
-        return Issue.objects.filter(project__contributors__user=self.request.user).order_by('id')
+        project_id = self.kwargs.get('project_id')
+        if not get_membership(self.request, project_id).is_contributor:
+            return Issue.objects.none()
+        return Issue.objects.filter(project_id=project_id).order_by('id')
+
+    def get_scope(self):
+        return get_object_or_404(Project.objects.only('id'), pk=self.kwargs.get('project_id'))
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    def perform_bulk_save(self, serializer):
+        # bulk_create et bulk_update n'émettent pas de signaux : les statistiques du projet sont mises à jour ici
+        previous = {issue.pk: issue_stat_values(issue) for issue in (serializer.instance or {}).values()}
+        super().perform_bulk_save(serializer)
+        record_issue_changes((previous.get(issue.pk), issue_stat_values(issue)) for issue in serializer.instance)
+
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(ReadReplicaMixin, ConditionalGetMixin, ResponseCacheMixin, ScopedWriteMixin, BulkMixin,
+                     QueryPlanMixin, ReadSerializerMixin, TimedPermissionsMixin, ModelViewSet):
     """ViewSet pour gérer les opérations CRUD sur les commentaires."""
     queryset = Comment.objects.all().order_by('id')
     serializer_class = CommentSerializer
+    read_serializer_class = CommentReadSerializer
     permission_classes = [IsProjectContributor]
     lookup_field = 'uuid'
+    select_related_fields = ('author',)
+    pagination_class = CursorOrPageNumberPagination
+    scope_field = 'issue'
+    query_budgets = {
+        'list': 4, 'retrieve': 4, 'create': 6, 'bulk': 8, 'update': 7, 'partial_update': 6, 'destroy': 5,
+    }
 
     def get_queryset(self):
-        return Comment.objects.filter(issue__project__contributors__user=self.request.user).order_by('id')
+        project_id = self.kwargs.get('project_id')
+        if not get_membership(self.request, project_id).is_contributor:
+            return Comment.objects.none()
+        return Comment.objects.filter(issue_id=self.kwargs.get('issue_id'), issue__project_id=project_id).order_by('id')
+
+    def get_scope(self):
+        return get_object_or_404(
+            Issue.objects.only('id', 'project_id'), pk=self.kwargs.get('issue_id'), project_id=self.kwargs.get('project_id')
+        )
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-
-class ProjectChoicesView(APIView):
-    def get(self, request):
-        return Response({'type': [choice[0] for choice in Project.TYPE_CHOICES]})
-
-
-class IssueChoicesView(APIView):
-
-
-    def get(self, request):
-        return Response({
-            'status': [choice[0] for choice in Issue.STATUS_CHOICES],
-            'priority': [choice[0] for choice in Issue.PRIORITY_CHOICES],
-            'tag': [choice[0] for choice in Issue.TAG_CHOICES]
-        })
+    def perform_bulk_save(self, serializer):
+        # bulk_create n'émet pas de signaux : les compteurs de l'issue sont recalculés pour le lot
+        created = serializer.instance is None
+        super().perform_bulk_save(serializer)
+        if created:
+            refresh_comment_stats([self.kwargs['issue_id']])
 
 
 class IssueDetailView(APIView):
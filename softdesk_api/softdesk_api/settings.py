@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Mesures par route (project/metrics.py), en tête pour couvrir les autres middlewares
+    'project.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -75,14 +79,163 @@ WSGI_APPLICATION = 'softdesk_api.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# SOFTDESK_DB_NAME désigne un autre fichier SQLite (serveurs lancés par les benchmarks).
+# Profil choisi par SOFTDESK_DB_PROFILE :
+#   - 'default' : réglages de Django, une connexion SQLite ouverte et fermée à chaque requête ;
+#   - 'production' : connexions persistantes (SOFTDESK_DB_CONN_MAX_AGE secondes, 600 par défaut)
+#     vérifiées avant d'être réutilisées, SQLite réglé par SOFTDESK_SQLITE_PRAGMAS à l'ouverture
+#     (WAL : l'écrivain ne bloque plus les lecteurs), transactions IMMEDIATE (un écrivain attend
+#     le verrou au lieu d'échouer quand une transaction déjà ouverte en lecture devient une
+#     écriture), et alias 'read' en lecture seule sur le même fichier pour le trafic GET
+#     (SOFTDESK_READ_DATABASE).
+# Débit et erreurs de verrouillage mesurés par benchmarks/db_concurrency.py.
+
+SOFTDESK_DB_NAME = str(os.environ.get('SOFTDESK_DB_NAME', BASE_DIR / 'db.sqlite3'))
+SOFTDESK_DB_PROFILE = os.environ.get('SOFTDESK_DB_PROFILE', 'default')
+
+# PRAGMA exécutés à l'ouverture de chaque connexion du profil 'production'
+SOFTDESK_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # En WAL : pas de fsync à chaque commit, seulement aux checkpoints
+    'busy_timeout': 5000,  # Millisecondes d'attente d'un verrou avant l'erreur « database is locked »
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # Négatif : en Kio, soit 64 Mio par connexion
+    'temp_store': 'MEMORY',
+}
 
-DATABASES = {
+DATABASE_PROFILES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SOFTDESK_DB_NAME,
+        },
+    },
+    'production': {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SOFTDESK_DB_NAME,
+            'CONN_MAX_AGE': int(os.environ.get('SOFTDESK_DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'init_command': ';'.join(f'PRAGMA {name} = {value}' for name, value in SOFTDESK_SQLITE_PRAGMAS.items()),
+                'transaction_mode': 'IMMEDIATE',
+            },
+        },
+        'read': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': SOFTDESK_DB_NAME,
+            'CONN_MAX_AGE': int(os.environ.get('SOFTDESK_DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Le mode WAL est enregistré dans le fichier par la connexion d'écriture
+                'init_command': ';'.join([
+                    *(f'PRAGMA {name} = {value}' for name, value in SOFTDESK_SQLITE_PRAGMAS.items()
+                      if name != 'journal_mode'),
+                    'PRAGMA query_only = ON',
+                ]),
+            },
+            'TEST': {'MIRROR': 'default'},
+        },
+    },
+}
+
+DATABASES = DATABASE_PROFILES[SOFTDESK_DB_PROFILE]
+
+# Les actions de lecture des ViewSets lisent SOFTDESK_READ_DATABASE, si l'alias est défini
+# (réplique, ou alias 'read' du profil 'production') ; voir project/routing.py.
+# L'alias de lecture ne sert jamais les données d'autorisation : l'index des appartenances
+# (project/membership.py) lit toujours 'default', même pendant une lecture routée.
+DATABASE_ROUTERS = ['project.routing.ReadReplicaRouter']
+SOFTDESK_READ_DATABASE = os.environ.get('SOFTDESK_READ_DATABASE', 'read')
+
+# Sous les tests, l'alias 'read' n'est qu'un miroir de 'default' : les lectures restent sur 'default'
+TEST_RUNNER = 'project.testing.SoftDeskTestRunner'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMem par défaut (un cache par processus). Définir SOFTDESK_CACHE_DIR pour utiliser
+# un cache fichier partagé entre plusieurs workers.
+# L'index des appartenances sert aux contrôles d'accès : il est toujours dans un cache fichier,
+# partagé par les workers d'une même machine, pour qu'une invalidation faite par un worker
+# s'applique à tous. Les écritures qui n'émettent pas de signaux (QuerySet.update(),
+# bulk_create, SQL brut) n'invalident pas l'index : leurs entrées restent au plus TIMEOUT
+# secondes, sauf appel explicite à membership_index.invalidate().
+
+SOFTDESK_CACHE_DIR = os.environ.get('SOFTDESK_CACHE_DIR')
+
+SOFTDESK_MEMBERSHIP_CACHE_DIR = os.path.join(
+    SOFTDESK_CACHE_DIR or os.path.join(tempfile.gettempdir(), 'softdesk-cache'), 'membership'
+)
+
+if SOFTDESK_CACHE_DIR:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(SOFTDESK_CACHE_DIR, 'default'),
+        },
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(SOFTDESK_CACHE_DIR, 'responses'),
+            'TIMEOUT': 600,
+        },
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'softdesk-default',
+        },
+        'responses': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'softdesk-responses',
+            'TIMEOUT': 600,
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
+CACHES['membership'] = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': SOFTDESK_MEMBERSHIP_CACHE_DIR,
+    'TIMEOUT': 30,
+    'OPTIONS': {'MAX_ENTRIES': 100000},
 }
 
+# Alias du cache utilisé par l'index des appartenances aux projets (project/membership.py)
+SOFTDESK_MEMBERSHIP_CACHE = 'membership'
+
+# Cache des corps de réponse des listes d'issues et de commentaires (None pour le désactiver).
+SOFTDESK_RESPONSE_CACHE = 'responses'
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+# Profil actif choisi par SOFTDESK_PASSWORD_PROFILE : 'pbkdf2' (défaut, celui de Django),
+# 'scrypt' ou 'argon2' (nécessite argon2-cffi, vérifié au démarrage : authentication.E001).
+# Les autres hacheurs restent listés pour vérifier les mots de passe existants. Changer de
+# profil migre les comptes : chaque mot de passe est recalculé avec le nouveau profil à la
+# connexion suivante de l'utilisateur, et les hachages ne sont plus vérifiables par une
+# version antérieure de l'application.
+# Coûts mesurés par benchmarks/password_hashing.py ; les valeurs par défaut suivent les
+# minimums recommandés par l'OWASP.
+
+SOFTDESK_PASSWORD_PROFILE = os.environ.get('SOFTDESK_PASSWORD_PROFILE', 'pbkdf2')
+
+SOFTDESK_PASSWORD_HASHING = {
+    'scrypt': {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 5},
+    'argon2': {'time_cost': 2, 'memory_cost': 19456, 'parallelism': 1},
+}
+
+PASSWORD_HASHER_PROFILES = {
+    'scrypt': 'authentication.hashers.TunedScryptPasswordHasher',
+    'argon2': 'authentication.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[SOFTDESK_PASSWORD_PROFILE]] + [
+    hasher for profile, hasher in PASSWORD_HASHER_PROFILES.items() if profile != SOFTDESK_PASSWORD_PROFILE
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -129,16 +282,34 @@ AUTH_USER_MODEL = 'authentication.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # JSON rendu et lu par orjson s'il est installé (project/renderers.py, project/parsers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'project.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'project.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'project.pagination.RowsPageNumberPagination',
     'PAGE_SIZE': 10
 }
 
+# Les lectures authentifiées ne chargent pas l'utilisateur (authentication/authentication.py) :
+# un compte désactivé garde l'accès en lecture jusqu'à l'expiration de son jeton d'accès.
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(hours=5),  # Expire après 5 minutes
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),  # Expire après 5 minutes
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),  # Refresh token valable 1 jours
+    'TOKEN_OBTAIN_SERIALIZER': 'authentication.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.serializers.ClaimsTokenRefreshSerializer',
 }
+
+# Jeton exigé par /api/_metrics et /api/_metrics/queries (en-tête Authorization: Bearer).
+# Sans jeton, ces endpoints ne répondent qu'en DEBUG.
+SOFTDESK_METRICS_TOKEN = os.environ.get('SOFTDESK_METRICS_TOKEN')